@@ -0,0 +1,63 @@
+"""Coût de l'anti-flood : temps par message et mémoire par membre suivi.
+
+Trafic synthétique : des membres normaux (un message toutes les quelques
+secondes) et quelques flooders (rafales, copier-coller).
+
+Usage : python benchmarks/bench_antiflood.py [messages] [membres]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import FLOOD_DUPLICATE_WINDOW, FLOOD_MAX_DUPLICATES, FLOOD_MAX_MESSAGES, FLOOD_WINDOW
+from utils.antiflood import FloodDetector
+
+WORDS = "salut merci docker python article lien regarde tuto kubernetes rust async bug prod".split()
+
+
+def traffic(count, members, rng):
+    now = 0.0
+    spammers = set(rng.sample(range(members), max(1, members // 500)))
+    phrases = [" ".join(rng.choices(WORDS, k=rng.randint(2, 12))) for _ in range(5000)]
+    for i in range(count):
+        user = rng.randrange(members)
+        # ~1M messages en ~10 h de trafic : chaque membre parle toutes les ~3 min
+        now += 0.036
+        content = "ACHETEZ MES NFT" if user in spammers else rng.choice(phrases)
+        yield 10**16 + user, 10**17 + rng.randrange(20), 10**18 + i, content, now
+
+
+def detector():
+    return FloodDetector(FLOOD_MAX_MESSAGES, FLOOD_WINDOW, FLOOD_MAX_DUPLICATES, FLOOD_DUPLICATE_WINDOW)
+
+
+def main(count, members):
+    rng = random.Random(0)
+    messages = list(traffic(count, members, rng))
+
+    flood = detector()
+    start = time.perf_counter()
+    for user_id, channel_id, message_id, content, now in messages:
+        flood.check(user_id, channel_id, message_id, content, now)
+    elapsed = time.perf_counter() - start
+    print(f"Messages          : {count:,} • {members:,} membres")
+    print(f"Temps par message : {elapsed / count * 1e6:.2f} µs ({count / elapsed:,.0f} msg/s)")
+    print(f"Floods détectés   : {flood.stats['floods']:,} • membres oubliés (inactifs) : {flood.stats['evicted']:,}")
+
+    # Mémoire : un message par membre, tous suivis en même temps
+    tracemalloc.start()
+    flood = detector()
+    for user in range(members):
+        flood.check(10**16 + user, 1, user, "bonjour", now=1.0)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Mémoire           : {current / members:.0f} octets par membre suivi ({current / 1e6:.1f} Mo)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [1_000_000, 5_000][len(args):]))
@@ -0,0 +1,52 @@
+"""Mémoire et vitesse de l'index des validations (10k membres x 50k articles).
+
+Chaque article est validé par une part variable des membres : quelques
+habitués très actifs (petits indices) et une longue traîne de lecteurs.
+
+Usage : python benchmarks/bench_awards.py [membres] [articles]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.awards import AwardIndex
+
+
+def main(members, articles):
+    rng = random.Random(0)
+    users = [10**17 + i for i in range(members)]
+    tracemalloc.start()
+    index = AwardIndex(max_articles=articles)
+
+    start = time.perf_counter()
+    for article in range(articles):
+        message_id = 10**18 + article
+        readers = rng.randint(1, members // 20) if rng.random() < 0.1 else rng.randint(1, 30)
+        for _ in range(readers):
+            # Les membres actifs (début de liste) lisent beaucoup plus
+            index.add(message_id, users[min(members - 1, int(rng.expovariate(1 / (members / 10))))])
+    build = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pairs = len(index)
+    print(f"Membres x articles   : {members:,} x {articles:,}")
+    print(f"Validations          : {pairs:,} ({build:.1f} s, {pairs / build:,.0f}/s)")
+    print(f"Mémoire (tracemalloc): {current / 1e6:.1f} Mo ({current / pairs:.1f} o/validation)")
+    print(f"Ensembles lecteurs   : {index.nbytes() / 1e6:.1f} Mo")
+    print(f"Set Python (avant)   : ~{pairs * 100 / 1e6:.0f} Mo (tuple + entrée de set ≈ 100 o/validation)")
+
+    probes = [(10**18 + rng.randrange(articles), rng.choice(users)) for _ in range(100_000)]
+    start = time.perf_counter()
+    for message_id, user_id in probes:
+        index.contains(message_id, user_id)
+    print(f"Test de doublon      : {(time.perf_counter() - start) / len(probes) * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args or [10_000, 50_000]))
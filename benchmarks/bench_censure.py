@@ -0,0 +1,52 @@
+"""Compare l'ancienne boucle de censure (1 regex par mot) au moteur compilé.
+
+Usage : python benchmarks/bench_censure.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import BAD_WORDS
+from utils.moderation import Censor
+
+VOCAB = ("le la les un une python docker article veille lien merci salut "
+         "regarde ce tuto sur kubernetes rust async await bug prod").split()
+
+
+def legacy(text):
+    """Ancienne implémentation de on_message."""
+    for word in BAD_WORDS:
+        pattern = fr'\b{re.escape(word)}(?:e|s|es|x)?\b'
+        text = re.sub(pattern, lambda m: "*" * len(m.group()), text, flags=re.IGNORECASE)
+    return text
+
+
+def make_messages(n, dirty_ratio=0.05):
+    rng = random.Random(42)
+    messages = []
+    for _ in range(n):
+        words = [rng.choice(VOCAB) for _ in range(rng.randint(3, 30))]
+        if rng.random() < dirty_ratio:
+            words.insert(rng.randrange(len(words)), rng.choice(BAD_WORDS))
+        messages.append(" ".join(words))
+    return messages
+
+
+def run(label, func, messages):
+    start = time.perf_counter()
+    for text in messages:
+        func(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {len(messages) / elapsed:>12,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    messages = make_messages(20_000)
+    censor = Censor(BAD_WORDS)
+    run("Boucle (avant)", legacy, messages)
+    run("Censor.censor", censor.censor, messages)
+    run("Censor.contains", censor.contains, messages)
@@ -0,0 +1,74 @@
+"""Index anti-doublons : chargement, temps de recherche et mémoire.
+
+Articles synthétiques (titres de 5 à 12 mots, liens de quelques dizaines de
+sites), puis reposts : même lien avec paramètres de suivi, même titre
+suffixé du nom du site, et articles réellement nouveaux.
+
+Usage : python benchmarks/bench_dedup.py [articles]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dedup import DedupIndex
+
+WORDS = ("docker kubernetes rust python linux sécurité faille cloud nouveau version sortie guide "
+         "performance noyau navigateur chrome firefox open source ia modèle données réseau windows "
+         "apple android mise jour critique outil développeur base postgres mysql redis go java").split()
+SITES = [f"site{i}.fr" for i in range(40)]
+
+
+def vocabulary(rng, size=5000):
+    """Mots courants + noms de projets inventés (vocabulaire de titres réaliste)."""
+    syllables = "ka to ri na mo lu ve zo pa gi de bu fe xo ty".split()
+    names = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)}
+    return WORDS * 20 + sorted(names)
+
+
+def fake_articles(count, rng):
+    words = vocabulary(rng)
+    for i in range(1, count + 1):
+        title = " ".join(rng.choices(words, k=rng.randint(5, 12))) + f" {i}"
+        yield i, title, f"https://www.{rng.choice(SITES)}/{i}-{title.split()[0]}.html"
+
+
+def main(count):
+    rng = random.Random(0)
+    articles = list(fake_articles(count, rng))
+
+    index = DedupIndex()
+    start = time.perf_counter()
+    for article_id, title, url in articles:
+        index.add_article(article_id, title, url, published=True)
+    elapsed = time.perf_counter() - start
+
+    # Mémoire mesurée à part (tracemalloc ralentit fortement le chargement)
+    tracemalloc.start()
+    index = DedupIndex()
+    for article_id, title, url in articles:
+        index.add_article(article_id, title, url, published=True)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Articles     : {count:,} chargés en {elapsed:.2f} s • {current / 1e6:.1f} Mo ({current / count:.0f} octets/article)")
+
+    posts = []
+    for article_id, title, url in rng.sample(articles, 10_000):
+        posts.append(([url.replace("https://www.", "http://") + "?utm_source=rss&fbclid=x"], "autre titre"))
+        posts.append(([f"https://agregateur.net/{article_id}"], f"{title} - Journal du Hacker"))
+    for i in range(10_000):
+        posts.append(([f"https://neuf.dev/{i}"], " ".join(rng.choices(vocabulary(rng, 0), k=8)) + f" inédit {i}"))
+
+    start = time.perf_counter()
+    found = [index.claim(10**18 + n, urls, title) for n, (urls, title) in enumerate(posts)]
+    elapsed = time.perf_counter() - start
+    print(f"Recherche    : {elapsed / len(posts) * 1e6:.1f} µs par message")
+    print(f"Doublons     : lien {index.stats['url']:,}/10,000 • titre {index.stats['title']:,}/10,000 • "
+          f"faux positifs {sum(f is not None for f in found[20_000:]):,}/10,000")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
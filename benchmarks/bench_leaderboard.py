@@ -0,0 +1,52 @@
+"""Classement incrémental vs tri complet du dict d'XP (100k membres par défaut).
+
+Usage : python benchmarks/bench_leaderboard.py [nb_membres]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.leaderboard import Leaderboard
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main(n):
+    rng = random.Random(0)
+    user_xp = {str(10**17 + i): rng.randrange(0, 5000, 10) for i in range(n)}
+    users = list(user_xp)
+    board = Leaderboard()
+
+    start = time.perf_counter()
+    board.rebuild(user_xp.items())
+    print(f"Membres              : {n:,}")
+    print(f"Construction         : {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def click():
+        uid = rng.choice(users)
+        user_xp[uid] += 10
+        board.update(uid, user_xp[uid])
+
+    def full_sort_top():
+        sorted(user_xp.items(), key=lambda i: i[1], reverse=True)[:10]
+
+    print(f"Gain d'XP (update)   : {timed(click, 10_000):8.1f} µs")
+    print(f"!top (page 1)        : {timed(lambda: board.page(0, 10), 1_000):8.1f} µs")
+    print(f"!top (page 5000)     : {timed(lambda: board.page(min(n - 10, 50_000), 10), 1_000):8.1f} µs")
+    print(f"!level (rang)        : {timed(lambda: board.rank(rng.choice(users)), 10_000):8.1f} µs")
+    print(f"!top avant (sorted)  : {timed(full_sort_top, 20):8.1f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
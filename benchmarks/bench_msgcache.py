@@ -0,0 +1,93 @@
+"""Mémoire du cache de contenus (par 100k messages) comparée aux objets Message de discord.py.
+
+Messages synthétiques : surtout courts, quelques longs (liens, code collé).
+
+Usage : python benchmarks/bench_msgcache.py [messages]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.msgcache import MessageCache
+
+WORDS = ("salut merci docker python article lien regarde ce tuto sur kubernetes rust async bug "
+         "prod deploy test cool https://github.com/exemple/projet erreur traceback ligne").split()
+
+
+def fake_messages(count, rng):
+    for i in range(count):
+        length = rng.randint(40, 120) if rng.random() < 0.05 else rng.randint(2, 25)
+        content = " ".join(rng.choice(WORDS) for _ in range(length))
+        yield 10**18 + i, 10**17 + rng.randrange(20), 10**16 + rng.randrange(2000), content
+
+
+def measure(messages, **options):
+    tracemalloc.start()
+    cache = MessageCache(max_bytes=1 << 40, per_channel=len(messages), **options)
+    start = time.perf_counter()
+    for message_id, channel_id, author_id, content in messages:
+        cache.add(message_id, channel_id, author_id, content)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cache, current, elapsed
+
+
+def discord_messages(messages):
+    """Mémoire de vrais discord.Message (ce que garderait max_messages)."""
+    import discord
+
+    state = discord.Client(intents=discord.Intents.default())._connection
+
+    class Channel:
+        id = 0
+        guild = None
+        type = discord.ChannelType.text
+
+    tracemalloc.start()
+    kept = [
+        discord.Message(state=state, channel=Channel(), data={
+            "id": str(message_id), "channel_id": str(channel_id), "content": content, "type": 0,
+            "author": {"id": str(author_id), "username": "membre", "discriminator": "0", "avatar": None},
+            "timestamp": "2025-01-01T10:00:00+00:00", "edited_timestamp": None, "tts": False, "pinned": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [], "embeds": [],
+        })
+        for message_id, channel_id, author_id, content in messages
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main(count):
+    rng = random.Random(0)
+    messages = list(fake_messages(count, rng))
+    text_bytes = sum(len(m[3].encode()) for m in messages)
+    per_100k = 100_000 / count / 1e6
+
+    print(f"Messages             : {count:,} (texte brut {text_bytes * per_100k:.1f} Mo / 100k)")
+    for label, options in (("Cache compressé", {}), ("Cache sans zlib", {"compress_over": 1 << 30})):
+        cache, current, elapsed = measure(messages, **options)
+        print(f"{label:<21}: {current * per_100k:.1f} Mo / 100k (estimé {cache.nbytes * per_100k:.1f} Mo) "
+              f"• {count / elapsed:,.0f} ajouts/s")
+
+    probes = [(m[0], m[1]) for m in rng.sample(messages, min(count, 50_000))]
+    start = time.perf_counter()
+    for message_id, channel_id in probes:
+        cache.get(message_id, channel_id).content
+    print(f"Lecture              : {(time.perf_counter() - start) / len(probes) * 1e6:.2f} µs")
+
+    try:
+        current = discord_messages(messages[:20_000])
+        print(f"discord.Message      : {current * 100_000 / min(count, 20_000) / 1e6:.1f} Mo / 100k (auteurs User, sans Member)")
+    except ImportError:
+        pass
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,64 @@
+"""Latence de !recommend : matrice TF-IDF construite article par article, puis requêtes.
+
+Articles synthétiques (titres de 5 à 12 mots, quelques dizaines de
+sources) et membres qui ont chacun validé de 5 à 100 articles.
+
+Usage : python benchmarks/bench_recommend.py [articles] [membres]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.recommend import Recommender
+
+SYLLABLES = "ka to ri na mo lu ve zo pa gi de bu fe xo ty".split()
+
+
+def main(count, members):
+    rng = random.Random(0)
+    vocabulary = sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(20_000)})
+    sources = [f"source{i}" for i in range(60)]
+    rec = Recommender()
+
+    start = time.perf_counter()
+    for article_id in range(1, count + 1):
+        title = " ".join(rng.choices(vocabulary, k=rng.randint(5, 12)))
+        rec.add_article(article_id, title, rng.choice(sources), f"https://site.fr/{article_id}")
+    elapsed = time.perf_counter() - start
+    print(f"Articles          : {count:,} ajoutés en {elapsed:.2f} s ({elapsed / count * 1e6:.1f} µs/article)")
+
+    # Un message veille par article, validations aléatoires
+    for article_id in range(1, count + 1):
+        rec.link_message(10**18 + article_id, [f"https://site.fr/{article_id}"])
+    reads = 0
+    for user_id in range(members):
+        for article_id in rng.sample(range(1, count + 1), rng.randint(5, 100)):
+            rec.add_read(user_id, 10**18 + article_id)
+            reads += 1
+    print(f"Membres           : {members:,} • {reads:,} validations")
+
+    start = time.perf_counter()
+    rec.recommend(0)
+    print(f"Poids TF-IDF      : {(time.perf_counter() - start) * 1e3:.0f} ms (après chaque lot de nouveaux articles)")
+
+    timings = []
+    for user_id in rng.sample(range(members), min(members, 300)):
+        start = time.perf_counter()
+        rec.recommend(user_id)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    p50, p99 = timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+    print(f"Requête           : p50 {p50 * 1e3:.1f} ms • p99 {p99 * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    rec.add_article(count + 1, "nouvel article", "source0", "https://site.fr/new")
+    rec.recommend(0)
+    print(f"Nouvel article    : {(time.perf_counter() - start) * 1e3:.0f} ms (ajout + repondération + requête)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [100_000, 5_000][len(args):]))
@@ -0,0 +1,75 @@
+"""Index de recherche sur un jeu synthétique d'articles (1M par défaut).
+
+Compare la recherche indexée (BM25) à un parcours linéaire équivalent au
+`LIKE '%mot%'` historique.
+
+Usage : python benchmarks/bench_search.py [nb_articles]
+"""
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search import SearchIndex
+
+COMMON = ("python rust docker kubernetes sécurité faille linux windows cloud aws azure ia "
+          "llm gpu nvidia apple google microsoft javascript typescript react vulnérabilité "
+          "ransomware réseau données sql postgres mysql api web mobile android devops git").split()
+SOURCES = ["Korben", "Hacker News", "Le Monde Informatique", "Dev.to", "Numerama", "ZDNet"]
+QUERIES = ["docker", "sécurité linux", "faille windows", "kube", "rust performance", "ia gpu nvidia"]
+
+
+def make_articles(n, vocab_size=50_000):
+    """Titres à vocabulaire zipfien : quelques mots très fréquents, une longue traîne."""
+    rng = random.Random(1)
+    vocab = COMMON + [f"terme{i}" for i in range(vocab_size)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocab))))
+    for article_id in range(1, n + 1):
+        words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(5, 12))
+        yield article_id, " ".join(words), rng.choice(SOURCES)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(n):
+    articles = list(make_articles(n))
+    index = SearchIndex()
+
+    start = time.perf_counter()
+    for article_id, title, source in articles:
+        index.add(article_id, f"{title} {source}")
+    build = time.perf_counter() - start
+    postings_bytes = sum(p.itemsize * len(p) for p in index.postings.values())
+    print(f"Articles           : {n:,}")
+    print(f"Construction       : {build:.1f} s ({n / build:,.0f} articles/s)")
+    print(f"Postings           : {postings_bytes / 1e6:.1f} Mo ({len(index.postings)} termes)")
+
+    timings = []
+    for query in QUERIES * 3:
+        start = time.perf_counter()
+        index.search(query, offset=0, limit=5)
+        timings.append(time.perf_counter() - start)
+    print(f"Recherche indexée  : p50 {statistics.median(timings) * 1000:.1f} ms, p99 {percentile(timings, 0.99) * 1000:.1f} ms")
+
+    titles = [title.lower() for _, title, _ in articles]
+    timings = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        [t for t in titles if query in t][-5:]
+        timings.append(time.perf_counter() - start)
+    print(f"Scan LIKE mémoire  : p50 {statistics.median(timings) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    index.add(n + 1, "Nouvelle faille critique dans Docker Desktop Korben")
+    print(f"Ajout incrémental  : {(time.perf_counter() - start) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,90 @@
+"""Temps de démarrage avant connexion : import de bot.py puis setup_hook (état + cogs).
+
+Chaque révision git est extraite dans un dossier temporaire et mesurée dans
+des process neufs (caches d'import froids côté Python, stockage JSON vide),
+ce qui permet de comparer l'avant / après d'un changement.
+
+Usage : python benchmarks/bench_startup.py [révision ...] [--runs N]
+        (sans révision : l'arbre de travail courant)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import bot as botmod
+t1 = time.perf_counter()
+bot = botmod.bot
+
+async def main():
+    await bot._async_setup_hook()
+    t = time.perf_counter()
+    await bot.setup_hook()
+    setup = time.perf_counter() - t
+    await bot.close()
+    return setup
+
+setup = asyncio.run(main())
+print(json.dumps({"import": t1 - t0, "setup": setup, "mysql": "mysql.connector" in sys.modules}))
+"""
+
+
+def extract(revision, directory):
+    archive = subprocess.run(["git", "archive", revision], cwd=ROOT, capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory)
+
+
+def measure(source, runs):
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as data:
+            env = dict(os.environ, PYTHONPATH=source, PYTHONDONTWRITEBYTECODE="1", METRICS_PORT="0",
+                       STORAGE_BACKEND="json", DB_FILE=os.path.join(data, "bot.db"),
+                       AWARDS_FILE=os.path.join(data, "awards.bin"), XP_LOG_DIR=os.path.join(data, "xp_log"),
+                       WARNS_JOURNAL=os.path.join(data, "warns.journal"), DEDUP_FILE=os.path.join(data, "dup.bin"),
+                       RECOMMEND_LINKS_FILE=os.path.join(data, "links.bin"))
+            result = subprocess.run([sys.executable, "-c", CHILD], cwd=data, env=env,
+                                    capture_output=True, text=True, timeout=120)
+            if result.returncode:
+                raise SystemExit(result.stderr)
+            samples.append(json.loads(result.stdout.splitlines()[-1]))
+    return samples
+
+
+def report(label, samples):
+    imports = statistics.median(s["import"] for s in samples) * 1000
+    setups = statistics.median(s["setup"] for s in samples) * 1000
+    mysql = "oui" if samples[0]["mysql"] else "non"
+    print(f"{label:<14}{imports:>10.0f}{setups:>10.0f}{imports + setups:>10.0f}{mysql:>8}")
+
+
+def main(args):
+    print(f"{'Révision':<14}{'import':>10}{'setup':>10}{'total':>10}{'MySQL':>8}")
+    print(f"{'':<14}{'(ms)':>10}{'(ms)':>10}{'(ms)':>10}{'chargé':>8}")
+    for revision in args.revisions or [None]:
+        if revision is None:
+            report("(courant)", measure(ROOT, args.runs))
+            continue
+        with tempfile.TemporaryDirectory() as source:
+            extract(revision, source)
+            report(revision[:12], measure(source, args.runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("revisions", nargs="*")
+    parser.add_argument("--runs", type=int, default=7)
+    main(parser.parse_args())
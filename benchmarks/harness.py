@@ -0,0 +1,195 @@
+"""Faux objets Discord pour rejouer des événements dans bot.py sans connexion.
+
+Les handlers (`on_message`, `on_raw_reaction_add`...) sont appelés
+directement ; tout ce qui sortirait vers Discord (send, delete, add_roles,
+add_reaction) est enregistré dans les faux salons / membres.
+"""
+import itertools
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_ids = itertools.count(10**18)
+
+
+def snowflake():
+    return next(_ids)
+
+
+class FakeUser:
+    def __init__(self, user_id, name, bot=False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.discriminator = "0"
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+        self.avatar = None
+
+    def __str__(self):
+        return self.name
+
+
+class FakeRole:
+    def __init__(self, name):
+        self.id = snowflake()
+        self.name = name
+
+
+class FakeMember(FakeUser):
+    def __init__(self, user_id, name, guild, bot=False):
+        super().__init__(user_id, name, bot=bot)
+        self.guild = guild
+        self.roles = []
+
+    async def add_roles(self, *roles, reason=None):
+        self.guild.api_calls += 1
+        self.roles.extend(roles)
+
+
+class FakeGuild:
+    def __init__(self, role_names):
+        self.id = snowflake()
+        self.name = "Serveur de test"
+        self.roles = [FakeRole(name) for name in role_names]
+        self.members = {}
+        self.api_calls = 0
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+    def add_member(self, name, bot=False):
+        member = FakeMember(snowflake(), name, self, bot=bot)
+        self.members[member.id] = member
+        return member
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name, guild):
+        self.id = channel_id
+        self.name = name
+        self.guild = guild
+        self.mention = f"<#{channel_id}>"
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.guild.api_calls += 1
+        message = FakeMessage(content or "", author=None, channel=self)
+        self.sent.append((content, kwargs))
+        return message
+
+
+class FakeMessage:
+    def __init__(self, content, author, channel):
+        self.id = snowflake()
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.created_at = datetime.now(timezone.utc)
+        self.jump_url = f"https://discord.com/channels/{channel.guild.id}/{channel.id}/{self.id}"
+        self.reactions = []
+        self.embeds = []
+        self.deleted = False
+
+    async def delete(self, delay=None):
+        self.guild.api_calls += 1
+        self.deleted = True
+
+    async def add_reaction(self, emoji):
+        self.guild.api_calls += 1
+        self.reactions.append(emoji)
+
+    async def edit(self, **kwargs):
+        self.guild.api_calls += 1
+
+
+class FakeReactionPayload:
+    def __init__(self, message, user_id, emoji):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.guild_id = message.guild.id
+        self.user_id = user_id
+        self.emoji = emoji
+
+
+class FakeRawDelete:
+    def __init__(self, message):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.guild_id = message.guild.id
+        self.cached_message = None
+
+
+async def _noop(*args, **kwargs):
+    return None
+
+
+class Harness:
+    """Branche le bot (et ses cogs) sur un faux serveur et un stockage JSON temporaire."""
+
+    def __init__(self, directory=None):
+        import bot as botmod
+        import config
+        from cogs.veille import Veille
+
+        self.config = config
+
+        self.botmod = botmod
+        self.bot = botmod.bot
+        self.guild = FakeGuild(["@everyone", config.ROLE_READER_NAME])
+        self.channels = {}
+        for name in ("VEILLE", "GENERAL", "WELCOME", "LOGS", "ALERTS", "SUGGESTIONS"):
+            channel_id = getattr(config, f"CHANNEL_{name}_ID")
+            self.channels[channel_id] = FakeChannel(channel_id, name.lower(), self.guild)
+        self.general = FakeChannel(snowflake(), "discussion", self.guild)
+        self.channels[self.general.id] = self.general
+
+        self.bot._connection.user = FakeUser(snowflake(), "VeilleManager", bot=True)
+        self.bot.get_channel = self.channels.get
+        self.bot.get_guild = lambda guild_id: self.guild
+        # Hors périmètre du rejeu : commandes et MySQL
+        self.bot.process_commands = _noop
+        Veille.refresh_search_index = _noop
+
+        # Dossier fourni : gardé après l'arrêt (fichiers relus par un autre process)
+        self._tmp = None if directory else tempfile.TemporaryDirectory()
+        self.directory = directory or self._tmp.name
+
+    def handler(self, event):
+        """Coroutine appelant tous les handlers de l'événement (bot + cogs), dans l'ordre."""
+        callbacks = [getattr(self.bot, event)] if hasattr(self.bot, event) else []
+        callbacks += self.bot.extra_events.get(event, [])
+
+        async def dispatch(*args):
+            for callback in callbacks:
+                await callback(*args)
+
+        return dispatch
+
+    @property
+    def veille(self):
+        return self.channels[self.config.CHANNEL_VEILLE_ID]
+
+    def channel(self, channel_id):
+        return self.channels[channel_id]
+
+    async def start(self):
+        """Même démarrage que le vrai bot (état + cogs), sur un stockage JSON temporaire."""
+        path = lambda name: os.path.join(self.directory, name)
+        for name, value in (("STORAGE_BACKEND", "json"), ("DATA_FILE", path("xp.json")),
+                            ("WARNS_FILE", path("warns.json")), ("WARNS_JOURNAL", path("warns.journal")),
+                            ("AWARDS_FILE", path("awards.bin")), ("XP_LOG_DIR", path("xp_log")),
+                            ("RECOMMEND_LINKS_FILE", path("links.bin")), ("DEDUP_FILE", path("duplicates.bin")),
+                            ("METRICS_PORT", 0)):
+            setattr(self.botmod, name, value)
+        await self.bot._async_setup_hook()
+        await self.bot.setup_hook()
+
+    async def stop(self):
+        await self.bot.close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
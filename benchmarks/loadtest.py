@@ -0,0 +1,99 @@
+"""Rejoue du trafic synthétique dans les handlers du bot et de ses cogs (sans Discord).
+
+Scénarios : flux de messages (avec insultes), rafales de réactions ✅,
+vague d'arrivées, rafale de suppressions. Affiche le débit et les
+latences p50/p99 de chaque handler, plus le nombre d'appels API simulés.
+
+Usage : python benchmarks/loadtest.py [--messages N] [--reactions N] [--joins N] [--deletes N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import FakeMessage, FakeRawDelete, FakeReactionPayload, Harness
+
+VOCAB = ("salut merci docker python article lien regarde ce tuto sur kubernetes "
+         "rust async bug prod deploy test cool").split()
+INSULTS = ["putain", "connard", "merde"]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def replay(name, events, handler, results):
+    timings = []
+    start = time.perf_counter()
+    for args in events:
+        t0 = time.perf_counter()
+        await handler(*args)
+        timings.append(time.perf_counter() - t0)
+        # Laisse tourner les tâches de fond (flush, logs, file d'arrivées)
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    if timings:
+        results.append((name, len(timings), len(timings) / elapsed,
+                        statistics.median(timings), percentile(timings, 0.99)))
+
+
+async def main(args):
+    rng = random.Random(0)
+    h = Harness()
+    config = h.config
+    await h.start()
+    members = [h.guild.add_member(f"membre{i}") for i in range(max(10, args.reactions // 20))]
+    results = []
+
+    # --- Flux de messages (5 % d'insultes) ---
+    messages = []
+    for _ in range(args.messages):
+        words = [rng.choice(VOCAB) for _ in range(rng.randint(3, 25))]
+        if rng.random() < 0.05:
+            words.append(rng.choice(INSULTS))
+        messages.append((FakeMessage(" ".join(words), rng.choice(members), h.general),))
+    await replay("on_message", messages, h.handler("on_message"), results)
+
+    # --- Rafale de réactions sur de nouveaux articles (avec doublons) ---
+    articles = [FakeMessage(f"Article {i}", members[0], h.veille) for i in range(max(1, args.reactions // 50))]
+    reactions = [
+        (FakeReactionPayload(rng.choice(articles), rng.choice(members).id, config.EMOJI_VALIDATION),)
+        for _ in range(args.reactions)
+    ]
+    await replay("on_raw_reaction_add", reactions, h.handler("on_raw_reaction_add"), results)
+
+    # --- Vague d'arrivées ---
+    joins = [(h.guild.add_member(f"nouveau{i}"),) for i in range(args.joins)]
+    await replay("on_member_join", joins, h.handler("on_member_join"), results)
+
+    # --- Rafale de suppressions (messages d'abord vus par on_message, donc en cache) ---
+    deleted = [FakeMessage(rng.choice(VOCAB), rng.choice(members), h.general) for _ in range(args.deletes)]
+    on_message = h.handler("on_message")
+    for message in deleted:
+        await on_message(message)
+    deletes = [(FakeRawDelete(message),) for message in deleted]
+    await replay("on_raw_message_delete", deletes, h.handler("on_raw_message_delete"), results)
+
+    await h.stop()
+
+    print(f"{'Handler':<22}{'Événements':>12}{'Débit/s':>12}{'p50 (µs)':>12}{'p99 (µs)':>12}")
+    for name, count, rate, p50, p99 in results:
+        print(f"{name:<22}{count:>12,}{rate:>12,.0f}{p50 * 1e6:>12.0f}{p99 * 1e6:>12.0f}")
+    logs = h.channel(config.CHANNEL_LOGS_ID).sent
+    print(f"\nAppels API simulés : {h.guild.api_calls:,} • messages dans #logs : {len(logs)}"
+          f" • XP distribuée à {len(h.bot.user_xp)} membres")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--reactions", type=int, default=5_000)
+    parser.add_argument("--joins", type=int, default=500)
+    parser.add_argument("--deletes", type=int, default=2_000)
+    asyncio.run(main(parser.parse_args()))
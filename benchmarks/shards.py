@@ -0,0 +1,92 @@
+"""Simule plusieurs shards (process) qui créditent de l'XP dans la même base SQLite.
+
+Chaque process rejoue des validations (article, membre) tirées du même
+ensemble, donc beaucoup de doublons et de membres communs, puis on vérifie :
+- XP totale = XP_PER_CLICK × validations enregistrées (aucun gain perdu) ;
+- chaque passage de niveau est annoncé exactement une fois, tous shards confondus.
+
+Usage : python benchmarks/shards.py [--shards N] [--events N] [--members N]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import XP_PER_CLICK, XP_PER_LEVEL
+from utils.storage import SQLiteBackend, SharedStore
+
+
+def shard(shard_id, path, events, members, articles, results):
+    async def run():
+        backend = SQLiteBackend(path)
+        store = SharedStore()
+        store.load(backend)
+        rng = random.Random(shard_id)
+        level_ups = []
+        awarded = 0
+        start = time.perf_counter()
+        for _ in range(events):
+            message_id, user_id = rng.randrange(articles), rng.randrange(members)
+            result = await store.award(message_id, user_id, XP_PER_CLICK)
+            if result is None:
+                continue
+            awarded += 1
+            old, new = result
+            level_ups.extend((user_id, level) for level in range(old // XP_PER_LEVEL + 1, new // XP_PER_LEVEL + 1))
+        results.put((shard_id, awarded, time.perf_counter() - start, level_ups))
+        backend.close()
+
+    asyncio.run(run())
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.db")
+        SQLiteBackend(path).close()  # Schéma créé avant le départ des shards
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=shard, args=(i, path, args.events, args.members, args.articles, results))
+            for i in range(args.shards)
+        ]
+        for p in procs:
+            p.start()
+        reports = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        backend = SQLiteBackend(path)
+        xp = backend.load_xp()
+        pairs = len(backend.load_awards())
+        backend.close()
+
+    print(f"{'Shard':<8}{'Validations':>14}{'Débit/s':>12}")
+    announced = Counter()
+    for shard_id, awarded, elapsed, level_ups in sorted(reports):
+        print(f"{shard_id:<8}{awarded:>14,}{args.events / elapsed:>12,.0f}")
+        announced.update(level_ups)
+
+    total_xp = sum(xp.values())
+    expected_levels = {(int(uid), lvl) for uid, value in xp.items() for lvl in range(1, value // XP_PER_LEVEL + 1)}
+    duplicates = sum(1 for n in announced.values() if n > 1)
+    missing = len(expected_levels - set(announced))
+    print(f"\nValidations en base : {pairs:,} • XP totale : {total_xp:,} (attendu {pairs * XP_PER_CLICK:,})")
+    print(f"Passages de niveau : {sum(announced.values()):,} annoncés • {duplicates} en double • {missing} manqués")
+    ok = total_xp == pairs * XP_PER_CLICK and not duplicates and not missing
+    print("✅ Cohérent" if ok else "❌ Incohérent")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--events", type=int, default=5_000, help="Réactions rejouées par shard")
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=400)
+    sys.exit(main(parser.parse_args()))
@@ -1,61 +1,44 @@
+import time
+
+STARTED_AT = time.perf_counter()  # Mesure du temps de démarrage (imports compris)
+
 import discord
 from discord.ext import commands
-import json
-import os
 import asyncio
-import random
-from datetime import timedelta
-from dotenv import load_dotenv
-import re
-import mysql.connector
-import csv
-import subprocess
-import aiohttp
-
-# Charge les variables d'environnement
-load_dotenv()
-
-# ==========================================
-# ⚙️ CONFIGURATION & CONSTANTES
-# ==========================================
-
-# --- Sécurité ---
-TOKEN = os.getenv("DISCORD_TOKEN")
-if not TOKEN:
-    print("❌ ERREUR : Token introuvable dans le .env")
-    exit()
-TOKEN = TOKEN.strip()
-
-# --- IDs des Salons ---
-CHANNEL_VEILLE_ID    = 1463268390436343808
-CHANNEL_GENERAL_ID   = 1463268249738154119
-CHANNEL_WELCOME_ID   = 1465122841753026560
-CHANNEL_LOGS_ID      = 1465804036270719159
-CHANNEL_ALERTS_ID    = 1465971729947037762
-CHANNEL_SUGGESTIONS_ID = 1465976916703187067
-
-# --- Gameplay & Rôles ---
-ROLE_READER_NAME = "Reader"
-EMOJI_VALIDATION = "✅"
-XP_PER_CLICK     = 10
-XP_PER_LEVEL     = 100
-
-# --- Fichiers de données ---
-DATA_FILE  = "xp_data.json"
-WARNS_FILE = "warns.json"
-
-# --- Liste des mots interdits ---
-BAD_WORDS = [
-    "merde", "putain", "con", "connard", "connasse", "salope", "pute", 
-    "enculé", "encule", "bâtard", "batard", "salaud", "bouffon", "boloss",
-    "abruti", "débile", "triso", "mongol", "gogol", "idiot",
-    "tg", "ftg", "fdp", "ntm", "vtff", "ptn",
-    "bite", "couille", "chatte", "nique", "niquer", "suce", "sucer", 
-    "branleur", "branlette", "trou du cul", "foutre",
-    "negro", "nègre", "negre", "bougnoule", "crouille", "youpin", "raton",
-    "pd", "pédé", "pede", "tarlouze", "fiotte", "gouine", "travelo",
-    "chinetoque", "bamboula", "sale noir", "sale arabe", "sale juif"
-]
+import inspect
+import logging
+import os
+import signal
+from collections import Counter
+
+from config import (
+    AUDIT_COLLAPSE_AFTER, AUDIT_WINDOW, AWARDS_FILE, AWARD_MAX_ARTICLES, BAD_WORDS, DATA_FILE, DB_FILE,
+    DEDUP_FILE, EXTENSIONS, FLOOD_DUPLICATE_WINDOW, FLOOD_MAX_DUPLICATES, FLOOD_MAX_MESSAGES,
+    FLOOD_WINDOW, MESSAGE_CACHE_MB, MESSAGE_CACHE_PER_CHANNEL, METRICS_PORT, QUERY_CACHE_ENTRIES,
+    QUERY_CACHE_TTL, RAID_COOLDOWN, RAID_THRESHOLD, RAID_WINDOW, RECOMMEND_LINKS_FILE,
+    ROLE_ASSIGN_INTERVAL, SHARD_COUNT, SHARD_IDS, SHARED_SYNC_INTERVAL, SO_CACHE_TTL, SO_TIMEOUT,
+    STORAGE_BACKEND, WARNS_COMPACT_BYTES, WARNS_FILE, WARNS_JOURNAL, WELCOME_WINDOW, XP_FLUSH_INTERVAL,
+    XP_FLUSH_MAX_DIRTY, XP_LOG_DIR, XP_LOG_KEEP_DAYS, XP_LOG_SEGMENT_BYTES,
+)
+from utils.moderation import Censor
+from utils.antiflood import FloodDetector
+from utils.auditlog import AuditLog, clip
+from utils.awards import AwardIndex
+from utils.bans import BanCache
+from utils.dedup import DedupIndex
+from utils.joins import JoinPipeline
+from utils.leaderboard import Leaderboard
+from utils.metrics import Metrics
+from utils.msgcache import MessageCache
+from utils.querycache import QueryCache
+from utils.recommend import Recommender
+from utils.search import SearchIndex
+from utils.stackexchange import StackExchangeClient
+from utils.storage import BackendWarns, SharedStore, WarnJournal, WriteBehindStore, open_storage
+from utils.tasks import BackgroundTasks
+from utils.xplog import XPEventLog
+
+log = logging.getLogger(__name__)
 
 # ==========================================
 # 🔧 INITIALISATION
@@ -66,592 +49,376 @@ intents.members = True
 intents.message_content = True
 intents.reactions = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
-bot.remove_command("help")
+class RateLimitCounter(logging.Handler):
+    """Compte les 429 signalés par discord.py (il les gère lui-même, sans événement)."""
 
-user_xp = {}
+    def __init__(self, metrics):
+        super().__init__()
+        self.metrics = metrics
 
-# ==========================================
-# 💾 GESTION DES DONNÉES (JSON)
-# ==========================================
+    def emit(self, record):
+        if "rate limited" in record.getMessage():
+            self.metrics.inc("discord_ratelimits_total")
 
-def load_xp():
-    """Charge l'XP depuis le JSON."""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-    return {}
-
-def save_xp():
-    """Sauvegarde l'XP."""
-    with open(DATA_FILE, "w") as f:
-        json.dump(user_xp, f)
-
-def load_warns():
-    """Charge les avertissements."""
-    if os.path.exists(WARNS_FILE):
-        with open(WARNS_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_warns(warns):
-    """Sauvegarde les avertissements."""
-    with open(WARNS_FILE, "w") as f:
-        json.dump(warns, f)
+# Avec SHARD_COUNT, chaque process gère ses shards et l'XP passe par la base commune
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
 
-# ==========================================
-# 🤖 ÉVÉNEMENTS
-# ==========================================
+class VeilleBot(BotBase):
+    """Bot + état partagé par les cogs.
 
-@bot.event
-async def on_ready():
-    global user_xp
-    user_xp = load_xp()
-    print(f'✅ Bot connecté : {bot.user}')
-    print(f'📊 XP chargée pour {len(user_xp)} utilisateurs.')
-    await bot.change_presence(activity=discord.Streaming(name="Lofi Girl ☕", url="https://www.twitch.tv/lofigirl"))
+    L'état (XP, index, files de logs...) vit ici et survit à `!reload` ;
+    les cogs (dossier `cogs/`) ne portent que le code et y accèdent via `self.bot`.
+    """
 
-@bot.event
-async def on_member_join(member):
-    role = discord.utils.get(member.guild.roles, name=ROLE_READER_NAME)
-    if role:
-        await member.add_roles(role)
-    
-    channel = bot.get_channel(CHANNEL_WELCOME_ID)
-    if channel:
-        await channel.send(f"Bienvenue {member.mention} ! 🎓\nTu as reçu le rôle **{ROLE_READER_NAME}**.")
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.shared = bool(SHARD_COUNT)
+        # Latences, erreurs et appels API (endpoint /metrics + !stats)
+        self.metrics = Metrics()
 
-@bot.event
-async def on_message(message):
-    # --- Auto-Modération (Regex & Censure) ---
-    censored_content = message.content
-    censored = False
-    cartoon_symbols = "@#$!&%*+?"
-
-    def generate_censure(match):
-        nonlocal censored
-        censored = True
-        found_word = match.group()
-        return "".join(random.choice(cartoon_symbols) for _ in range(len(found_word)))
-
-    for word in BAD_WORDS:
-        pattern = fr'\b{re.escape(word)}(?:e|s|es|x)?\b'
-        censored_content = re.sub(pattern, generate_censure, censored_content, flags=re.IGNORECASE)
-
-    if censored:
-        # 👇 DÉBUT DU LOG (Mouchard) 👇
-        log_channel = bot.get_channel(CHANNEL_ALERTS_ID)
-        if log_channel:
-            embed_log = discord.Embed(title="🚨 Insulte Censurée", color=0xff0000)
-            embed_log.add_field(name="👤 Auteur", value=f"{message.author.mention} (`{message.author.id}`)", inline=True)
-            embed_log.add_field(name="📍 Salon", value=message.channel.mention, inline=True)
-            embed_log.add_field(name="🤬 Contenu Original", value=f"{message.content}", inline=False)
-            embed_log.set_footer(text=f"Date : {message.created_at.strftime('%d/%m/%Y %H:%M')}")
-            await log_channel.send(embed=embed_log)
-        # 👆 FIN DU LOG 👆
+        if self.shared:
+            # XP écrite immédiatement (incréments atomiques), cache local resynchronisé
+            self.xp_store = SharedStore(
+                sync_interval=SHARED_SYNC_INTERVAL,
+                on_sync=lambda data: self.leaderboard.rebuild(data.items()),
+            )
+        else:
+            # XP en mémoire, sauvegardée en tâche de fond (écriture différée)
+            self.xp_store = WriteBehindStore(
+                flush_interval=XP_FLUSH_INTERVAL, max_dirty=XP_FLUSH_MAX_DIRTY,
+                on_flush=lambda seconds: self.metrics.observe("xp_flush_seconds", seconds),
+            )
+        self.user_xp = self.xp_store.data
 
-        try:
-            await message.delete()
-        except discord.NotFound:
-            pass # Si le message a déjà été supprimé
-            
-        await message.channel.send(f"📣 **{message.author.display_name}** a dit :\n>>> {censored_content}")
-        warning = await message.channel.send(f"⚠️ {message.author.mention}, surveille ton langage !")
-        await asyncio.sleep(5)
-        await warning.delete()
-        return
-
-    await bot.process_commands(message)
-
-    # --- Auto-Réaction Veille ---
-    if message.channel.id == CHANNEL_VEILLE_ID and message.author.id != bot.user.id:
-        try:
-            await message.add_reaction(EMOJI_VALIDATION)
-        except Exception:
-            pass
+        # Qui a déjà validé quel article (une seule fois de l'XP par article)
+        # (plancher relevé : les index qui en dépendent oublient les vieux messages)
+        self.awards = AwardIndex(max_articles=AWARD_MAX_ARTICLES, on_floor=self.on_award_floor)
 
-@bot.event
-async def on_raw_reaction_add(payload):
-    # --- Système d'XP ---
-    if payload.channel_id == CHANNEL_VEILLE_ID and str(payload.emoji) == EMOJI_VALIDATION:
-        if payload.user_id == bot.user.id: return
-
-        user_id = str(payload.user_id)
-        current_xp = user_xp.get(user_id, 0)
-        current_level = current_xp // XP_PER_LEVEL
-        
-        new_xp = current_xp + XP_PER_CLICK
-        new_level = new_xp // XP_PER_LEVEL
-        
-        user_xp[user_id] = new_xp
-        save_xp()
-        
-        if new_level > current_level:
-            channel = bot.get_channel(CHANNEL_GENERAL_ID)
-            if channel:
-                member = bot.get_guild(payload.guild_id).get_member(payload.user_id)
-                if member:
-                     await channel.send(f"🎉 **LEVEL UP !** {member.mention} passe **Niveau {new_level}** ! 🧠")
+        # Classement trié, mis à jour à chaque gain d'XP (plus de tri complet pour !top)
+        self.leaderboard = Leaderboard()
 
-@bot.event
-async def on_message_delete(message):
-    """Log quand un message est supprimé (Sauf si c'est une insulte)."""
-    # 1. On ignore les messages du bot lui-même
-    if message.author.bot:
-        return
-
-    for word in BAD_WORDS:
-        pattern = fr'\b{re.escape(word)}(?:e|s|es|x)?\b'
-        if re.search(pattern, message.content, flags=re.IGNORECASE):
-            return # On quitte la fonction, pas de log général !
-
-    # 3. Si ce n'est pas une insulte, on envoie le log dans #logs-serveur
-    log_channel = bot.get_channel(CHANNEL_LOGS_ID)
-    if log_channel:
-        embed = discord.Embed(title="🗑️ Message Supprimé", color=0xe74c3c)
-        embed.add_field(name="Auteur", value=f"{message.author.mention}", inline=True)
-        embed.add_field(name="Salon", value=message.channel.mention, inline=True)
-        
-        if message.content:
-            embed.add_field(name="Contenu", value=message.content, inline=False)
-        else:
-            embed.add_field(name="Contenu", value="*(Image ou fichier)*", inline=False)
-            
-        embed.set_footer(text=f"ID: {message.id}")
-        await log_channel.send(embed=embed)
+        # Historique des gains (journal binaire + agrégats jour / semaine / mois), ouvert dans setup_hook
+        self.xp_log = None
 
-@bot.event
-async def on_message_edit(before, after):
-    """Log quand un message est modifié."""
-    if before.author.bot: return
-    if before.content == after.content: return # Ignore si c'est juste un embed qui charge
-
-    log_channel = bot.get_channel(CHANNEL_LOGS_ID)
-    if log_channel:
-        embed = discord.Embed(title="✏️ Message Modifié", color=0xf1c40f)
-        embed.add_field(name="Auteur", value=f"{before.author.mention}", inline=True)
-        embed.add_field(name="Salon", value=before.channel.mention, inline=True)
-        embed.add_field(name="Avant", value=before.content, inline=False)
-        embed.add_field(name="Après", value=after.content, inline=False)
-        
-        # Lien pour aller directement au message
-        embed.add_field(name="Lien", value=f"[Aller au message]({after.jump_url})", inline=False)
-        
-        await log_channel.send(embed=embed)
+        # Backend XP & warns (SQLite ou JSON), ouvert dans setup_hook
+        self.storage = None
+        # Warns : tables SQLite, ou en mémoire + journal en mode JSON
+        self.warns = None
 
-# ==========================================
-# ℹ️ COMMANDES : INFO & ADMIN
-# ==========================================
+        # Pool MySQL créé à la première requête par le cog Veille (import différé de mysql.connector)
+        self.db_pool = None
 
-@bot.command(name="help")
-async def help_cmd(ctx):
-    """Affiche le menu d'aide détaillé."""
-    embed = discord.Embed(
-        title="🛡️ Centre de Contrôle - Parabot",
-        description="Liste des commandes disponibles.",
-        color=0x2c3e50
-    )
-    
-    # --- SECTION COMMUNICATION & ADMIN ---
-    embed.add_field(
-        name="📢 Communication & Admin",
-        value=(
-            "`!announce <#salon> <Titre|Message>` : Faire une annonce.\n"
-            "`!pull` : 🔄 Lancer le scraper (Veille).\n"
-            "`!export` : 💾 Télécharger la BDD (CSV).\n"
-            "`!regles` : Affiche le règlement."
-        ),
-        inline=False
-    )
-    
-    # --- SECTION MODÉRATION ---
-    embed.add_field(
-        name="⚖️ Modération & Sécurité",
-        value=(
-            "**`🛡️ Auto-Mod`** : Actif (Anti-Insultes).\n"
-            "`!kick`, `!ban`, `!unban` : Sanctions.\n"
-            "`!mute`, `!unmute` : Gérer le silence.\n"
-            "`!lock`, `!unlock`, `!clear` : Gérer les salons.\n"
-            "`!warn`, `!warns`, `!unwarn` : Avertissements."
-        ),
-        inline=False
-    )
-
-    # --- SECTION INFOS & DEV ---
-    embed.add_field(
-        name="🕵️‍♂️ Infos, Veille & Dev",
-        value=(
-            "`!userinfo`, `!serverinfo` : Infos générales.\n"
-            "`!search <mot>` : 🔎 Chercher un article.\n"
-            "`!news` : 📰 Les 5 derniers articles.\n"
-            "`!so <erreur>` : 🧠 Solution StackOverflow."
-        ),
-        inline=False
-    )
-    
-    # --- SECTION FUN & COMMUNAUTÉ ---
-    embed.add_field(
-        name="🎭 Fun & Communauté",
-        value=(
-            "`!level`, `!top` : Voir son XP.\n"
-            "`!poll <question>` : Sondage.\n"
-            "`!8ball` : Jeux.\n"
-            "`!suggest <idée>` : 💡 Boîte à idées."
-        ),
-        inline=False
-    )
-    
-    embed.set_footer(text=f"Version 2.3 • {ctx.guild.name}")
-    
-    await ctx.send(embed=embed)
-
-@bot.command(name="serverinfo")
-async def serverinfo(ctx):
-    guild = ctx.guild
-    embed = discord.Embed(title=f"ℹ️ Infos : {guild.name}", color=0xf1c40f)
-    if guild.icon: embed.set_thumbnail(url=guild.icon.url)
-    embed.add_field(name="Membres", value=f"{guild.member_count}", inline=True)
-    embed.add_field(name="Salons", value=f"{len(guild.channels)}", inline=True)
-    embed.set_footer(text=f"ID: {guild.id}")
-    await ctx.send(embed=embed)
-
-@bot.command(name="userinfo")
-async def userinfo(ctx, member: discord.Member = None):
-    member = member or ctx.author
-    roles = [role.mention for role in member.roles if role.name != "@everyone"]
-    embed = discord.Embed(title=f"👤 {member.name}", color=member.color)
-    if member.avatar: embed.set_thumbnail(url=member.avatar.url)
-    embed.add_field(name="Créé le", value=member.created_at.strftime("%d/%m/%Y"), inline=True)
-    embed.add_field(name="Rôles", value=" ".join(roles) if roles else "Aucun", inline=False)
-    await ctx.send(embed=embed)
-
-@bot.command(name="regles")
-@commands.has_permissions(administrator=True)
-async def regles(ctx):
-    await ctx.message.delete()
-    embed = discord.Embed(title="📜 RÈGLEMENT", description="1. Respect\n2. Pas de Spam\n3. Veille Tech uniquement ici", color=0xe74c3c)
-    await ctx.send(embed=embed)
-
-@bot.command(name="announce")
-@commands.has_permissions(administrator=True)
-async def announce(ctx, channel: discord.TextChannel, *, content: str):
-    if "|" in content:
-        title, text = content.split("|", 1)
-    else:
-        title, text = "📢 Annonce", content
-    
-    embed = discord.Embed(title=title.strip(), description=text.strip(), color=0xe74c3c)
-    if ctx.guild.icon: embed.set_thumbnail(url=ctx.guild.icon.url)
-    await channel.send(embed=embed)
-    await ctx.send(f"✅ Annonce envoyée dans {channel.mention}.")
-
-@bot.command(name="suggest")
-async def suggest(ctx, *, content):
-    """Crée une suggestion dans le salon dédié (ID fixe)."""
-    # 1. On supprime le message de commande pour nettoyer
-    await ctx.message.delete()
-    
-    # 2. On récupère le salon spécifique grâce à l'ID
-    suggest_channel = bot.get_channel(CHANNEL_SUGGESTIONS_ID)
-    
-    if suggest_channel:
-        # Création de l'embed
-        embed = discord.Embed(title="💡 Nouvelle Suggestion", description=content, color=0xf1c40f)
-        embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
-        embed.set_footer(text="Votez avec les réactions ci-dessous !")
-        
-        # Envoi DANS LE SALON SUGGESTIONS
-        msg = await suggest_channel.send(embed=embed)
-        await msg.add_reaction("✅")
-        await msg.add_reaction("❌")
-        
-        # Petit message de confirmation éphémère là où l'utilisateur a tapé la commande
-        confirm = await ctx.send(f"✅ Ta suggestion a été envoyée dans {suggest_channel.mention} !")
-        await asyncio.sleep(5)
-        await confirm.delete()
-        
-    else:
-        await ctx.send("❌ Erreur : Je ne trouve pas le salon de suggestions (Vérifie l'ID).")
+        # Client StackExchange de !so (clé API facultative : quota plus large)
+        self.so_client = StackExchangeClient(key=os.getenv("STACKEXCHANGE_KEY"), timeout=SO_TIMEOUT, ttl=SO_CACHE_TTL)
 
-# ==========================================
-# 🕵️‍♂️ COMMANDES : VEILLE & BDD
-# ==========================================
+        # Exécution en cours de !pull (partagée si plusieurs admins lancent la commande)
+        self.pull_job = None
 
-@bot.command(name="pull")
-@commands.has_permissions(administrator=True)
-async def pull(ctx):
-    """Lance le script de scraping externe."""
-    status_msg = await ctx.send("🕵️‍♂️ **Lancement du Scraper...**")
-    try:
-        script_path = "/app/external_scraper/scraper.py"
-        result = subprocess.run(["python", script_path], capture_output=True, text=True, check=True)
-        await status_msg.edit(content=f"✅ **Terminé !**")
-        if result.stdout:
-            await ctx.send(f"📄 **Logs :**\n```{result.stdout[:1900]}```")
-    except subprocess.CalledProcessError as e:
-        await status_msg.edit(content=f"❌ **Crash du script !**")
-        await ctx.send(f"⚠️ Erreur :\n```{e.stderr}```")
-    except FileNotFoundError:
-        await status_msg.edit(content="❌ Fichier `scraper.py` introuvable.")
-
-@bot.command(name="search")
-async def search_article(ctx, *, query: str):
-    await ctx.send(f"🔎 Recherche de **'{query}'**...")
-    try:
-        conn = mysql.connector.connect(host="localhost", user="parabot", password="moncode123", database="veille_tech")
-        cursor = conn.cursor()
-        
-        sql = "SELECT titre, lien FROM articles WHERE titre LIKE %s ORDER BY id DESC LIMIT 5"
-        cursor.execute(sql, (f"%{query}%",))
-        results = cursor.fetchall()
-        conn.close()
-        
-        if not results:
-            await ctx.send("❌ Aucun résultat.")
-            return
-            
-        embed = discord.Embed(title=f"🗃️ Résultats : {query}", color=0x3498db)
-        for titre, lien in results:
-            embed.add_field(name="📄 Article", value=f"[{titre}]({lien})", inline=False)
-        await ctx.send(embed=embed)
-    except mysql.connector.Error as err:
-        await ctx.send(f"❌ Erreur SQL : `{err}`")
-
-@bot.command(name="news")
-async def latest_news(ctx):
-    try:
-        conn = mysql.connector.connect(host="localhost", user="parabot", password="moncode123", database="veille_tech")
-        cursor = conn.cursor()
-        cursor.execute("SELECT titre, lien, date FROM articles ORDER BY id DESC LIMIT 5")
-        results = cursor.fetchall()
-        conn.close()
-        
-        if not results:
-            await ctx.send("❌ Base vide.")
-            return
+        # Tâches de fond qui survivent à un !reload (exécution de !pull), annulées à l'arrêt
+        self.tasks = BackgroundTasks()
 
-        embed = discord.Embed(title="📰 Dernières News", color=0x2ecc71)
-        for titre, lien, date in results:
-            embed.add_field(name=f"📅 {date}", value=f"[{titre}]({lien})", inline=False)
-        await ctx.send(embed=embed)
-    except mysql.connector.Error as err:
-        await ctx.send(f"❌ Erreur SQL : `{err}`")
-
-@bot.command(name="export")
-@commands.has_permissions(administrator=True)
-async def export_db(ctx):
-    await ctx.send("⏳ Génération du CSV...")
-    filename = "export_veille.csv"
-    try:
-        conn = mysql.connector.connect(host="localhost", user="parabot", password="moncode123", database="veille_tech")
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, date, titre, lien, source FROM articles")
-        rows = cursor.fetchall()
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['ID', 'Date', 'Titre', 'Lien', 'Source']) 
-            writer.writerows(rows)
-        conn.close()
-        
-        await ctx.send(f"✅ Export de {len(rows)} articles :", file=discord.File(filename))
-        os.remove(filename)
-    except Exception as e:
-        await ctx.send(f"❌ Erreur : `{e}`")
-
-@bot.command(name="so")
-async def stackoverflow(ctx, *, query):
-    """Cherche une solution sur StackOverflow (Ex: !so python list index out of range)."""
-    await ctx.send(f"🔎 Recherche sur StackOverflow pour : **{query}**...")
-    
-    # URL de l'API StackExchange (gratuite)
-    url = f"https://api.stackexchange.com/2.3/search/advanced?order=desc&sort=relevance&q={query}&site=stackoverflow"
-    
-    try:
-        # On utilise aiohttp pour faire la requête de façon asynchrone (ne bloque pas le bot)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.json()
-        
-        # Vérification si on a des résultats
-        if not data.get("items"):
-            await ctx.send("❌ Aucun résultat trouvé.")
-            return
-        
-        # On prend le premier résultat (le plus pertinent)
-        top_result = data["items"][0]
-        
-        # Création de la jolie fiche
-        embed = discord.Embed(
-            title=top_result["title"], 
-            url=top_result["link"], 
-            color=0xf48024 # Le orange officiel de StackOverflow
+        # Index plein texte des articles (titre + source), alimenté depuis MySQL
+        self.search_index = SearchIndex()
+
+        # !recommend : TF-IDF des titres (features hachées) construit au fil des articles
+        self.recommender = Recommender()
+
+        # Résultats de !news et des !search fréquents, vidés à chaque nouvel article
+        self.query_cache = QueryCache(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_ENTRIES)
+
+        # Articles déjà publiés (liens normalisés + SimHash des titres), chargés avec l'index de recherche
+        self.dedup_index = DedupIndex()
+
+        # Moteur de censure compilé une seule fois (une regex pour tous les mots)
+        self.censor = Censor(BAD_WORDS)
+
+        # Bannis par serveur (id et nom), chargés au premier !unban puis tenus à jour par les événements
+        self.bans = BanCache()
+
+        # Session !profile en cours (aucune instrumentation sinon)
+        self.profile_session = None
+
+        # Arrêt en cours (close() peut être demandé par un signal et par la fin de start())
+        self._shutdown = None
+        self.close_request = None
+
+        # Débit et répétitions par membre (tampons circulaires, membres inactifs oubliés)
+        self.flood = FloodDetector(
+            max_messages=FLOOD_MAX_MESSAGES, window=FLOOD_WINDOW,
+            max_duplicates=FLOOD_MAX_DUPLICATES, duplicate_window=FLOOD_DUPLICATE_WINDOW,
         )
-        embed.add_field(name="Score", value=str(top_result["score"]), inline=True)
-        embed.add_field(name="Réponses", value=str(top_result["answer_count"]), inline=True)
-        embed.add_field(name="Tags", value=", ".join(top_result.get("tags", [])[:3]), inline=False)
-        embed.set_footer(text="Stack Overflow • For Developers")
-        
-        await ctx.send(embed=embed)
 
-    except Exception as e:
-        await ctx.send(f"⚠️ Erreur lors de la recherche : `{e}`")
+        # Contenu des messages récents pour les logs (remplace le cache de Message de discord.py)
+        self.message_cache = MessageCache(max_bytes=MESSAGE_CACHE_MB * 1024 * 1024, per_channel=MESSAGE_CACHE_PER_CHANNEL)
 
-# ==========================================
-# ⚖️ COMMANDES : MODÉRATION & WARNS
-# ==========================================
+        # Doublons signalés et liens du salon veille : écrits par lots avec l'XP, hors de la boucle
+        self.xp_store.journals.append(self.dedup_index.log)
+        self.xp_store.journals.append(self.recommender.log)
+
+        # Logs de modération envoyés en tâche de fond, par paquets de 10 embeds
+        self.audit_log = AuditLog(
+            self.send_audit, summarize=self.summarize_deletions,
+            window=AUDIT_WINDOW, collapse_after=AUDIT_COLLAPSE_AFTER,
+        )
+
+        # Arrivées : rôle attribué à rythme contrôlé, bienvenues groupées, détection de raid
+        # (callbacks branchés par le cog Moderation, remplacés à chaque !reload)
+        self.join_pipeline = JoinPipeline(
+            None, None, None,
+            role_interval=ROLE_ASSIGN_INTERVAL, welcome_window=WELCOME_WINDOW,
+            raid_threshold=RAID_THRESHOLD, raid_window=RAID_WINDOW, raid_cooldown=RAID_COOLDOWN,
+        )
 
-@bot.command(name="clear")
-@commands.has_permissions(manage_messages=True)
-async def clear(ctx, amount: int):
-    await ctx.channel.purge(limit=amount + 1)
-    msg = await ctx.send(f"🧹 {amount} messages supprimés.")
-    await asyncio.sleep(3)
-    await msg.delete()
-
-@bot.command(name="kick")
-@commands.has_permissions(kick_members=True)
-async def kick(ctx, member: discord.Member, *, reason="Aucune"):
-    await member.kick(reason=reason)
-    await ctx.send(f"👢 **{member.name}** expulsé.")
-
-@bot.command(name="ban")
-@commands.has_permissions(ban_members=True)
-async def ban(ctx, member: discord.Member, *, reason="Aucune"):
-    await member.ban(reason=reason)
-    await ctx.send(f"🔨 **{member.name}** banni.")
-
-@bot.command(name="unban")
-@commands.has_permissions(ban_members=True)
-async def unban(ctx, *, user_input):
-    banned_users = await ctx.guild.bans()
-    for ban_entry in banned_users:
-        user = ban_entry.user
-        if str(user.id) == user_input or f"{user.name}#{user.discriminator}" == user_input:
-            await ctx.guild.unban(user)
-            await ctx.send(f"✅ **{user.name}** débanni.")
+        self.metrics.register_collector(self.collect_state)
+        self.before_invoke(self.start_command_timer)
+        self.after_invoke(self.stop_command_timer)
+
+    # --- Instrumentation ---
+
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        # Chaque événement est chronométré (les erreurs passent par on_error)
+        start = time.perf_counter()
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            self.metrics.observe("event_seconds", time.perf_counter() - start, event=event_name)
+
+    async def on_error(self, event_method, *args, **kwargs):
+        self.metrics.inc("event_errors_total", event=event_method)
+        await super().on_error(event_method, *args, **kwargs)
+
+    def _instrument_http(self):
+        """Compte les appels à l'API Discord par méthode et statut."""
+        original = self.http.request
+
+        async def request(route, **kwargs):
+            status = "ok"
+            try:
+                return await original(route, **kwargs)
+            except discord.HTTPException as e:
+                status = str(e.status)
+                raise
+            finally:
+                self.metrics.inc("discord_requests_total", method=route.method, status=status)
+
+        self.http.request = request
+
+    async def start_command_timer(self, ctx):
+        ctx.started_at = time.perf_counter()
+
+    async def stop_command_timer(self, ctx):
+        # Appelé même si la commande échoue
+        command = ctx.command.qualified_name
+        self.metrics.observe("command_seconds", time.perf_counter() - getattr(ctx, "started_at", time.perf_counter()), command=command)
+        if ctx.command_failed:
+            self.metrics.inc("command_errors_total", command=command)
+
+    def collect_state(self):
+        yield "xp_players", {}, len(self.user_xp)
+        yield "xp_dirty", {}, self.xp_store.dirty
+        yield "awards_pairs", {}, len(self.awards)
+        yield "awards_articles", {}, self.awards.articles  # Au plafond : le plancher monte à chaque article
+        if self.xp_log is not None:
+            for key, value in self.xp_log.stats.items():
+                yield "xp_log", {"stat": key}, value
+        yield "search_index_articles", {}, len(self.search_index)
+        yield "query_cache_entries", {}, len(self.query_cache)
+        for key, value in self.query_cache.stats.items():
+            yield "query_cache", {"result": key}, value
+        yield "recommender_articles", {}, len(self.recommender)
+        for key, value in self.recommender.stats.items():
+            yield "recommender", {"stat": key}, value
+        yield "dedup_index_entries", {}, len(self.dedup_index)
+        for key, value in self.dedup_index.stats.items():
+            yield "dedup", {"result": key}, value
+        yield "ban_cache_entries", {}, len(self.bans)
+        yield "flood_tracked_members", {}, len(self.flood)
+        for key, value in self.flood.stats.items():
+            yield "flood", {"stat": key}, value
+        yield "message_cache_entries", {}, len(self.message_cache)
+        yield "message_cache_bytes", {}, self.message_cache.nbytes
+        for key, value in self.message_cache.stats.items():
+            yield "message_cache", {"result": key}, value
+        yield "extensions_loaded", {}, len(self.extensions)
+        if isinstance(self.warns, WarnJournal):
+            yield "warns_journal_bytes", {}, self.warns.journal_bytes
+            for key, value in self.warns.stats.items():
+                yield "warns_journal", {"stat": key}, value
+        if self.db_pool is not None:
+            yield "db_pool_idle", {}, self.db_pool.idle
+            for key, value in self.db_pool.stats.items():
+                yield f"db_pool_{key}", {}, value
+        for key, value in self.so_client.stats.items():
+            yield "so_cache", {"result": key}, value
+        for key, value in self.audit_log.stats.items():
+            yield "audit_log", {"stat": key}, value
+        for key, value in self.join_pipeline.stats.items():
+            yield "joins", {"stat": key}, value
+
+    def on_award_floor(self, floor):
+        self.dedup_index.forget_before(floor)
+        self.recommender.forget_before(floor)
+
+    # --- Logs de modération ---
+
+    async def send_audit(self, channel_id, embeds):
+        channel = self.get_channel(channel_id)
+        if channel:
+            await channel.send(embeds=embeds)
+
+    @staticmethod
+    def summarize_deletions(channel_id, authors):
+        """Embed de synthèse pour une rafale de suppressions dans un salon."""
+        counts = Counter(authors)
+        embed = discord.Embed(title=f"🗑️ {len(authors)} Messages Supprimés", color=0xe74c3c)
+        embed.add_field(name="Salon", value=f"<#{channel_id}>", inline=True)
+        embed.add_field(
+            name="Auteurs",
+            value=clip("\n".join(f"{mention} × {n}" for mention, n in counts.most_common())),
+            inline=False,
+        )
+        return embed
+
+    # --- Cycle de vie ---
+
+    async def setup_hook(self):
+        # Chargé une seule fois, avant la connexion (pas à chaque reconnexion)
+        self._instrument_http()
+        logging.getLogger("discord.http").addHandler(RateLimitCounter(self.metrics))
+        # Un port par process en mode shardé (METRICS_PORT + premier shard)
+        port = METRICS_PORT + (SHARD_IDS[0] if METRICS_PORT and SHARD_IDS else 0)
+        try:
+            await self.metrics.start(port=port)
+        except OSError as e:
+            print(f"⚠️ Endpoint de métriques indisponible : {e}")
+        self.storage = open_storage(
+            STORAGE_BACKEND, DB_FILE, DATA_FILE, WARNS_FILE, AWARDS_FILE,
+            shared=self.shared, warns_journal=WARNS_JOURNAL,
+        )
+        if self.storage.name == "json":
+            self.warns = WarnJournal(WARNS_FILE, WARNS_JOURNAL, compact_bytes=WARNS_COMPACT_BYTES)
+            self.warns.load()
+        else:
+            self.warns = BackendWarns(self.storage)
+        self.xp_store.load(self.storage)
+        pairs = self.storage.load_awards()
+        self.awards.load(pairs)
+        self.recommender.load(RECOMMEND_LINKS_FILE, pairs, self.awards.floor)
+        self.dedup_index.load(DEDUP_FILE, self.awards.floor)
+        if self.awards.floor:
+            await self.storage.run(self.storage.prune_awards, self.awards.floor)
+        self.leaderboard.rebuild(self.user_xp.items())
+        # Un journal par process en mode shardé (chacun ne voit que ses propres gains)
+        log_dir = os.path.join(XP_LOG_DIR, f"shard-{SHARD_IDS[0]}") if self.shared and SHARD_IDS else XP_LOG_DIR
+        self.xp_log = XPEventLog(log_dir, segment_bytes=XP_LOG_SEGMENT_BYTES, keep_days=XP_LOG_KEEP_DAYS)
+        await asyncio.to_thread(self.xp_log.load)
+        # Gains écrits par lots au flush de l'XP, hors de la boucle
+        self.xp_store.journals.append(self.xp_log)
+        self.xp_store.start()
+        self.audit_log.start()
+        self.join_pipeline.start()
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
+        startup = time.perf_counter() - STARTED_AT
+        self.metrics.observe("startup_seconds", startup)
+        print(f"⏱️ Prêt à se connecter en {startup:.2f} s ({len(self.extensions)} extensions).")
+
+    async def on_message(self, message):
+        # Message censuré : supprimé par le cog Moderation, aucune commande exécutée
+        if self.censor.check(message):
             return
-    await ctx.send("❌ Utilisateur introuvable.")
-
-@bot.command(name="mute")
-@commands.has_permissions(moderate_members=True)
-async def mute(ctx, member: discord.Member, minutes: int, *, reason="Comportement"):
-    await member.timeout(timedelta(minutes=minutes), reason=reason)
-    await ctx.send(f"🤐 **{member.name}** muet pour {minutes} min.")
-
-@bot.command(name="unmute")
-@commands.has_permissions(moderate_members=True)
-async def unmute(ctx, member: discord.Member):
-    await member.timeout(None)
-    await ctx.send(f"🔊 **{member.name}** libéré.")
-
-@bot.command(name="lock")
-@commands.has_permissions(manage_channels=True)
-async def lock(ctx):
-    await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=False)
-    await ctx.send("🔒 Salon verrouillé.")
-
-@bot.command(name="unlock")
-@commands.has_permissions(manage_channels=True)
-async def unlock(ctx):
-    await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=True)
-    await ctx.send("🔓 Salon ouvert.")
-
-@bot.command(name="warn")
-@commands.has_permissions(manage_messages=True)
-async def warn(ctx, member: discord.Member, *, reason="Aucune raison"):
-    warns = load_warns()
-    uid = str(member.id)
-    if uid not in warns: warns[uid] = []
-    
-    timestamp = ctx.message.created_at.strftime("%d/%m/%Y %H:%M")
-    warns[uid].append({"reason": reason, "date": timestamp, "mod": ctx.author.name})
-    save_warns(warns)
-    
-    embed = discord.Embed(title="⚠️ Avertissement", description=f"{member.mention} a reçu un warn.", color=0xe67e22)
-    embed.add_field(name="Raison", value=reason)
-    embed.add_field(name="Total", value=f"{len(warns[uid])} avertissements")
-    await ctx.send(embed=embed)
-
-@bot.command(name="warns")
-@commands.has_permissions(manage_messages=True)
-async def list_warns(ctx, member: discord.Member):
-    warns = load_warns()
-    uid = str(member.id)
-    if uid not in warns or not warns[uid]:
-        await ctx.send(f"✅ **{member.display_name}** est clean.")
-        return
-        
-    embed = discord.Embed(title=f"📂 Casier de {member.display_name}", color=0xe74c3c)
-    for i, w in enumerate(warns[uid], 1):
-        embed.add_field(name=f"Warn #{i}", value=f"**Motif:** {w['reason']}\n**Le:** {w['date']}", inline=False)
-    await ctx.send(embed=embed)
-
-@bot.command(name="unwarn")
-@commands.has_permissions(manage_messages=True)
-async def unwarn(ctx, member: discord.Member, index: int):
-    warns = load_warns()
-    uid = str(member.id)
-    if uid not in warns or not warns[uid]: return await ctx.send("❌ Aucun warn.")
-
-    real_index = index - 1
-    if 0 <= real_index < len(warns[uid]):
-        warns[uid].pop(real_index)
-        save_warns(warns)
-        await ctx.send(f"✅ Warn n°{index} retiré.")
-    else:
-        await ctx.send("❌ Numéro invalide.")
-
-@bot.command(name="clearwarns")
-@commands.has_permissions(administrator=True)
-async def clearwarns(ctx, member: discord.Member):
-    warns = load_warns()
-    uid = str(member.id)
-    if uid in warns:
-        del warns[uid]
-        save_warns(warns)
-        await ctx.send(f"♻️ Casier de {member.mention} nettoyé.")
-    else:
-        await ctx.send("Déjà clean.")
+        await self.process_commands(message)
+
+    def request_close(self):
+        """SIGTERM (docker stop) / SIGINT : même arrêt propre que Ctrl-C, une seule fois."""
+        if self.close_request is None:
+            self.close_request = asyncio.ensure_future(self.close())
+
+    async def close(self):
+        if self._shutdown is None:
+            self._shutdown = asyncio.ensure_future(self._close_state())
+        await self._shutdown
+        await super().close()
+
+    async def _close_state(self):
+        """Écritures en attente (XP, journaux, validations) puis fermeture des ressources.
+
+        Chaque étape est isolée : une erreur (envoi sur une connexion morte...)
+        est loguée sans empêcher les suivantes. Les écritures durables passent
+        avant tout ce qui parle au réseau.
+        """
+        # Cogs déchargés d'abord (leurs tâches annulées) : plus d'XP gagnée après le dernier flush
+        for extension in tuple(self.extensions):
+            await self._close_step(f"extension {extension}", self.unload_extension, extension)
+        await self._close_step("tâches de fond", self.tasks.close)
+        await self._close_step("XP", self.xp_store.close)
+        if self.xp_log:
+            await self._close_step("historique d'XP", self.xp_log.close, self.storage.run)
+        if self.warns:
+            await self._close_step("warns", self.warns.close)
+        if self.storage:
+            await self._close_step("stockage", self.storage.close)
+        await self._close_step("logs de modération", self.audit_log.close)
+        await self._close_step("file d'arrivées", self.join_pipeline.close)
+        if self.db_pool is not None:
+            await self._close_step("pool MySQL", asyncio.to_thread, self.db_pool.close)
+        await self._close_step("client StackExchange", self.so_client.close)
+        await self._close_step("métriques", self.metrics.close)
+
+    @staticmethod
+    async def _close_step(what, close, *args):
+        try:
+            result = close(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            log.exception("⚠️ Arrêt : %s non fermé", what)
 
-# ==========================================
-# 🎭 COMMANDES : FUN & COMMUNAUTÉ
-# ==========================================
+shard_options = {}
+if SHARD_COUNT:
+    shard_options["shard_count"] = SHARD_COUNT
+    if SHARD_IDS:
+        shard_options["shard_ids"] = SHARD_IDS
 
-@bot.command(name="level")
-async def level(ctx):
-    xp = user_xp.get(str(ctx.author.id), 0)
-    lvl = xp // XP_PER_LEVEL
-    await ctx.send(embed=discord.Embed(title="📊 Niveau", description=f"Niveau **{lvl}** ({xp} XP)", color=0x3498db))
-
-@bot.command(name="top")
-async def top(ctx):
-    sorted_xp = sorted(user_xp.items(), key=lambda i: i[1], reverse=True)[:10]
-    desc = "\n".join([f"**#{i}** <@{uid}> : Niv {xp // XP_PER_LEVEL}" for i, (uid, xp) in enumerate(sorted_xp, 1)])
-    await ctx.send(embed=discord.Embed(title="🏆 Classement", description=desc or "Vide", color=0xf1c40f))
-
-@bot.command(name="poll")
-async def poll(ctx, *, question):
-    await ctx.message.delete()
-    msg = await ctx.send(embed=discord.Embed(title="📊 Sondage", description=question, color=0x9b59b6))
-    await msg.add_reaction("✅")
-    await msg.add_reaction("❌")
-
-@bot.command(name="8ball")
-async def eight_ball(ctx, *, question):
-    responses = ["Oui.", "Non.", "Peut-être.", "Jamais.", "C'est sûr."]
-    await ctx.send(embed=discord.Embed(title="🎱 8Ball", description=f"Q: {question}\nR: {random.choice(responses)}", color=0x9b59b6))
-
-@bot.command(name="say")
-@commands.has_permissions(manage_messages=True)
-async def say(ctx, *, text):
-    await ctx.message.delete()
-    await ctx.send(text)
+# max_messages=None : pas de cache d'objets Message, les logs lisent bot.message_cache
+bot = VeilleBot(command_prefix="!", intents=intents, max_messages=None, **shard_options)
+bot.remove_command("help")
+
+@bot.event
+async def on_ready():
+    print(f'✅ Bot connecté : {bot.user}')
+    if bot.shared:
+        print(f'🔀 Shards {sorted(bot.shards)} sur {bot.shard_count}.')
+    print(f'📊 XP chargée pour {len(bot.user_xp)} utilisateurs.')
+    await bot.change_presence(activity=discord.Streaming(name="Lofi Girl ☕", url="https://www.twitch.tv/lofigirl"))
 
 # ==========================================
 # 🚀 LANCEMENT
 # ==========================================
-bot.run(TOKEN)
\ No newline at end of file
+
+async def run(token):
+    # bot.run() ne gère que Ctrl-C : sans ceci, `docker stop` (SIGTERM) tue le
+    # process sans passer par close() et l'XP pas encore écrite est perdue
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, bot.request_close)
+        except NotImplementedError:
+            pass  # Windows : Ctrl-C seulement
+    async with bot:
+        await bot.start(token)
+    if bot.close_request is not None:
+        await bot.close_request
+
+def main():
+    # --- Sécurité ---
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        print("❌ ERREUR : Token introuvable dans le .env")
+        exit()
+    discord.utils.setup_logging()
+    asyncio.run(run(token.strip()))
+
+# Importable sans effet de bord (tests, benchmarks/loadtest.py)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Extensions du bot (code rechargeable à chaud, l'état vit sur le bot)."""
@@ -0,0 +1,217 @@
+import asyncio
+import io
+import os
+import time
+from datetime import datetime, timedelta
+
+import discord
+from discord.ext import commands
+
+from config import (
+    EXTENSIONS, PROFILE_BLOCK_THRESHOLD, PROFILE_MAX_SECONDS, PROFILE_SAMPLE_INTERVAL,
+)
+from utils.profiler import ProfileSession
+
+# ==========================================
+# ℹ️ COMMANDES : INFO & ADMIN
+# ==========================================
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="help")
+    async def help_cmd(self, ctx):
+        """Affiche le menu d'aide détaillé."""
+        embed = discord.Embed(
+            title="🛡️ Centre de Contrôle - Parabot",
+            description="Liste des commandes disponibles.",
+            color=0x2c3e50
+        )
+
+        # --- SECTION COMMUNICATION & ADMIN ---
+        embed.add_field(
+            name="📢 Communication & Admin",
+            value=(
+                "`!announce <#salon> <Titre|Message>` : Faire une annonce.\n"
+                "`!pull` : 🔄 Lancer le scraper (Veille).\n"
+                "`!export [depuis:] [jusqu:] [source:]` : 💾 Télécharger la BDD (CSV).\n"
+                "`!stats` : 📈 Métriques du bot.\n"
+                "`!profile <secondes> [cprofile]` : 🔬 Profil CPU / mémoire en pièce jointe.\n"
+                "`!reload <module>` : ♻️ Recharger un module sans redémarrer.\n"
+                "`!regles` : Affiche le règlement."
+            ),
+            inline=False
+        )
+
+        # --- SECTION MODÉRATION ---
+        embed.add_field(
+            name="⚖️ Modération & Sécurité",
+            value=(
+                "**`🛡️ Auto-Mod`** : Actif (Anti-Insultes).\n"
+                "`!kick`, `!ban`, `!unban` : Sanctions.\n"
+                "`!mute`, `!unmute` : Gérer le silence.\n"
+                "`!lock`, `!unlock`, `!clear` : Gérer les salons.\n"
+                "`!massban`, `!massmute`, `!purge` : Raids (`joined:10m`, `user:`, `since:`, `regex:`).\n"
+                "`!warn`, `!warns`, `!unwarn` : Avertissements."
+            ),
+            inline=False
+        )
+
+        # --- SECTION INFOS & DEV ---
+        embed.add_field(
+            name="🕵️‍♂️ Infos, Veille & Dev",
+            value=(
+                "`!userinfo`, `!serverinfo` : Infos générales.\n"
+                "`!search <mots> [-p page]` : 🔎 Chercher un article.\n"
+                "`!news` : 📰 Les 5 derniers articles.\n"
+                "`!recommend` : 💡 Articles proches de ceux que tu as validés.\n"
+                "`!so <erreur>` : 🧠 Solution StackOverflow."
+            ),
+            inline=False
+        )
+
+        # --- SECTION FUN & COMMUNAUTÉ ---
+        embed.add_field(
+            name="🎭 Fun & Communauté",
+            value=(
+                "`!level`, `!top [week|month] [page]` : Voir son XP et le classement.\n"
+                "`!poll <question>` : Sondage.\n"
+                "`!8ball` : Jeux.\n"
+                "`!suggest <idée>` : 💡 Boîte à idées."
+            ),
+            inline=False
+        )
+
+        embed.set_footer(text=f"Version 2.3 • {ctx.guild.name}")
+
+        await ctx.send(embed=embed)
+
+    @commands.command(name="stats")
+    @commands.has_permissions(administrator=True)
+    async def stats(self, ctx):
+        """Résumé des métriques : latences, erreurs, API Discord, disque et BDD."""
+        metrics = self.bot.metrics
+
+        def fmt(seconds):
+            return "∞" if seconds == float("inf") else f"{seconds * 1000:.0f} ms"
+
+        def top_lines(name, label):
+            rows = sorted(metrics.histograms_named(name), key=lambda item: item[1].sum, reverse=True)[:6]
+            return "\n".join(
+                f"`{lbl[label]}` ×{h.count} • p50 {fmt(h.quantile(0.5))} • p99 {fmt(h.quantile(0.99))}"
+                for lbl, h in rows
+            ) or "Aucune donnée"
+
+        uptime = timedelta(seconds=int(time.time() - metrics.started_at))
+        embed = discord.Embed(title="📈 Statistiques du bot", description=f"En ligne depuis {uptime}", color=0x2c3e50)
+        embed.add_field(name="⚡ Événements (temps cumulé)", value=top_lines("event_seconds", "event"), inline=False)
+        embed.add_field(name="⌨️ Commandes", value=top_lines("command_seconds", "command"), inline=False)
+
+        errors = sum(v for (n, _), v in metrics.counters.items() if n in ("event_errors_total", "command_errors_total"))
+        api_calls = sum(v for (n, _), v in metrics.counters.items() if n == "discord_requests_total")
+        lag = metrics.histograms_named("event_loop_lag_seconds")
+        lag_p99 = fmt(lag[0][1].quantile(0.99)) if lag else "n/a"
+        embed.add_field(name="🌐 API Discord", value=f"{api_calls} appels • {metrics.counter('discord_ratelimits_total')} × 429", inline=True)
+        embed.add_field(name="❌ Erreurs", value=str(errors), inline=True)
+        embed.add_field(name="🐢 Retard boucle p99", value=lag_p99, inline=True)
+
+        xp_store = self.bot.xp_store
+        flushes = metrics.histograms_named("xp_flush_seconds")
+        flush_text = f"{flushes[0][1].count} flush • p99 {fmt(flushes[0][1].quantile(0.99))}" if flushes else "Aucun flush"
+        embed.add_field(name="💾 Disque (XP)", value=f"{flush_text} • {xp_store.dirty} en attente", inline=True)
+        db_pool = self.bot.db_pool
+        if db_pool is None:
+            pool_text = "Aucune connexion ouverte"
+        else:
+            pool = db_pool.stats
+            pool_text = f"{pool['in_use']}/{db_pool.size} actives • {db_pool.idle} libres • {pool['queries']} requêtes • {pool['reconnects']} reconnexions"
+        embed.add_field(name="🗃️ Pool MySQL", value=pool_text, inline=False)
+        cache = self.bot.query_cache.stats
+        embed.add_field(
+            name="📦 Cache !news / !search",
+            value=f"{cache['hits']} hits • {cache['misses']} requêtes • {cache['invalidations']} invalidations",
+            inline=True,
+        )
+        startup = metrics.histograms_named("startup_seconds")
+        if startup:
+            embed.add_field(name="⏱️ Démarrage", value=f"{startup[0][1].sum:.2f} s", inline=True)
+        # Port effectif (METRICS_PORT + shard en mode shardé), absent si le serveur n'a pas démarré
+        if self.bot.metrics.url:
+            embed.set_footer(text=f"Détails : {self.bot.metrics.url}")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="profile")
+    @commands.has_permissions(administrator=True)
+    async def profile(self, ctx, seconds: int = 30, mode: str = ""):
+        """Profile le bot pendant `seconds` (Ex: !profile 60, !profile 10 cprofile)."""
+        if self.bot.profile_session is not None:
+            await ctx.send("⏳ Un profil est déjà en cours.")
+            return
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+        session = ProfileSession(
+            self.bot.metrics,
+            root=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            interval=PROFILE_SAMPLE_INTERVAL,
+            block_threshold=PROFILE_BLOCK_THRESHOLD,
+            use_cprofile=mode.lower() == "cprofile",
+        )
+        # Gardée sur le bot : un !reload admin pendant la session ne la perd pas
+        self.bot.profile_session = session
+        session.start()
+        try:
+            await ctx.send(f"🔬 Profil en cours pendant {seconds} s{' (cProfile)' if session.use_cprofile else ''}…")
+            await asyncio.sleep(seconds)
+        finally:
+            report = await session.stop()
+            self.bot.profile_session = None
+
+        name = f"profile-{datetime.now():%Y%m%d-%H%M%S}.txt"
+        await ctx.send(
+            f"🔬 Profil de {session.duration:.0f} s terminé.",
+            file=discord.File(io.BytesIO(report.encode()), filename=name),
+        )
+
+    @commands.command(name="reload")
+    @commands.has_permissions(administrator=True)
+    async def reload(self, ctx, name: str):
+        """Recharge un module (Ex: !reload xp) sans couper la connexion à Discord."""
+        extension = name if name.startswith("cogs.") else f"cogs.{name.lower()}"
+        if extension not in EXTENSIONS:
+            modules = ", ".join(f"`{e.split('.')[-1]}`" for e in EXTENSIONS)
+            await ctx.send(f"❌ Module inconnu. Disponibles : {modules}.")
+            return
+        start = time.perf_counter()
+        try:
+            if extension in self.bot.extensions:
+                # En cas d'erreur, discord.py garde l'ancienne version chargée
+                await self.bot.reload_extension(extension)
+            else:
+                await self.bot.load_extension(extension)
+        except commands.ExtensionError as e:
+            await ctx.send(f"❌ Échec du rechargement de `{extension}` : `{e.__cause__ or e}`")
+            return
+        await ctx.send(f"♻️ `{extension}` rechargé en {(time.perf_counter() - start) * 1000:.0f} ms.")
+
+    @commands.command(name="regles")
+    @commands.has_permissions(administrator=True)
+    async def regles(self, ctx):
+        await ctx.message.delete()
+        embed = discord.Embed(title="📜 RÈGLEMENT", description="1. Respect\n2. Pas de Spam\n3. Veille Tech uniquement ici", color=0xe74c3c)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="announce")
+    @commands.has_permissions(administrator=True)
+    async def announce(self, ctx, channel: discord.TextChannel, *, content: str):
+        if "|" in content:
+            title, text = content.split("|", 1)
+        else:
+            title, text = "📢 Annonce", content
+
+        embed = discord.Embed(title=title.strip(), description=text.strip(), color=0xe74c3c)
+        if ctx.guild.icon: embed.set_thumbnail(url=ctx.guild.icon.url)
+        await channel.send(embed=embed)
+        await ctx.send(f"✅ Annonce envoyée dans {channel.mention}.")
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
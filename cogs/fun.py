@@ -0,0 +1,84 @@
+import asyncio
+import random
+
+import discord
+from discord.ext import commands
+
+from config import CHANNEL_SUGGESTIONS_ID
+
+# ==========================================
+# 🎭 COMMANDES : FUN & COMMUNAUTÉ
+# ==========================================
+
+class Fun(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="serverinfo")
+    async def serverinfo(self, ctx):
+        guild = ctx.guild
+        embed = discord.Embed(title=f"ℹ️ Infos : {guild.name}", color=0xf1c40f)
+        if guild.icon: embed.set_thumbnail(url=guild.icon.url)
+        embed.add_field(name="Membres", value=f"{guild.member_count}", inline=True)
+        embed.add_field(name="Salons", value=f"{len(guild.channels)}", inline=True)
+        embed.set_footer(text=f"ID: {guild.id}")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="userinfo")
+    async def userinfo(self, ctx, member: discord.Member = None):
+        member = member or ctx.author
+        roles = [role.mention for role in member.roles if role.name != "@everyone"]
+        embed = discord.Embed(title=f"👤 {member.name}", color=member.color)
+        if member.avatar: embed.set_thumbnail(url=member.avatar.url)
+        embed.add_field(name="Créé le", value=member.created_at.strftime("%d/%m/%Y"), inline=True)
+        embed.add_field(name="Rôles", value=" ".join(roles) if roles else "Aucun", inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="suggest")
+    async def suggest(self, ctx, *, content):
+        """Crée une suggestion dans le salon dédié (ID fixe)."""
+        # 1. On supprime le message de commande pour nettoyer
+        await ctx.message.delete()
+
+        # 2. On récupère le salon spécifique grâce à l'ID
+        suggest_channel = self.bot.get_channel(CHANNEL_SUGGESTIONS_ID)
+
+        if suggest_channel:
+            # Création de l'embed
+            embed = discord.Embed(title="💡 Nouvelle Suggestion", description=content, color=0xf1c40f)
+            embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
+            embed.set_footer(text="Votez avec les réactions ci-dessous !")
+
+            # Envoi DANS LE SALON SUGGESTIONS
+            msg = await suggest_channel.send(embed=embed)
+            await msg.add_reaction("✅")
+            await msg.add_reaction("❌")
+
+            # Petit message de confirmation éphémère là où l'utilisateur a tapé la commande
+            confirm = await ctx.send(f"✅ Ta suggestion a été envoyée dans {suggest_channel.mention} !")
+            await asyncio.sleep(5)
+            await confirm.delete()
+
+        else:
+            await ctx.send("❌ Erreur : Je ne trouve pas le salon de suggestions (Vérifie l'ID).")
+
+    @commands.command(name="poll")
+    async def poll(self, ctx, *, question):
+        await ctx.message.delete()
+        msg = await ctx.send(embed=discord.Embed(title="📊 Sondage", description=question, color=0x9b59b6))
+        await msg.add_reaction("✅")
+        await msg.add_reaction("❌")
+
+    @commands.command(name="8ball")
+    async def eight_ball(self, ctx, *, question):
+        responses = ["Oui.", "Non.", "Peut-être.", "Jamais.", "C'est sûr."]
+        await ctx.send(embed=discord.Embed(title="🎱 8Ball", description=f"Q: {question}\nR: {random.choice(responses)}", color=0x9b59b6))
+
+    @commands.command(name="say")
+    @commands.has_permissions(manage_messages=True)
+    async def say(self, ctx, *, text):
+        await ctx.message.delete()
+        await ctx.send(text)
+
+async def setup(bot):
+    await bot.add_cog(Fun(bot))
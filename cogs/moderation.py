@@ -0,0 +1,478 @@
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord.ext import commands
+
+from config import (
+    CHANNEL_ALERTS_ID, CHANNEL_LOGS_ID, CHANNEL_WELCOME_ID, FLOOD_TIMEOUT_MINUTES, MASS_BAN_DELETE_SECONDS,
+    MASS_CONCURRENCY, PURGE_MAX_SCAN, RAID_WINDOW, ROLE_READER_NAME,
+)
+from utils.auditlog import clip
+from utils.moderation import parse_duration
+from utils.tasks import BackgroundTasks
+
+_TARGET_RE = re.compile(r"^(?:<@!?(\d+)>|(\d{15,20}))$")
+
+# ==========================================
+# ⚖️ MODÉRATION, LOGS & ARRIVÉES
+# ==========================================
+
+class Moderation(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.tasks = BackgroundTasks()  # Sanctions anti-flood en cours, annulées au !reload
+
+    async def cog_load(self):
+        # La file d'arrivées (état) reste sur le bot, seul son code est remplacé
+        pipeline = self.bot.join_pipeline
+        pipeline.assign_role = self.assign_reader_role
+        pipeline.welcome = self.send_welcome
+        pipeline.alert = self.send_raid_alert
+
+    async def cog_unload(self):
+        await self.tasks.close()
+
+    # --- Arrivées ---
+
+    async def assign_reader_role(self, member):
+        role = discord.utils.get(member.guild.roles, name=ROLE_READER_NAME)
+        if role:
+            try:
+                await member.add_roles(role)
+            except discord.NotFound:
+                pass # Parti entre-temps
+
+    async def send_welcome(self, members):
+        channel = self.bot.get_channel(CHANNEL_WELCOME_ID)
+        if not channel:
+            return
+        if len(members) == 1:
+            await channel.send(f"Bienvenue {members[0].mention} ! 🎓\nTu as reçu le rôle **{ROLE_READER_NAME}**.")
+            return
+        # Un message pour tout le groupe (découpé si trop de mentions)
+        chunk = []
+        for member in members:
+            chunk.append(member.mention)
+            if len(" ".join(chunk)) > 1800:
+                await channel.send(f"Bienvenue {' '.join(chunk)} ! 🎓")
+                chunk = []
+        if chunk:
+            await channel.send(f"Bienvenue {' '.join(chunk)} ! 🎓")
+        await channel.send(f"Vous êtes **{len(members)}** nouveaux et avez reçu le rôle **{ROLE_READER_NAME}**.")
+
+    async def send_raid_alert(self, join_count):
+        channel = self.bot.get_channel(CHANNEL_ALERTS_ID)
+        if channel:
+            embed = discord.Embed(
+                title="🚨 Raid Détecté",
+                description=f"**{join_count}** arrivées en moins de {RAID_WINDOW} s.\nBienvenues suspendues, rôles toujours attribués.",
+                color=0xff0000,
+            )
+            await channel.send(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        # Rôle et bienvenue traités en file (rythme contrôlé, messages regroupés)
+        self.bot.join_pipeline.push(member)
+
+    # --- Auto-Modération & logs ---
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        # --- Auto-Modération (Regex & Censure) ---
+        if not self.bot.censor.check(message):
+            # Gardé pour les logs de suppression / modification (insultes et bots exclus)
+            if not message.author.bot:
+                self.bot.message_cache.add(message.id, message.channel.id, message.author.id, message.content)
+                verdict = self.bot.flood.check(message.author.id, message.channel.id, message.id, message.content)
+                if verdict:
+                    self.tasks.spawn(self.punish_flood(message, verdict))
+            return
+
+        censored_content, _ = self.bot.censor.censor(message.content)
+
+        # 👇 DÉBUT DU LOG (Mouchard) 👇
+        embed_log = discord.Embed(title="🚨 Insulte Censurée", color=0xff0000)
+        embed_log.add_field(name="👤 Auteur", value=f"{message.author.mention} (`{message.author.id}`)", inline=True)
+        embed_log.add_field(name="📍 Salon", value=message.channel.mention, inline=True)
+        embed_log.add_field(name="🤬 Contenu Original", value=clip(message.content), inline=False)
+        embed_log.set_footer(text=f"Date : {message.created_at.strftime('%d/%m/%Y %H:%M')}")
+        self.bot.audit_log.push(CHANNEL_ALERTS_ID, embed_log)
+        # 👆 FIN DU LOG 👆
+
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass # Si le message a déjà été supprimé
+
+        await message.channel.send(f"📣 **{message.author.display_name}** a dit :\n>>> {censored_content}")
+        await message.channel.send(f"⚠️ {message.author.mention}, surveille ton langage !", delete_after=5)
+
+    async def punish_flood(self, message, verdict):
+        """Supprime la rafale, met l'auteur en sourdine et prévient les modos."""
+        member = message.author
+        if not isinstance(member, discord.Member) or member.guild_permissions.manage_messages:
+            return # Pas de sanction auto pour l'équipe (ni en MP)
+
+        # Retirés du cache : la rafale est résumée ici, pas loguée message par message
+        by_channel = {}
+        for channel_id, message_id in verdict.messages:
+            self.bot.message_cache.pop(message_id, channel_id)
+            by_channel.setdefault(channel_id, []).append(discord.Object(id=message_id))
+
+        for channel_id, targets in by_channel.items():
+            channel = message.guild.get_channel(channel_id)
+            if channel is None:
+                continue
+            try:
+                await channel.delete_messages(targets, reason="Anti-flood") # Un seul appel par salon
+            except discord.HTTPException:
+                pass # Déjà supprimés ou trop anciens
+
+        motif = "messages identiques" if verdict.reason == "duplicates" else "trop de messages"
+        try:
+            await member.timeout(timedelta(minutes=FLOOD_TIMEOUT_MINUTES), reason=f"Anti-flood : {motif}")
+            action = f"Muet {FLOOD_TIMEOUT_MINUTES} min."
+        except discord.HTTPException:
+            action = "⚠️ Impossible de le rendre muet (permissions ?)"
+
+        embed = discord.Embed(title="🌊 Flood Détecté", color=0xff0000)
+        embed.add_field(name="👤 Auteur", value=f"{member.mention} (`{member.id}`)", inline=True)
+        embed.add_field(name="📍 Salon", value=message.channel.mention, inline=True)
+        embed.add_field(name="Motif", value=f"{motif} • {verdict.count} messages supprimés", inline=False)
+        embed.add_field(name="Sanction", value=action, inline=False)
+        self.bot.audit_log.push(CHANNEL_ALERTS_ID, embed)
+
+    # Événements "raw" : reçus même pour les messages absents du cache de discord.py,
+    # le contenu vient de bot.message_cache (ni bots ni insultes, déjà loguées par la censure)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """Log quand un message est supprimé (Sauf si c'est une insulte)."""
+        cached = self.bot.message_cache.pop(payload.message_id, payload.channel_id)
+        if cached is None:
+            return
+
+        content = cached.content
+        embed = discord.Embed(title="🗑️ Message Supprimé", color=0xe74c3c)
+        embed.add_field(name="Auteur", value=f"<@{cached.author_id}>", inline=True)
+        embed.add_field(name="Salon", value=f"<#{payload.channel_id}>", inline=True)
+
+        if content:
+            embed.add_field(name="Contenu", value=clip(content), inline=False)
+        else:
+            embed.add_field(name="Contenu", value="*(Image ou fichier)*", inline=False)
+
+        embed.set_footer(text=f"ID: {payload.message_id}")
+        # Regroupé par salon : une rafale de suppressions devient une seule synthèse
+        self.bot.audit_log.push(CHANNEL_LOGS_ID, embed, group=payload.channel_id, info=f"<@{cached.author_id}>")
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Log unique pour une suppression en masse (!clear, purge...)."""
+        cache = self.bot.message_cache
+        records = [cache.pop(message_id, payload.channel_id) for message_id in payload.message_ids]
+        authors = [f"<@{r.author_id}>" for r in records if r is not None]
+        if authors:
+            self.bot.audit_log.push(CHANNEL_LOGS_ID, self.bot.summarize_deletions(payload.channel_id, authors))
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """Log quand un message est modifié."""
+        after = payload.data.get("content")
+        if after is None: return # Mise à jour sans texte (embed qui charge...)
+        cache = self.bot.message_cache
+        cached = cache.get(payload.message_id, payload.channel_id)
+        if cached is None: return
+        before = cached.content
+        if before == after: return
+        cache.update(payload.message_id, payload.channel_id, after)
+
+        embed = discord.Embed(title="✏️ Message Modifié", color=0xf1c40f)
+        embed.add_field(name="Auteur", value=f"<@{cached.author_id}>", inline=True)
+        embed.add_field(name="Salon", value=f"<#{payload.channel_id}>", inline=True)
+        embed.add_field(name="Avant", value=clip(before or "*(vide)*"), inline=False)
+        embed.add_field(name="Après", value=clip(after or "*(vide)*"), inline=False)
+
+        # Lien pour aller directement au message
+        jump_url = f"https://discord.com/channels/{payload.guild_id or '@me'}/{payload.channel_id}/{payload.message_id}"
+        embed.add_field(name="Lien", value=f"[Aller au message]({jump_url})", inline=False)
+
+        self.bot.audit_log.push(CHANNEL_LOGS_ID, embed)
+
+    # ==========================================
+    # ⚖️ COMMANDES : MODÉRATION & WARNS
+    # ==========================================
+
+    @commands.command(name="clear")
+    @commands.has_permissions(manage_messages=True)
+    async def clear(self, ctx, amount: int):
+        await ctx.channel.purge(limit=amount + 1)
+        msg = await ctx.send(f"🧹 {amount} messages supprimés.")
+        await asyncio.sleep(3)
+        await msg.delete()
+
+    @commands.command(name="kick")
+    @commands.has_permissions(kick_members=True)
+    async def kick(self, ctx, member: discord.Member, *, reason="Aucune"):
+        await member.kick(reason=reason)
+        await ctx.send(f"👢 **{member.name}** expulsé.")
+
+    @commands.command(name="ban")
+    @commands.has_permissions(ban_members=True)
+    async def ban(self, ctx, member: discord.Member, *, reason="Aucune"):
+        await member.ban(reason=reason)
+        await ctx.send(f"🔨 **{member.name}** banni.")
+
+    @commands.command(name="unban")
+    @commands.has_permissions(ban_members=True)
+    async def unban(self, ctx, *, user_input):
+        """Débannit par ID, mention, nom d'utilisateur ou ancien nom#1234."""
+        bans = self.bot.bans
+        if not bans.loaded(ctx.guild.id):
+            await bans.load(ctx.guild)
+        found = bans.find(ctx.guild.id, user_input)
+        if not found:
+            await ctx.send("❌ Utilisateur introuvable.")
+            return
+        if len(found) > 1:
+            await ctx.send("❓ Plusieurs bannis portent ce nom, précise l'ID : " + ", ".join(f"`{uid}`" for uid in found[:10]))
+            return
+        user_id = found[0]
+        name = bans.name(ctx.guild.id, user_id)
+        try:
+            await ctx.guild.unban(discord.Object(id=user_id))
+        except discord.NotFound:
+            bans.remove(ctx.guild.id, user_id) # Débanni entre-temps : le cache était en retard
+            await ctx.send("❌ Utilisateur introuvable.")
+            return
+        except discord.HTTPException as e:
+            # Toujours banni (permissions, erreur API) : le cache ne change pas
+            await ctx.send(f"❌ Impossible de débannir **{name}** : `{e.text or e}`")
+            return
+        # Sans attendre on_member_unban : un !unban juste après ne doit plus le trouver
+        bans.remove(ctx.guild.id, user_id)
+        await ctx.send(f"✅ **{name}** débanni.")
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        self.bot.bans.add(guild.id, user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        self.bot.bans.remove(guild.id, user.id)
+
+    @commands.command(name="mute")
+    @commands.has_permissions(moderate_members=True)
+    async def mute(self, ctx, member: discord.Member, minutes: int, *, reason="Comportement"):
+        await member.timeout(timedelta(minutes=minutes), reason=reason)
+        await ctx.send(f"🤐 **{member.name}** muet pour {minutes} min.")
+
+    @commands.command(name="unmute")
+    @commands.has_permissions(moderate_members=True)
+    async def unmute(self, ctx, member: discord.Member):
+        await member.timeout(None)
+        await ctx.send(f"🔊 **{member.name}** libéré.")
+
+    @commands.command(name="lock")
+    @commands.has_permissions(manage_channels=True)
+    async def lock(self, ctx):
+        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=False)
+        await ctx.send("🔒 Salon verrouillé.")
+
+    @commands.command(name="unlock")
+    @commands.has_permissions(manage_channels=True)
+    async def unlock(self, ctx):
+        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=True)
+        await ctx.send("🔓 Salon ouvert.")
+
+    # ==========================================
+    # 🚨 COMMANDES : MODÉRATION DE MASSE (RAIDS)
+    # ==========================================
+
+    def can_moderate(self, ctx, member):
+        """Ni soi-même, ni le bot, ni l'équipe, ni plus haut que soi dans les rôles."""
+        if member.id in (ctx.author.id, self.bot.user.id) or member.guild_permissions.manage_messages:
+            return False
+        return ctx.author.id == ctx.guild.owner_id or member.top_role < ctx.author.top_role
+
+    def parse_targets(self, ctx, args):
+        """Mentions / IDs et `joined:<durée>` (arrivés récemment) ; le reste est la raison.
+
+        Retourne (cibles, ignorés, raison) ; les cibles hors serveur sont des discord.Object.
+        """
+        targets, skipped, reason = {}, 0, []
+        for arg in args:
+            match = _TARGET_RE.match(arg)
+            if match:
+                user_id = int(match.group(1) or match.group(2))
+                member = ctx.guild.get_member(user_id)
+                if member is not None and not self.can_moderate(ctx, member):
+                    skipped += 1
+                else:
+                    targets[user_id] = member or discord.Object(id=user_id)
+            elif arg.startswith("joined:") and parse_duration(arg[7:]):
+                since = datetime.now(timezone.utc) - timedelta(seconds=parse_duration(arg[7:]))
+                for member in ctx.guild.members:
+                    if member.joined_at and member.joined_at >= since and not member.bot:
+                        if self.can_moderate(ctx, member):
+                            targets[member.id] = member
+                        else:
+                            skipped += 1
+            else:
+                reason.append(arg)
+        return list(targets.values()), skipped, " ".join(reason) or "Modération de masse"
+
+    async def run_concurrently(self, targets, action):
+        """Applique `action` à chaque cible, MASS_CONCURRENCY à la fois (les limites de débit
+        de l'API sont gérées par discord.py). Retourne le nombre de succès."""
+        semaphore = asyncio.Semaphore(MASS_CONCURRENCY)
+
+        async def one(target):
+            async with semaphore:
+                await action(target)
+
+        results = await asyncio.gather(*(one(t) for t in targets), return_exceptions=True)
+        return sum(1 for r in results if not isinstance(r, Exception))
+
+    def log_mass_action(self, ctx, title, targets, reason):
+        embed = discord.Embed(title=title, color=0xff0000)
+        embed.add_field(name="👮 Par", value=ctx.author.mention, inline=True)
+        embed.add_field(name="Raison", value=clip(reason), inline=True)
+        embed.add_field(name="Cibles", value=clip(" ".join(f"<@{t.id}>" for t in targets)), inline=False)
+        self.bot.audit_log.push(CHANNEL_ALERTS_ID, embed)
+
+    @commands.command(name="massban")
+    @commands.has_permissions(ban_members=True)
+    async def massban(self, ctx, *args):
+        """Ex: !massban @a @b 123456789012345678 spam  |  !massban joined:10m raid"""
+        targets, skipped, reason = self.parse_targets(ctx, args)
+        if not targets:
+            await ctx.send("❌ Aucune cible (mentions, IDs ou `joined:10m`)." + (f" {skipped} ignorée(s) : équipe ou rôle trop haut." if skipped else ""))
+            return
+        banned = failed = 0
+        try:
+            # Endpoint de ban groupé : 200 membres par requête, messages de la dernière heure effacés
+            for i in range(0, len(targets), 200):
+                result = await ctx.guild.bulk_ban(
+                    targets[i:i + 200], reason=f"{ctx.author} : {reason}", delete_message_seconds=MASS_BAN_DELETE_SECONDS
+                )
+                banned += len(result.banned)
+                failed += len(result.failed)
+        except discord.HTTPException as e:
+            failed = len(targets) - banned
+            await ctx.send(f"⚠️ Ban groupé interrompu : `{e.text or e}`")
+        self.log_mass_action(ctx, f"🔨 Ban de masse ({banned})", targets, reason)
+        summary = f"🔨 **{banned}** banni(s)"
+        if failed:
+            summary += f" • {failed} échec(s)"
+        if skipped:
+            summary += f" • {skipped} ignoré(s) (équipe ou rôle trop haut)"
+        await ctx.send(summary + ".")
+
+    @commands.command(name="massmute")
+    @commands.has_permissions(moderate_members=True)
+    async def massmute(self, ctx, minutes: int, *args):
+        """Ex: !massmute 30 @a @b flood  |  !massmute 60 joined:10m raid"""
+        targets, skipped, reason = self.parse_targets(ctx, args)
+        members = [t for t in targets if isinstance(t, discord.Member)]
+        if not members:
+            await ctx.send("❌ Aucun membre à rendre muet (mentions, IDs ou `joined:10m`).")
+            return
+        duration = timedelta(minutes=max(1, min(minutes, 28 * 24 * 60)))  # 28 jours max côté Discord
+        muted = await self.run_concurrently(members, lambda m: m.timeout(duration, reason=f"{ctx.author} : {reason}"))
+        self.log_mass_action(ctx, f"🤐 Mute de masse ({muted})", members, reason)
+        summary = f"🤐 **{muted}** muet(s) pour {int(duration.total_seconds() // 60)} min"
+        if muted < len(members):
+            summary += f" • {len(members) - muted} échec(s)"
+        if skipped or len(members) < len(targets):
+            summary += f" • {skipped + len(targets) - len(members)} ignoré(s)"
+        await ctx.send(summary + ".")
+
+    @commands.command(name="purge")
+    @commands.has_permissions(manage_messages=True)
+    async def purge(self, ctx, *filters):
+        """Ex: !purge 200 user:@spammeur since:30m "regex:free nitro" bots"""
+        limit, users, pattern, after, bots = 100, set(), None, None, False
+        for item in filters:
+            key, _, value = item.partition(":")
+            match = _TARGET_RE.match(value)
+            if item.isdigit():
+                limit = min(int(item), PURGE_MAX_SCAN)
+            elif key == "user" and match:
+                users.add(int(match.group(1) or match.group(2)))
+            elif key == "regex" and value:
+                try:
+                    pattern = re.compile(value, flags=re.IGNORECASE)
+                except re.error as e:
+                    await ctx.send(f"❌ Regex invalide : `{e}`")
+                    return
+            elif key == "since" and parse_duration(value):
+                after = datetime.now(timezone.utc) - timedelta(seconds=parse_duration(value))
+            elif item == "bots":
+                bots = True
+            else:
+                await ctx.send(f"❌ Filtres possibles : `<nombre>` (max {PURGE_MAX_SCAN}), `user:@membre`, `since:30m`, `\"regex:motif\"`, `bots`.")
+                return
+
+        def check(message):
+            if users and message.author.id not in users:
+                return False
+            if bots and not message.author.bot:
+                return False
+            return pattern is None or pattern.search(message.content) is not None
+
+        # purge() passe par la suppression groupée (100 messages par requête, moins de 14 jours)
+        deleted = await ctx.channel.purge(limit=limit, check=check, after=after, before=ctx.message, reason=f"!purge par {ctx.author}")
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+        authors = len({m.author.id for m in deleted})
+        await ctx.send(f"🧹 **{len(deleted)}** message(s) supprimé(s) ({authors} auteur(s)) sur les {limit} derniers.", delete_after=10)
+
+    @commands.command(name="warn")
+    @commands.has_permissions(manage_messages=True)
+    async def warn(self, ctx, member: discord.Member, *, reason="Aucune raison"):
+        uid = str(member.id)
+        timestamp = ctx.message.created_at.strftime("%d/%m/%Y %H:%M")
+        total = await self.bot.warns.add_warn(uid, {"reason": reason, "date": timestamp, "mod": ctx.author.name})
+
+        embed = discord.Embed(title="⚠️ Avertissement", description=f"{member.mention} a reçu un warn.", color=0xe67e22)
+        embed.add_field(name="Raison", value=reason)
+        embed.add_field(name="Total", value=f"{total} avertissements")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="warns")
+    @commands.has_permissions(manage_messages=True)
+    async def list_warns(self, ctx, member: discord.Member):
+        user_warns = await self.bot.warns.get_warns(str(member.id))
+        if not user_warns:
+            await ctx.send(f"✅ **{member.display_name}** est clean.")
+            return
+
+        embed = discord.Embed(title=f"📂 Casier de {member.display_name}", color=0xe74c3c)
+        for i, w in enumerate(user_warns, 1):
+            embed.add_field(name=f"Warn #{i}", value=f"**Motif:** {w['reason']}\n**Le:** {w['date']}", inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="unwarn")
+    @commands.has_permissions(manage_messages=True)
+    async def unwarn(self, ctx, member: discord.Member, index: int):
+        if await self.bot.warns.remove_warn(str(member.id), index - 1):
+            await ctx.send(f"✅ Warn n°{index} retiré.")
+        else:
+            await ctx.send("❌ Aucun warn ou numéro invalide.")
+
+    @commands.command(name="clearwarns")
+    @commands.has_permissions(administrator=True)
+    async def clearwarns(self, ctx, member: discord.Member):
+        if await self.bot.warns.clear_warns(str(member.id)):
+            await ctx.send(f"♻️ Casier de {member.mention} nettoyé.")
+        else:
+            await ctx.send("Déjà clean.")
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
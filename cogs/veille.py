@@ -0,0 +1,379 @@
+import asyncio
+import os
+import re
+import time
+
+import discord
+from discord.ext import commands
+
+from config import (
+    CHANNEL_LOGS_ID, CHANNEL_VEILLE_ID, DEDUP_ACTION, DEDUP_GRACE_SECONDS, EMOJI_DUPLICATE,
+    EMOJI_VALIDATION, EXPORT_MAX_BYTES, MYSQL_DATABASE, MYSQL_HOST, MYSQL_PASSWORD, MYSQL_POOL_SIZE,
+    MYSQL_USER, PULL_EDIT_INTERVAL, PULL_TIMEOUT, RECOMMEND_COUNT, SCRAPER_PATH, SEARCH_PAGE_SIZE,
+    SEARCH_REFRESH_SECONDS,
+)
+from utils.database import DatabasePool
+from utils.dedup import extract_urls, older_than
+from utils.recommend import url_key
+from utils.tasks import BackgroundTasks
+
+def _mysql():
+    """Import différé : mysql.connector n'est chargé qu'à la première requête."""
+    import mysql.connector
+    return mysql.connector
+
+def mysql_connect():
+    """Ouvre une connexion MySQL (autocommit : chaque SELECT voit les derniers articles)."""
+    return _mysql().connect(
+        host=MYSQL_HOST, user=MYSQL_USER, password=MYSQL_PASSWORD,
+        database=MYSQL_DATABASE, autocommit=True,
+    )
+
+# ==========================================
+# 🕵️‍♂️ VEILLE & BDD
+# ==========================================
+
+class Veille(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self._posted = None  # Liens des messages veille connus, le temps du premier chargement
+        self.tasks = BackgroundTasks()  # Rafraîchissements de l'index, annulés au !reload
+
+    async def cog_load(self):
+        self.tasks.spawn(self._refresh_when_ready())
+
+    async def cog_unload(self):
+        await self.tasks.close()
+
+    async def _refresh_when_ready(self):
+        # Après la connexion : mysql.connector n'est pas importé avant l'IDENTIFY
+        await self.bot.wait_until_ready()
+        await self.refresh_search_index()
+
+    @property
+    def db(self):
+        """Pool partagé par !search, !news et !export (créé une fois, conservé au !reload)."""
+        if self.bot.db_pool is None:
+            errors = _mysql().errors
+            self.bot.db_pool = DatabasePool(
+                mysql_connect,
+                size=MYSQL_POOL_SIZE,
+                retry_on=(errors.OperationalError, errors.InterfaceError),
+                name="mysql",
+            )
+        return self.bot.db_pool
+
+    @property
+    def db_error(self):
+        # Évalué seulement quand une exception remonte (clause except)
+        return _mysql().Error
+
+    async def fetch_articles_after(self, after_id, limit):
+        """Lot d'articles à indexer (parcours par clé primaire)."""
+        rows = await self.db.fetchall(
+            "SELECT id, titre, source, lien, date FROM articles WHERE id > %s ORDER BY id LIMIT %s", (after_id, limit)
+        )
+        # Un seul parcours de la table alimente aussi l'anti-doublons et les recommandations
+        dedup, recommender = self.bot.dedup_index, self.bot.recommender
+        posted = None
+        if not dedup.ready:
+            # Premier chargement : publié si son message est connu, ou s'il est assez ancien
+            # (un article inséré juste avant un redémarrage n'a pas encore été posté)
+            if self._posted is None:
+                self._posted = recommender.posted_keys()
+            posted = self._posted
+        for article_id, titre, source, lien, date in rows:
+            published = posted is not None and (url_key(lien) in posted or older_than(date, DEDUP_GRACE_SECONDS))
+            dedup.add_article(article_id, titre, lien, published)
+            recommender.add_article(article_id, titre, source, lien)
+        return [(article_id, f"{titre or ''} {source or ''}") for article_id, titre, source, _, _ in rows]
+
+    async def refresh_search_index(self):
+        search_index = self.bot.search_index
+        try:
+            added = await search_index.refresh(self.fetch_articles_after)
+            # Articles suivants : en base avant d'être postés, pas encore des doublons
+            self.bot.dedup_index.ready = True
+            self._posted = None
+            if added:
+                self.bot.query_cache.invalidate()
+                print(f"🔎 Index de recherche : +{added} articles ({len(search_index)} au total).")
+        except self.db_error as err:
+            print(f"⚠️ Index de recherche non mis à jour : {err}")
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        # --- Auto-Réaction Veille ---
+        if message.channel.id == CHANNEL_VEILLE_ID and message.author.id != self.bot.user.id:
+            if self.bot.censor.check(message):
+                return # Supprimé par la censure
+            urls, title = self.article_of(message)
+            if await self.handle_duplicate(message, urls, title):
+                return
+            # Les ✅ sur ce message comptent pour les recommandations de l'article
+            self.bot.recommender.link_message(message.id, urls)
+            try:
+                await message.add_reaction(EMOJI_VALIDATION)
+            except discord.NotFound:
+                # Supprimé entre-temps : l'article pourra être reposté sans passer pour un doublon
+                self.bot.dedup_index.release(message.id, urls, title)
+                return
+            except Exception:
+                pass
+            # Nouvel article : !news / !search en cache périmés, index de recherche complété
+            self.bot.query_cache.invalidate()
+            self.tasks.spawn(self.refresh_search_index())
+
+    @staticmethod
+    def article_of(message):
+        """Liens et titre d'un article posté (embeds n8n, ou texte + lien)."""
+        urls = extract_urls(message.content)
+        title = None
+        for embed in message.embeds:
+            if embed.url:
+                urls.append(embed.url)
+            title = title or embed.title
+        if title is None:
+            title = re.sub(r"https?://\S+", " ", message.content)
+        return urls, title
+
+    async def handle_duplicate(self, message, urls, title):
+        """Article déjà publié (même lien ou titre quasi identique) : supprimé ou signalé, sans ✅."""
+        found = self.bot.dedup_index.claim(message.id, urls, title)
+        if found is None:
+            return False
+        reason, original = found
+        if original > 0:
+            where = f"[message d'origine](https://discord.com/channels/{message.guild.id}/{message.channel.id}/{original})"
+        else:
+            where = f"article #{-original} en base"
+
+        action = "signalé"
+        try:
+            if DEDUP_ACTION == "delete":
+                await message.delete()
+                action = "supprimé"
+            else:
+                await message.add_reaction(EMOJI_DUPLICATE)
+        except discord.HTTPException:
+            pass
+
+        embed = discord.Embed(title="🔁 Article en double", color=0x95a5a6)
+        embed.add_field(name="Auteur", value=message.author.mention, inline=True)
+        embed.add_field(name="Détection", value="même lien" if reason == "url" else "titre quasi identique", inline=True)
+        embed.add_field(name="Original", value=where, inline=False)
+        embed.set_footer(text=f"Doublon {action} • ID: {message.id}")
+        self.bot.audit_log.push(CHANNEL_LOGS_ID, embed)
+        return True
+
+    # ==========================================
+    # 🕵️‍♂️ COMMANDES : VEILLE & BDD
+    # ==========================================
+
+    @commands.command(name="pull")
+    @commands.has_permissions(administrator=True)
+    async def pull(self, ctx):
+        """Lance le script de scraping externe (un seul à la fois, suivi en direct)."""
+        from utils.process import SubprocessJob
+
+        if self.bot.pull_job is None or self.bot.pull_job.finished:
+            if not os.path.exists(SCRAPER_PATH):
+                await ctx.send("❌ Fichier `scraper.py` introuvable.")
+                return
+            self.bot.pull_job = SubprocessJob(["python", "-u", SCRAPER_PATH], timeout=PULL_TIMEOUT)
+            self.bot.tasks.spawn(self.bot.pull_job.run())
+            status_msg = await ctx.send("🕵️‍♂️ **Lancement du Scraper...**")
+        else:
+            status_msg = await ctx.send("⏳ **Scraper déjà en cours**, je suis la même exécution...")
+
+        job = self.bot.pull_job
+        seen = -1
+        while not await job.wait(PULL_EDIT_INTERVAL):
+            # Édition limitée à une toutes les PULL_EDIT_INTERVAL secondes, et seulement si les logs ont bougé
+            if job.line_count != seen:
+                seen = job.line_count
+                tail = "\n".join(job.lines)[-1500:]
+                content = f"🕵️‍♂️ **Scraping en cours...** ({job.elapsed:.0f} s)"
+                if tail:
+                    content += f"\n```{tail}```"
+                await status_msg.edit(content=content)
+
+        summary = f"en {job.elapsed:.1f} s (code {job.returncode})"
+        logs = "\n".join(job.lines)
+        if job.timed_out:
+            await status_msg.edit(content=f"⏱️ **Scraper arrêté** : délai de {PULL_TIMEOUT} s dépassé.")
+        elif job.returncode == 0:
+            await status_msg.edit(content=f"✅ **Terminé** {summary} !")
+            # Les nouveaux articles deviennent trouvables via !search (et visibles dans !news)
+            self.bot.query_cache.invalidate()
+            self.tasks.spawn(self.refresh_search_index())
+        else:
+            await status_msg.edit(content=f"❌ **Crash du script** {summary} !")
+        if logs:
+            await ctx.send(f"📄 **Logs :**\n```{logs[-1900:]}```")
+
+    @commands.command(name="search")
+    async def search_article(self, ctx, *, query: str):
+        """Recherche plein texte, triée par pertinence (Ex: !search docker sécurité -p 2)."""
+        search_index = self.bot.search_index
+        page = 1
+        paged = re.match(r"^(.*?)\s+-p\s*(\d+)$", query)
+        if paged:
+            query, page = paged.group(1), max(1, int(paged.group(2)))
+
+        await ctx.send(f"🔎 Recherche de **'{query}'**...")
+
+        async def load():
+            if not search_index.ready:
+                # Index encore en construction : ancienne recherche par sous-chaîne
+                sql = "SELECT titre, lien FROM articles WHERE titre LIKE %s ORDER BY id DESC LIMIT %s"
+                rows = await self.db.fetchall(sql, (f"%{query}%", SEARCH_PAGE_SIZE))
+                return len(rows), rows
+            if time.monotonic() - search_index.refreshed_at > SEARCH_REFRESH_SECONDS:
+                await self.refresh_search_index()
+            # BM25 + préfixes : des dizaines de ms sur un gros index, hors de la boucle d'événements
+            total, ids = await asyncio.to_thread(
+                search_index.search, query, offset=(page - 1) * SEARCH_PAGE_SIZE, limit=SEARCH_PAGE_SIZE
+            )
+            if not ids:
+                return total, []
+            placeholders = ", ".join(["%s"] * len(ids))
+            rows = await self.db.fetchall(f"SELECT id, titre, lien FROM articles WHERE id IN ({placeholders})", tuple(ids))
+            by_id = {article_id: (titre, lien) for article_id, titre, lien in rows}
+            return total, [by_id[i] for i in ids if i in by_id]
+
+        try:
+            # Recherches fréquentes (2e demande) servies sans aller-retour MySQL
+            key = ("search", " ".join(query.lower().split()), page)
+            total, results = await self.bot.query_cache.get(key, load, admit_after=2)
+
+            if not results:
+                await ctx.send("❌ Aucun résultat.")
+                return
+
+            pages = max(1, -(-total // SEARCH_PAGE_SIZE))
+            embed = discord.Embed(title=f"🗃️ Résultats : {query}", color=0x3498db)
+            for titre, lien in results:
+                embed.add_field(name="📄 Article", value=f"[{titre}]({lien})", inline=False)
+            embed.set_footer(text=f"{total} article(s) • Page {page}/{pages} • !search {query} -p <page>")
+            await ctx.send(embed=embed)
+        except self.db_error as err:
+            await ctx.send(f"❌ Erreur SQL : `{err}`")
+
+    @commands.command(name="news")
+    async def latest_news(self, ctx):
+        try:
+            # Ne change qu'avec un nouvel article : relu en base après invalidation ou TTL
+            results = await self.bot.query_cache.get(
+                "news", lambda: self.db.fetchall("SELECT titre, lien, date FROM articles ORDER BY id DESC LIMIT 5")
+            )
+
+            if not results:
+                await ctx.send("❌ Base vide.")
+                return
+
+            embed = discord.Embed(title="📰 Dernières News", color=0x2ecc71)
+            for titre, lien, date in results:
+                embed.add_field(name=f"📅 {date}", value=f"[{titre}]({lien})", inline=False)
+            await ctx.send(embed=embed)
+        except self.db_error as err:
+            await ctx.send(f"❌ Erreur SQL : `{err}`")
+
+    @commands.command(name="recommend")
+    async def recommend(self, ctx):
+        """Articles proches de ceux que tu as validés ✅ (et pas encore lus)."""
+        # Calcul NumPy hors de la boucle d'événements (import compris au premier appel)
+        ids = await asyncio.to_thread(self.bot.recommender.recommend, ctx.author.id, RECOMMEND_COUNT)
+        if not ids:
+            await ctx.send("📭 Valide quelques articles ✅ dans le salon veille pour recevoir des recommandations.")
+            return
+        try:
+            placeholders = ", ".join(["%s"] * len(ids))
+            rows = await self.db.fetchall(f"SELECT id, titre, lien FROM articles WHERE id IN ({placeholders})", tuple(ids))
+        except self.db_error as err:
+            await ctx.send(f"❌ Erreur SQL : `{err}`")
+            return
+        by_id = {article_id: (titre, lien) for article_id, titre, lien in rows}
+        embed = discord.Embed(title=f"💡 À lire ensuite, {ctx.author.display_name}", color=0x9b59b6)
+        for article_id in ids:
+            if article_id in by_id:
+                titre, lien = by_id[article_id]
+                embed.add_field(name="📄 Article", value=f"[{titre}]({lien})", inline=False)
+        embed.set_footer(text="D'après les articles que tu as validés ✅")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="export")
+    @commands.has_permissions(administrator=True)
+    async def export_db(self, ctx, *filters):
+        """Export CSV compressé (Ex: !export depuis:2024-01-01 jusqu:2024-06-30 source:Korben)."""
+        from utils.export import stream_csv_parts
+
+        clauses, params = [], []
+        columns = {"depuis": "date >= %s", "jusqu": "date <= %s", "source": "source = %s"}
+        for item in filters:
+            key, _, value = item.partition(":")
+            if key not in columns or not value:
+                await ctx.send("❌ Filtres possibles : `depuis:AAAA-MM-JJ`, `jusqu:AAAA-MM-JJ`, `source:<nom>`.")
+                return
+            clauses.append(columns[key])
+            params.append(value)
+
+        sql = "SELECT id, date, titre, lien, source FROM articles"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+
+        await ctx.send("⏳ Génération du CSV...")
+        parts = []
+        try:
+            parts = await self.db.run(
+                stream_csv_parts, sql, tuple(params), ['ID', 'Date', 'Titre', 'Lien', 'Source'], EXPORT_MAX_BYTES
+            )
+            total = sum(rows for _, rows in parts)
+            stamp = ctx.message.created_at.strftime("%Y%m%d-%H%M%S")
+            for i, (fp, rows) in enumerate(parts, 1):
+                suffix = f".part{i}" if len(parts) > 1 else ""
+                filename = f"export_veille_{stamp}{suffix}.csv.gz"
+                text = f"✅ Export de {total} articles :" if i == 1 else f"📎 Partie {i}/{len(parts)} ({rows} articles)"
+                await ctx.send(text, file=discord.File(fp, filename=filename))
+        except Exception as e:
+            await ctx.send(f"❌ Erreur : `{e}`")
+        finally:
+            for fp, _ in parts:
+                fp.close()
+
+    @commands.command(name="so")
+    async def stackoverflow(self, ctx, *, query):
+        """Cherche une solution sur StackOverflow (Ex: !so python list index out of range)."""
+        await ctx.send(f"🔎 Recherche sur StackOverflow pour : **{query}**...")
+
+        try:
+            # Client partagé : session réutilisée, cache, requêtes identiques fusionnées
+            items = await self.bot.so_client.search(query)
+
+            # Vérification si on a des résultats
+            if not items:
+                await ctx.send("❌ Aucun résultat trouvé.")
+                return
+
+            # On prend le premier résultat (le plus pertinent)
+            top_result = items[0]
+
+            # Création de la jolie fiche
+            embed = discord.Embed(
+                title=top_result["title"],
+                url=top_result["link"],
+                color=0xf48024 # Le orange officiel de StackOverflow
+            )
+            embed.add_field(name="Score", value=str(top_result["score"]), inline=True)
+            embed.add_field(name="Réponses", value=str(top_result["answer_count"]), inline=True)
+            embed.add_field(name="Tags", value=", ".join(top_result.get("tags", [])[:3]), inline=False)
+            embed.set_footer(text="Stack Overflow • For Developers")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send(f"⚠️ Erreur lors de la recherche : `{e}`")
+
+async def setup(bot):
+    await bot.add_cog(Veille(bot))
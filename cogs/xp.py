@@ -0,0 +1,105 @@
+import discord
+from discord.ext import commands
+
+from config import CHANNEL_GENERAL_ID, CHANNEL_VEILLE_ID, EMOJI_VALIDATION, TOP_PAGE_SIZE, XP_PER_CLICK, XP_PER_LEVEL
+from utils.xplog import sparkline
+
+PERIODS = {"week": "de la semaine", "semaine": "de la semaine", "month": "du mois", "mois": "du mois"}
+
+# ==========================================
+# 🧠 XP & CLASSEMENT
+# ==========================================
+
+class XP(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        # --- Système d'XP ---
+        if payload.channel_id == CHANNEL_VEILLE_ID and str(payload.emoji) == EMOJI_VALIDATION:
+            if payload.user_id == self.bot.user.id: return
+            if payload.message_id in self.bot.dedup_index.duplicates: return # Doublon signalé
+
+            # Déjà validé (retrait puis remise de la réaction) : rien ne change, rien n'est écrit
+            if not self.bot.awards.add(payload.message_id, payload.user_id):
+                return
+
+            # Validation + gain atomiques : (ancienne, nouvelle) XP propres à ce gain,
+            # même si d'autres shards créditent le même membre au même moment
+            try:
+                result = await self.bot.xp_store.award(payload.message_id, payload.user_id, XP_PER_CLICK)
+            except Exception:
+                # Gain non écrit (base partagée verrouillée, disque...) : la prochaine réaction réessaie
+                self.bot.awards.discard(payload.message_id, payload.user_id)
+                raise
+            if result is None:
+                return # Déjà validé via un autre process
+            current_xp, new_xp = result
+            self.bot.leaderboard.update(str(payload.user_id), new_xp)
+            self.bot.xp_log.record(payload.user_id, payload.message_id, XP_PER_CLICK)
+            self.bot.recommender.add_read(payload.user_id, payload.message_id)
+            current_level = current_xp // XP_PER_LEVEL
+            new_level = new_xp // XP_PER_LEVEL
+
+            if new_level > current_level:
+                channel = self.bot.get_channel(CHANNEL_GENERAL_ID)
+                if channel:
+                    member = self.bot.get_guild(payload.guild_id).get_member(payload.user_id)
+                    if member:
+                        await channel.send(f"🎉 **LEVEL UP !** {member.mention} passe **Niveau {new_level}** ! 🧠")
+
+    @commands.command(name="level")
+    async def level(self, ctx):
+        uid = str(ctx.author.id)
+        xp = self.bot.user_xp.get(uid, 0)
+        lvl = xp // XP_PER_LEVEL
+        desc = f"Niveau **{lvl}** ({xp} XP)"
+        leaderboard = self.bot.leaderboard
+        rank = leaderboard.rank(uid)
+        if rank:
+            desc += f"\nClassement : **#{rank}** sur {len(leaderboard)}"
+        xp_log = self.bot.xp_log
+        history = xp_log.history(ctx.author.id, days=14)
+        if any(history):
+            desc += (f"\nCette semaine : **{xp_log.period_total(ctx.author.id, 'week')} XP** • "
+                     f"ce mois : **{xp_log.period_total(ctx.author.id, 'month')} XP**")
+            desc += f"\n14 derniers jours : `{sparkline(history)}`"
+        await ctx.send(embed=discord.Embed(title="📊 Niveau", description=desc, color=0x3498db))
+
+    @commands.command(name="top")
+    async def top(self, ctx, period: str = "", page: int = 1):
+        """Classement général, ou de la période en cours (Ex: !top week, !top month 2)."""
+        if period.isdigit():
+            period, page = "", int(period)
+        period = period.lower()
+        if period in PERIODS:
+            await self.top_period(ctx, period, page)
+            return
+        leaderboard = self.bot.leaderboard
+        pages = max(1, -(-len(leaderboard) // TOP_PAGE_SIZE))
+        page = min(max(1, page), pages)
+        offset = (page - 1) * TOP_PAGE_SIZE
+        entries = leaderboard.page(offset, TOP_PAGE_SIZE)
+        desc = "\n".join([f"**#{i}** <@{uid}> : Niv {xp // XP_PER_LEVEL}" for i, (uid, xp) in enumerate(entries, offset + 1)])
+        embed = discord.Embed(title="🏆 Classement", description=desc or "Vide", color=0xf1c40f)
+        if pages > 1:
+            embed.set_footer(text=f"Page {page}/{pages} • !top <page>")
+        await ctx.send(embed=embed)
+
+    async def top_period(self, ctx, period, page):
+        # Agrégats tenus à chaque gain : aucune relecture du journal
+        key = "week" if period in ("week", "semaine") else "month"
+        total, _ = self.bot.xp_log.top(key, 0, 0)
+        pages = max(1, -(-total // TOP_PAGE_SIZE))
+        page = min(max(1, page), pages)
+        offset = (page - 1) * TOP_PAGE_SIZE
+        _, entries = self.bot.xp_log.top(key, offset, TOP_PAGE_SIZE)
+        desc = "\n".join([f"**#{i}** <@{uid}> : {xp} XP" for i, (uid, xp) in enumerate(entries, offset + 1)])
+        embed = discord.Embed(title=f"🏆 Classement {PERIODS[period]}", description=desc or "Personne pour l'instant", color=0xf1c40f)
+        if pages > 1:
+            embed.set_footer(text=f"Page {page}/{pages} • !top {period} <page>")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(XP(bot))
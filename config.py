@@ -0,0 +1,120 @@
+"""Configuration du bot (constantes et variables d'environnement).
+
+Module jamais rechargé par `!reload` : les cogs peuvent l'importer librement.
+"""
+import os
+from dotenv import load_dotenv
+
+# Charge les variables d'environnement
+load_dotenv()
+
+# ==========================================
+# ⚙️ CONFIGURATION & CONSTANTES
+# ==========================================
+
+# --- Base MySQL (articles de veille) ---
+MYSQL_HOST      = os.getenv("MYSQL_HOST", "localhost")
+MYSQL_USER      = os.getenv("MYSQL_USER", "parabot")
+MYSQL_PASSWORD  = os.getenv("MYSQL_PASSWORD", "")
+MYSQL_DATABASE  = os.getenv("MYSQL_DATABASE", "veille_tech")
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "4"))
+
+# --- Veille (scraper, recherche, export) ---
+SCRAPER_PATH           = "/app/external_scraper/scraper.py"
+PULL_TIMEOUT           = int(os.getenv("PULL_TIMEOUT", "600"))  # Secondes avant de tuer le scraper
+PULL_EDIT_INTERVAL     = 3  # Secondes minimum entre deux mises à jour du message de statut
+EXPORT_MAX_BYTES       = 8 * 1024 * 1024  # Taille max d'une pièce jointe Discord (serveur non boosté)
+SEARCH_PAGE_SIZE       = 5
+SEARCH_REFRESH_SECONDS = 300  # Filet de sécurité si un article n'est pas passé par le salon veille
+QUERY_CACHE_TTL        = 300  # Résultats !news / !search gardés au plus N s (vidés à chaque nouvel article)
+QUERY_CACHE_ENTRIES    = 128
+RECOMMEND_COUNT        = 5
+RECOMMEND_LINKS_FILE   = os.getenv("RECOMMEND_LINKS_FILE", "data/veille_links.bin")  # Message veille -> lien de l'article
+SO_TIMEOUT             = 10   # Secondes max pour une requête StackExchange
+SO_CACHE_TTL           = 600  # Durée de vie d'une réponse en cache
+DEDUP_ACTION           = os.getenv("DEDUP_ACTION", "delete")  # Article déjà publié : "delete" ou "flag" (🔁, sans XP)
+DEDUP_GRACE_SECONDS    = 48 * 3600  # Au démarrage, article plus récent sans message connu : pas encore posté
+DEDUP_FILE             = os.getenv("DEDUP_FILE", "data/duplicates.bin")  # Messages signalés comme doublons
+EMOJI_DUPLICATE        = "🔁"
+
+# --- Logs de modération ---
+AUDIT_WINDOW         = 2  # Secondes de regroupement avant envoi
+AUDIT_COLLAPSE_AFTER = 5  # Au-delà, les suppressions d'un salon sont résumées
+MESSAGE_CACHE_MB     = int(os.getenv("MESSAGE_CACHE_MB", "16"))  # Contenus gardés pour les logs de suppression / modification
+MESSAGE_CACHE_PER_CHANNEL = 5000
+
+# --- Anti-flood ---
+FLOOD_MAX_MESSAGES     = 6    # Plus de N messages...
+FLOOD_WINDOW           = 5    # ...en N secondes : flood
+FLOOD_MAX_DUPLICATES   = 3    # N messages identiques...
+FLOOD_DUPLICATE_WINDOW = 30   # ...en N secondes : flood
+FLOOD_TIMEOUT_MINUTES  = 5    # Durée du mute automatique
+
+# --- Modération de masse (!massban, !massmute, !purge) ---
+MASS_CONCURRENCY        = 5     # Actions simultanées (mutes) ; les limites de l'API restent gérées par discord.py
+MASS_BAN_DELETE_SECONDS = 3600  # Messages des bannis effacés sur cette période
+PURGE_MAX_SCAN          = 1000  # Messages examinés au plus par !purge
+
+# --- Arrivées & anti-raid ---
+ROLE_ASSIGN_INTERVAL = 0.5  # Secondes entre deux attributions de rôle
+WELCOME_WINDOW       = 10   # Les arrivées de cette fenêtre partagent un message de bienvenue
+RAID_THRESHOLD       = 15   # Arrivées en RAID_WINDOW secondes déclenchant le mode raid
+RAID_WINDOW          = 60
+RAID_COOLDOWN        = 300  # Fin du mode raid après ce délai sans arrivée
+
+# --- Métriques ---
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # Endpoint Prometheus local (0 : désactivé)
+PROFILE_MAX_SECONDS       = 300    # Durée maximale d'un !profile
+PROFILE_SAMPLE_INTERVAL   = 0.005  # Période d'échantillonnage de la pile de la boucle (s)
+PROFILE_BLOCK_THRESHOLD   = 0.05   # Blocage de la boucle signalé au-delà (s)
+
+# --- IDs des Salons ---
+CHANNEL_VEILLE_ID    = 1463268390436343808
+CHANNEL_GENERAL_ID   = 1463268249738154119
+CHANNEL_WELCOME_ID   = 1465122841753026560
+CHANNEL_LOGS_ID      = 1465804036270719159
+CHANNEL_ALERTS_ID    = 1465971729947037762
+CHANNEL_SUGGESTIONS_ID = 1465976916703187067
+
+# --- Gameplay & Rôles ---
+ROLE_READER_NAME = "Reader"
+EMOJI_VALIDATION = "✅"
+XP_PER_CLICK     = 10
+XP_PER_LEVEL     = 100
+AWARD_MAX_ARTICLES = 50_000  # Articles dont on retient les lecteurs (les plus anciens ne rapportent plus d'XP)
+TOP_PAGE_SIZE    = 10
+
+# --- Fichiers de données ---
+DATA_FILE  = "xp_data.json"
+WARNS_FILE = "warns.json"  # Snapshot des warns en mode JSON
+WARNS_JOURNAL = os.getenv("WARNS_JOURNAL", "data/warns.journal")  # Une ligne par warn ajouté / retiré
+WARNS_COMPACT_BYTES = 256 * 1024  # Au-delà, le journal est fusionné dans WARNS_FILE
+AWARDS_FILE = os.getenv("AWARDS_FILE", "data/awards.bin")  # Validations (article, membre) en mode JSON (volume ./data)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")  # "sqlite" ou "json"
+DB_FILE = os.getenv("DB_FILE", "data/veillemanager.db")
+XP_FLUSH_INTERVAL = 30   # Secondes entre deux sauvegardes de l'XP
+XP_FLUSH_MAX_DIRTY = 50  # Sauvegarde anticipée au-delà de N joueurs modifiés
+XP_LOG_DIR = os.getenv("XP_LOG_DIR", "data/xp_log")  # Historique des gains (!top week / month, !level)
+XP_LOG_SEGMENT_BYTES = 4 * 1024 * 1024  # Segment fermé et compressé au-delà (~190k gains)
+XP_LOG_KEEP_DAYS = 90  # Historique jour par jour conservé en mémoire
+
+# --- Sharding (plusieurs process partagent la base SQLite) ---
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # 0 : un seul process, sans sharding
+SHARD_IDS   = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i.strip()]  # Shards de ce process (vide : tous)
+SHARED_SYNC_INTERVAL = 30  # Secondes entre deux rechargements de l'XP gagnée par les autres process
+
+# --- Liste des mots interdits ---
+BAD_WORDS = [
+    "merde", "putain", "con", "connard", "connasse", "salope", "pute", 
+    "enculé", "encule", "bâtard", "batard", "salaud", "bouffon", "boloss",
+    "abruti", "débile", "triso", "mongol", "gogol", "idiot",
+    "tg", "ftg", "fdp", "ntm", "vtff", "ptn",
+    "bite", "couille", "chatte", "nique", "niquer", "suce", "sucer", 
+    "branleur", "branlette", "trou du cul", "foutre",
+    "negro", "nègre", "negre", "bougnoule", "crouille", "youpin", "raton",
+    "pd", "pédé", "pede", "tarlouze", "fiotte", "gouine", "travelo",
+    "chinetoque", "bamboula", "sale noir", "sale arabe", "sale juif"
+]
+
+# --- Extensions chargées au démarrage (rechargeables à chaud avec !reload) ---
+EXTENSIONS = ["cogs.admin", "cogs.moderation", "cogs.xp", "cogs.veille", "cogs.fun"]
@@ -0,0 +1,6 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules du bot + faux objets Discord de benchmarks/harness.py
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
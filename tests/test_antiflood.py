@@ -0,0 +1,84 @@
+"""Anti-flood : seuils aux bornes des fenêtres, et comparaison avec un modèle naïf."""
+import random
+
+import pytest
+
+from utils.antiflood import FloodDetector
+
+T0 = 1000.0  # Horloge monotone (un horodatage 0 marque une case vide du tampon)
+
+
+def detector():
+    return FloodDetector(max_messages=6, window=5.0, max_duplicates=3, duplicate_window=30.0, ring=8)
+
+
+@pytest.mark.parametrize("last_at, flood", [(5.0, True), (5.001, False)])
+def test_rate_threshold_at_window_boundary(last_at, flood):
+    flood_detector = detector()
+    for i in range(6):  # 6 messages : autorisés
+        assert flood_detector.check(1, 10, i, f"message {i}", now=T0 + i * last_at / 6) is None
+    verdict = flood_detector.check(1, 10, 6, "message 6", now=T0 + last_at)  # 7e message
+    if flood:
+        assert verdict.reason == "rate" and verdict.count == 7
+        assert [m for _, m in verdict.messages] == list(range(7))
+    else:
+        assert verdict is None
+
+
+@pytest.mark.parametrize("last_at, flood", [(30.0, True), (30.001, False)])
+def test_duplicate_threshold_at_window_boundary(last_at, flood):
+    flood_detector = detector()
+    assert flood_detector.check(1, 10, 1, "regardez mon serveur", now=T0) is None
+    assert flood_detector.check(1, 11, 2, "regardez mon serveur", now=T0 + 10) is None
+    verdict = flood_detector.check(1, 12, 3, "regardez mon serveur", now=T0 + last_at)
+    if flood:
+        assert verdict.reason == "duplicates" and sorted(verdict.messages) == [(10, 1), (11, 2), (12, 3)]
+    else:
+        assert verdict is None
+
+
+def test_flood_resets_counters_and_idle_members_are_forgotten():
+    flood_detector = FloodDetector(max_messages=2, window=5.0, max_duplicates=3, idle_after=60.0)
+    for i in range(3):
+        verdict = flood_detector.check(1, 10, i, str(i), now=T0 + i)
+    assert verdict.reason == "rate"
+    assert flood_detector.check(1, 10, 3, "3", now=T0 + 3) is None  # La rafale sanctionnée ne compte plus
+    flood_detector.check(2, 10, 4, "x", now=T0 + 100)
+    assert len(flood_detector) == 1  # Membre 1 silencieux depuis plus de idle_after
+
+
+class NaiveFlood:
+    """Même règles sur la liste complète des messages depuis la dernière sanction."""
+
+    def __init__(self, ring):
+        self.ring = ring
+        self.history = []
+
+    def check(self, t, message_id, content):
+        self.history.append((t, message_id, content))
+        recent = self.history[-self.ring:]
+        in_window = [m for ts, m, _ in recent if t - ts <= 5.0]
+        if len(in_window) > 6:
+            self.history = []
+            return "rate", in_window
+        copies = [m for ts, m, c in recent if c == content and t - ts <= 30.0]
+        if len(copies) >= 3:
+            self.history = []
+            return "duplicates", copies
+        return None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_model(seed):
+    rng = random.Random(seed)
+    flood_detector, model = detector(), NaiveFlood(ring=8)
+    now = T0
+    for message_id in range(2000):
+        now += rng.choice((0.1, 0.5, 1.0, 2.0, 8.0, 20.0))
+        content = rng.choice(("salut", "ok", "lol", "regardez", "gg", "merci"))
+        verdict = flood_detector.check(1, 10, message_id, content, now=now)
+        expected = model.check(now, message_id, content)
+        if expected is None:
+            assert verdict is None
+        else:
+            assert (verdict.reason, sorted(m for _, m in verdict.messages)) == (expected[0], sorted(expected[1]))
@@ -0,0 +1,54 @@
+"""Validations (article, membre) : une paire dont le gain n'a pas été écrit peut être revalidée."""
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import config
+from cogs.xp import XP
+from utils.awards import AwardIndex
+
+
+@pytest.mark.parametrize("readers", [3, 100])  # Ensemble creux, puis bitset
+def test_discard_frees_the_pair(readers):
+    index = AwardIndex(sparse_max=64)
+    for user_id in range(readers):
+        assert index.add(1000, user_id)
+    assert index.discard(1000, 1)
+    assert not index.discard(1000, 1)
+    assert not index.contains(1000, 1) and index.contains(1000, 2)
+    assert len(index) == readers - 1
+    assert index.add(1000, 1)
+
+
+class LockedStore:
+    """SharedStore dont la transaction échoue d'abord (base verrouillée par un autre shard)."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def award(self, message_id, user_id, amount):
+        self.calls += 1
+        if self.calls == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return None  # Déjà validé ailleurs : rien d'autre à faire
+
+
+def test_failed_award_can_be_retried_by_the_next_reaction():
+    bot = SimpleNamespace(
+        user=SimpleNamespace(id=1), awards=AwardIndex(), xp_store=LockedStore(),
+        dedup_index=SimpleNamespace(duplicates=set()),
+    )
+    payload = SimpleNamespace(channel_id=config.CHANNEL_VEILLE_ID, emoji=config.EMOJI_VALIDATION,
+                              user_id=42, message_id=1000, guild_id=7)
+    cog = XP(bot)
+
+    async def scenario():
+        with pytest.raises(sqlite3.OperationalError):
+            await cog.on_raw_reaction_add(payload)
+        assert not bot.awards.contains(1000, 42)
+        await cog.on_raw_reaction_add(payload)  # Retrait puis remise de la réaction
+
+    asyncio.run(scenario())
+    assert bot.xp_store.calls == 2
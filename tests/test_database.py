@@ -0,0 +1,64 @@
+"""DatabasePool sur sqlite3 : requête rejouée après une coupure, connexions mortes écartées."""
+import asyncio
+import sqlite3
+
+import pytest
+
+from utils.database import DatabasePool
+
+
+def make_pool(tmp_path, **options):
+    path = str(tmp_path / "articles.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, titre TEXT)")
+        conn.execute("INSERT INTO articles (titre) VALUES ('docker'), ('python')")
+    return DatabasePool(
+        lambda: sqlite3.connect(path, check_same_thread=False),
+        size=2, retry_on=(sqlite3.OperationalError,), **options,
+    )
+
+
+def test_query_is_retried_once_on_a_fresh_connection(tmp_path):
+    pool = make_pool(tmp_path)
+    used = []
+
+    def flaky(conn):
+        used.append(conn)
+        if len(used) == 1:
+            raise sqlite3.OperationalError("server has gone away")
+        return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def always_down(conn):
+        raise sqlite3.OperationalError("server has gone away")
+
+    async def scenario():
+        assert await pool.run(flaky) == 2
+        assert used[0] is not used[1]
+        with pytest.raises(sqlite3.OperationalError):
+            await pool.run(always_down)  # Une seule nouvelle tentative
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.close()
+    assert pool.stats["reconnects"] == 3
+    assert pool.stats["errors"] == 1
+    assert pool.stats["in_use"] == 0
+
+
+def test_idle_connection_is_health_checked_before_reuse(tmp_path):
+    pool = make_pool(tmp_path, health_check_after=0)
+
+    async def scenario():
+        assert await pool.fetchall("SELECT titre FROM articles ORDER BY id") == [("docker",), ("python",)]
+        (dead, _), = pool._idle.queue
+        dead.close()  # Coupée côté serveur pendant l'inactivité
+        assert await pool.fetchall("SELECT COUNT(*) FROM articles WHERE titre = ?", ("python",)) == [(1,)]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.close()
+    assert pool.stats["created"] == 2
+    assert pool.stats["reconnects"] == 1
+    assert pool.stats["errors"] == 0
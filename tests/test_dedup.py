@@ -0,0 +1,98 @@
+"""Anti-doublons du salon veille : premier arrivé original, relâche, doublons persistés."""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT
+from utils.dedup import PENDING, DedupIndex, normalize_url
+
+URL = "https://www.example.com/docker-27?utm_source=n8n"
+SAME_URL = "https://example.com/docker-27/"
+TITLE = "Docker 27 apporte le support natif des builds multiplateformes"
+
+
+def run_in_thread(func, *args):
+    return asyncio.to_thread(func, *args)
+
+
+def test_same_normalized_url_first_claim_wins_and_release_reopens_it(tmp_path):
+    index = DedupIndex()
+    index.load(str(tmp_path / "duplicates.bin"))
+    index.add_article(1, TITLE, URL)  # En base, pas encore posté
+    assert normalize_url(URL) == normalize_url(SAME_URL)
+
+    assert index.claim(500, [URL], TITLE) is None  # PENDING : le premier message est l'original
+    assert index.claim(501, [SAME_URL], "Autre titre sans rapport avec le premier") == ("url", 500)
+    assert index.claim(502, [], TITLE + " - Le Blog") == ("title", 500)
+    assert index.duplicates == {501, 502}
+
+    assert index.release(500, [URL], TITLE)
+    assert index.urls[hash(normalize_url(URL))] == PENDING
+    assert index.claim(503, [SAME_URL], TITLE) is None  # Reposté : nouvel original
+    assert not index.release(500, [URL], TITLE)  # Plus rien ne pointe vers 500
+
+
+def test_flagged_duplicates_survive_restart_above_the_floor(tmp_path):
+    path = str(tmp_path / "duplicates.bin")
+    index = DedupIndex()
+    index.load(path)
+    index.claim(100, [URL], TITLE)
+    for message_id in (101, 102, 103):
+        index.claim(message_id, [URL], TITLE)
+    asyncio.run(index.log.flush(run_in_thread))
+
+    restarted = DedupIndex()
+    assert restarted.load(path, floor=101) == 2
+    assert restarted.duplicates == {102, 103}
+    asyncio.run(restarted.log.flush(run_in_thread))
+    assert os.path.getsize(path) == 2 * 8  # Doublons sous le plancher retirés du fichier
+
+
+# Cog Veille dans le vrai bot (harnais, process séparé : `bot` est un singleton)
+CHILD = textwrap.dedent("""
+    import asyncio, json, sys
+    from types import SimpleNamespace
+    sys.path[:0] = [{root!r}, {benchmarks!r}]
+    import discord
+    from harness import FakeMessage, Harness
+
+    async def main():
+        h = Harness(directory={directory!r})
+        await h.start()
+        poster = h.guild.add_member("n8n")
+        on_message = h.handler("on_message")
+        first, second = (FakeMessage(f"Docker 27 est sorti {{url}}", poster, h.veille) for url in ({url!r}, {same!r}))
+        await asyncio.gather(on_message(first), on_message(second))  # n8n et !pull en même temps
+
+        async def gone(emoji):
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+        deleted = FakeMessage("Rust 2.0 annoncé https://example.com/rust-2", poster, h.veille)
+        deleted.add_reaction = gone  # Supprimé avant la ✅
+        await on_message(deleted)
+        repost = FakeMessage("Rust 2.0 annoncé https://example.com/rust-2?utm_medium=x", poster, h.veille)
+        await on_message(repost)
+        await h.stop()
+        print(json.dumps({{
+            "first": [first.deleted, first.reactions], "second": [second.deleted, second.reactions],
+            "repost": [repost.deleted, repost.reactions], "second_id": second.id,
+        }}))
+
+    asyncio.run(main())
+""")
+
+
+def test_veille_channel_flow(tmp_path):
+    code = CHILD.format(root=ROOT, benchmarks=os.path.join(ROOT, "benchmarks"), directory=str(tmp_path),
+                        url=URL, same=SAME_URL)
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report["first"] == [False, ["✅"]]
+    assert report["second"] == [True, []]  # DEDUP_ACTION=delete par défaut
+    assert report["repost"] == [False, ["✅"]]  # L'original supprimé ne bloque pas le repost
+    with open(tmp_path / "duplicates.bin", "rb") as f:
+        assert int.from_bytes(f.read(), "little") == report["second_id"]
@@ -0,0 +1,60 @@
+"""Harnais de rejeu (benchmarks/) : les handlers du vrai bot tournent sans Discord."""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT
+
+# Un process par test : `bot` est un singleton de module, inutilisable après close()
+CHILD = textwrap.dedent("""
+    import asyncio, json, sys
+    sys.path[:0] = [{root!r}, {benchmarks!r}]
+    from harness import FakeMessage, FakeReactionPayload, Harness
+
+    async def main():
+        h = Harness(directory={directory!r})
+        await h.start()
+        author, reader = h.guild.add_member("auteur"), h.guild.add_member("lecteur")
+        insult = FakeMessage("quel connard ce bug", author, h.general)
+        await h.handler("on_message")(insult)
+        article = FakeMessage("Docker 27 est sorti https://example.com/docker-27", author, h.veille)
+        await h.handler("on_message")(article)
+        reaction = FakeReactionPayload(article, reader.id, h.config.EMOJI_VALIDATION)
+        await h.handler("on_raw_reaction_add")(reaction)
+        await h.handler("on_raw_reaction_add")(reaction)  # Même validation : pas d'XP en plus
+        await h.stop()
+        print(json.dumps({{
+            "reader": reader.id,
+            "insult_deleted": insult.deleted,
+            "reposted": [content for content, _ in h.general.sent],
+            "article_reactions": article.reactions,
+        }}))
+
+    asyncio.run(main())
+""")
+
+
+def run_child(args, cwd):
+    return subprocess.run([sys.executable, *args], cwd=cwd, capture_output=True, text=True, timeout=60)
+
+
+def test_handlers_run_against_fake_guild_and_persist_state(tmp_path):
+    code = CHILD.format(root=ROOT, benchmarks=os.path.join(ROOT, "benchmarks"), directory=str(tmp_path))
+    result = run_child(["-c", code], tmp_path)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report["insult_deleted"]
+    assert report["reposted"][0].startswith("📣") and "connard" not in report["reposted"][0]
+    assert report["article_reactions"] == ["✅"]
+    assert json.loads((tmp_path / "xp.json").read_text()) == {str(report["reader"]): 10}
+    assert (tmp_path / "links.bin").stat().st_size == 16  # Lien de l'article écrit au flush final
+
+
+def test_loadtest_runs_every_scenario(tmp_path):
+    script = os.path.join(ROOT, "benchmarks", "loadtest.py")
+    result = run_child([script, "--messages", "200", "--reactions", "100", "--joins", "20", "--deletes", "20"], tmp_path)
+    assert result.returncode == 0, result.stderr
+    rows = dict(line.split()[:2] for line in result.stdout.splitlines() if line.startswith("on_"))
+    assert rows == {"on_message": "200", "on_raw_reaction_add": "100", "on_member_join": "20", "on_raw_message_delete": "20"}
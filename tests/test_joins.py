@@ -0,0 +1,29 @@
+"""File des arrivées : close() attend réellement la fin des workers annulés."""
+import asyncio
+
+from utils.joins import JoinPipeline
+
+
+def test_close_waits_for_cancelled_workers():
+    finished = []
+
+    async def slow_role(member):
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            finished.append(("role", member))
+
+    async def noop(*args):
+        pass
+
+    async def scenario():
+        pipeline = JoinPipeline(slow_role, noop, noop, welcome_window=3600)
+        pipeline.start()
+        pipeline.push("alice")
+        await asyncio.sleep(0)  # Le worker prend le membre et attend l'API
+        await pipeline.close()
+        # Nettoyage des workers terminé avant le retour de close() (session HTTP encore ouverte)
+        assert finished == [("role", "alice")]
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    asyncio.run(scenario())
@@ -0,0 +1,32 @@
+"""Classement (paquets triés + Fenwick) comparé à un tri naïf après chaque mise à jour."""
+import random
+
+import pytest
+
+from utils.leaderboard import Leaderboard
+
+
+def naive(scores):
+    return [(uid, -neg_xp) for neg_xp, uid in sorted((-xp, uid) for uid, xp in scores.items())]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_and_page_match_sorted(seed):
+    rng = random.Random(seed)
+    board = Leaderboard(load=4)  # Petits paquets : découpes et paquets vidés fréquents
+    scores = {f"u{i}": rng.randrange(0, 50) for i in range(rng.randrange(0, 30))}
+    board.rebuild(scores.items())
+    for step in range(600):
+        uid = f"u{rng.randrange(80)}"
+        scores[uid] = max(0, scores.get(uid, 0) + rng.choice((-30, -5, 0, 5, 10, 10, 40)))
+        board.update(uid, scores[uid])
+        expected = naive(scores)
+        assert len(board) == len(expected)
+        if step % 10 == 0:
+            for place, (user_id, _) in enumerate(expected, 1):
+                assert board.rank(user_id) == place
+            for offset in (0, 1, 3, len(expected) - 2, len(expected)):
+                for limit in (1, 5, 10):
+                    assert board.page(max(0, offset), limit) == expected[max(0, offset):max(0, offset) + limit]
+    assert board.rank("absent") is None
+    assert board.page(0, 0) == []
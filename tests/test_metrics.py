@@ -0,0 +1,30 @@
+"""Endpoint /metrics : l'adresse affichée (!stats) est celle réellement servie."""
+import asyncio
+import socket
+
+import aiohttp
+
+from utils.metrics import Metrics
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_url_is_the_bound_address():
+    async def scenario():
+        metrics = Metrics()
+        port = free_port()
+        await metrics.start(port=port)
+        try:
+            assert metrics.url == f"http://127.0.0.1:{port}/metrics"
+            metrics.inc("commands_total", command="stats")
+            async with aiohttp.ClientSession() as session, session.get(metrics.url) as response:
+                assert 'veillemanager_commands_total{command="stats"} 1' in await response.text()
+        finally:
+            await metrics.close()
+        assert metrics.url is None
+
+    asyncio.run(scenario())
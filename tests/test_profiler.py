@@ -0,0 +1,27 @@
+"""!profile : le rapport est calculé sans lire les histogrammes depuis un thread."""
+import asyncio
+
+from utils.metrics import Metrics
+from utils.profiler import ProfileSession
+
+
+def test_report_lists_events_and_commands_seen_during_the_session():
+    async def scenario():
+        metrics = Metrics()
+        metrics.observe("event_seconds", 0.002, event="on_message")
+        session = ProfileSession(metrics, interval=0.001)
+        session.start()
+        for _ in range(3):
+            metrics.observe("event_seconds", 0.004, event="on_message")
+        metrics.observe("command_seconds", 0.03, command="stats")  # Clé apparue pendant la session
+        await asyncio.sleep(0.02)
+        report_task = asyncio.ensure_future(session.stop())
+        # La boucle continue d'ajouter des clés pendant la mise en forme du rapport
+        for i in range(200):
+            metrics.observe("event_seconds", 0.001, event=f"on_event_{i}")
+            await asyncio.sleep(0)
+        return await report_task
+
+    report = asyncio.run(scenario())
+    assert "3 appels" in report and "on_message" in report
+    assert "1 appels" in report and "stats" in report
@@ -0,0 +1,36 @@
+"""Liens message -> article du recommandeur : écriture par lots, compaction au plancher."""
+import asyncio
+
+from utils.recommend import LINK_RECORD, Recommender, url_key
+
+
+def run_in_thread(func, *args):
+    return asyncio.to_thread(func, *args)
+
+
+def test_links_are_batched_and_compacted_when_the_floor_moves(tmp_path):
+    path = tmp_path / "links.bin"
+
+    async def scenario():
+        rec = Recommender(n_features=1 << 10)
+        rec.load(str(path), [])
+        for message_id in range(1, 11):
+            assert rec.link_message(message_id, [f"https://example.com/a/{message_id}"])
+            rec.add_read(7, message_id)
+        assert not path.exists()  # Rien d'écrit depuis la boucle
+        await rec.log.flush(run_in_thread)
+        assert path.stat().st_size == 10 * LINK_RECORD.size
+
+        rec.forget_before(4)  # 4 oubliés, 6 vivants : pas encore de compaction
+        assert min(rec._message_urls) == 5 and not rec.log.pending
+        rec.forget_before(6)  # 6 oubliés >= 4 vivants : fichier réécrit
+        assert list(rec._reads[7]) == [7, 8, 9, 10]
+        await rec.log.flush(run_in_thread)
+        assert path.stat().st_size == 4 * LINK_RECORD.size
+
+    asyncio.run(scenario())
+
+    restarted = Recommender(n_features=1 << 10)
+    restarted.load(str(path), [(9, 7)], floor=8)
+    assert restarted._message_urls == {9: url_key("https://example.com/a/9"), 10: url_key("https://example.com/a/10")}
+    assert restarted.log.pending  # Liens sous le plancher retirés du fichier au prochain flush
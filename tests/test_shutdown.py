@@ -0,0 +1,66 @@
+"""Arrêt par SIGTERM (`docker stop`) : l'XP en écriture différée doit être sur disque."""
+import json
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from conftest import ROOT
+
+CHILD = textwrap.dedent("""
+    import asyncio, sys
+    sys.path[:0] = [{root!r}, {benchmarks!r}]
+    from harness import Harness
+
+    harness = Harness(directory={directory!r})
+    bot = harness.bot
+    {setup}
+
+    async def start(token, reconnect=True):
+        # Remplace la connexion à Discord : même démarrage, puis attente de close()
+        await harness.start()
+        await bot.xp_store.award(1234, 42, 10)
+        bot.xp_log.record(42, 1234, 10)
+        print("ready", flush=True)
+        while not bot.is_closed():
+            await asyncio.sleep(0.05)
+
+    bot.start = start
+    asyncio.run(harness.botmod.run("token"))
+    print("closed", flush=True)
+""")
+
+
+# Étapes d'arrêt en échec (avant et après le flush de l'XP) : l'XP doit être écrite quand même
+FAILING_STEPS = """
+async def dead_connection():
+    raise ConnectionResetError("connexion perdue")
+bot.tasks.close = bot.audit_log.close = dead_connection
+"""
+
+
+@pytest.mark.parametrize("setup", ["", FAILING_STEPS], ids=["clean", "failing-steps"])
+def test_sigterm_flushes_pending_xp(tmp_path, setup):
+    code = CHILD.format(root=ROOT, benchmarks=os.path.join(ROOT, "benchmarks"), directory=str(tmp_path),
+                        setup=setup)
+    child = subprocess.Popen([sys.executable, "-c", code], cwd=tmp_path, stdout=subprocess.PIPE, text=True)
+    try:
+        for line in child.stdout:
+            if line.strip() == "ready":
+                break
+        # Rien n'est encore écrit : flush toutes les XP_FLUSH_INTERVAL secondes
+        assert not (tmp_path / "xp.json").exists()
+        child.send_signal(signal.SIGTERM)
+        out, _ = child.communicate(timeout=30)
+    finally:
+        if child.poll() is None:
+            child.kill()
+    assert child.returncode == 0
+    assert out.split()[-1] == "closed"
+    assert json.loads((tmp_path / "xp.json").read_text()) == {"42": 10}
+    assert (tmp_path / "awards.bin").stat().st_size == 16
+    segments = [p for p in (tmp_path / "xp_log").iterdir() if p.name.startswith("seg-")]
+    assert sum(p.stat().st_size for p in segments) == 22
@@ -0,0 +1,63 @@
+"""Backend SQLite : migration unique des fichiers JSON, écritures transactionnelles."""
+import asyncio
+import json
+
+import pytest
+
+from utils.storage import SQLiteBackend, open_storage
+
+WARN_A = {"reason": "spam", "date": "01/10/2026", "mod": "Modo"}
+WARN_B = {"reason": "insultes", "date": "02/10/2026", "mod": "Modo"}
+
+
+def write_fixtures(tmp_path, xp):
+    (tmp_path / "xp.json").write_text(json.dumps(xp))
+    (tmp_path / "warns.json").write_text(json.dumps({"1": [WARN_A]}))  # Ancien format
+    # Warn ajouté en mode JSON après le dernier snapshot : seulement dans le journal
+    (tmp_path / "warns.journal").write_text(json.dumps({"op": "add", "user": "2", "warn": WARN_B, "seq": 1}) + "\n")
+
+
+def open_db(tmp_path):
+    return open_storage("sqlite", str(tmp_path / "bot.db"), str(tmp_path / "xp.json"), str(tmp_path / "warns.json"),
+                        str(tmp_path / "awards.bin"), warns_journal=str(tmp_path / "warns.journal"))
+
+
+def test_json_files_are_migrated_once_and_survive_reopening(tmp_path):
+    write_fixtures(tmp_path, {"1": 120, "2": 30})
+    db = open_db(tmp_path)
+    assert isinstance(db, SQLiteBackend)
+    assert db.load_xp() == {"1": 120, "2": 30}
+    assert db.get_warns("1") == [WARN_A] and db.get_warns("2") == [WARN_B]
+
+    async def writes():
+        await db.run(db.save_xp, {"1": 130}, [(1000, 1)])
+        assert await db.run(db.award_xp, 1001, 2, 10) == (30, 40)
+        assert await db.run(db.award_xp, 1001, 2, 10) is None  # Déjà validé
+        assert await db.run(db.add_warn, "1", WARN_B) == 2
+        assert await db.run(db.remove_warn, "1", 0)
+
+    asyncio.run(writes())
+    db.close()
+
+    (tmp_path / "xp.json").write_text(json.dumps({"1": 999}))  # Les fichiers JSON ne sont plus relus
+    db = open_db(tmp_path)
+    try:
+        assert db.load_xp() == {"1": 130, "2": 40}
+        assert db.load_awards() == [(1000, 1), (1001, 2)]
+        assert db.get_warns("1") == [WARN_B] and db.get_warns("2") == [WARN_B]
+    finally:
+        db.close()
+
+
+def test_failed_migration_imports_nothing_and_is_retried(tmp_path):
+    write_fixtures(tmp_path, {"1": 120, "2": "corrompu"})
+    with pytest.raises(ValueError):
+        open_db(tmp_path)
+
+    write_fixtures(tmp_path, {"1": 120, "2": 30})
+    db = open_db(tmp_path)
+    try:
+        assert db.load_xp() == {"1": 120, "2": 30}
+        assert db.get_warns("1") == [WARN_A]
+    finally:
+        db.close()
@@ -0,0 +1,63 @@
+"""StackExchangeClient contre un serveur aiohttp local : fusion, cache, backoff, erreurs."""
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from utils.stackexchange import StackExchangeClient, StackExchangeError
+
+
+async def serve(responses):
+    """API factice : une réponse par requête reçue ; retourne (client, requêtes reçues, runner)."""
+    received = []
+
+    async def search(request):
+        received.append((time.monotonic(), request.query["q"]))
+        await asyncio.sleep(0.05)  # Laisse aux requêtes identiques le temps d'arriver
+        return web.json_response(responses[min(len(received), len(responses)) - 1])
+
+    app = web.Application()
+    app.router.add_get("/2.3/search/advanced", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    client = StackExchangeClient(base_url=f"http://127.0.0.1:{port}/2.3", timeout=5)
+    return client, received, runner
+
+
+def test_identical_queries_share_one_request_then_hit_the_cache():
+    async def scenario():
+        client, received, runner = await serve([{"items": [{"title": "asyncio"}], "quota_remaining": 299}])
+        try:
+            results = await asyncio.gather(*(client.search(q) for q in ("Python  Asyncio", "python asyncio", "PYTHON asyncio")))
+            assert results == [[{"title": "asyncio"}]] * 3
+            assert await client.search("python asyncio") == [{"title": "asyncio"}]
+        finally:
+            await client.close()
+            await runner.cleanup()
+        assert [q for _, q in received] == ["python asyncio"]
+        assert client.stats["misses"] == 1 and client.stats["coalesced"] == 2 and client.stats["hits"] == 1
+        assert client.quota_remaining == 299
+
+    asyncio.run(scenario())
+
+
+def test_backoff_delays_the_next_request_and_api_errors_raise():
+    async def scenario():
+        client, received, runner = await serve([
+            {"items": [], "backoff": 1, "quota_remaining": 10},
+            {"error_id": 502, "error_name": "throttle_violation", "error_message": "too many requests"},
+        ])
+        try:
+            await client.search("docker")
+            with pytest.raises(StackExchangeError, match="too many requests"):
+                await client.search("kubernetes")
+        finally:
+            await client.close()
+            await runner.cleanup()
+        (first, _), (second, _) = received
+        assert second - first >= 1  # `backoff` respecté avant la requête suivante
+
+    asyncio.run(scenario())
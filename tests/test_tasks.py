@@ -0,0 +1,25 @@
+"""Tâches de fond : référence gardée jusqu'à la fin, erreur loguée, annulation à l'arrêt."""
+import asyncio
+import logging
+
+from utils.tasks import BackgroundTasks
+
+
+def test_failures_are_logged_and_close_cancels_pending_tasks(caplog):
+    async def boom():
+        raise RuntimeError("boom")
+
+    async def scenario():
+        tasks = BackgroundTasks()
+        failed = tasks.spawn(boom(), name="boom")
+        slow = tasks.spawn(asyncio.sleep(3600))
+        assert len(tasks) == 2
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)  # Callbacks de fin exécutés au tour de boucle suivant
+        assert failed.done() and len(tasks) == 1
+        await tasks.close()
+        assert slow.cancelled() and len(tasks) == 0
+
+    with caplog.at_level(logging.ERROR, logger="utils.tasks"):
+        asyncio.run(scenario())
+    assert [record.exc_info[1].args for record in caplog.records] == [("boom",)]
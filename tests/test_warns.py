@@ -0,0 +1,83 @@
+"""Journal des warns (mode JSON) : rejeu, compaction, ancien format, arrêt brutal."""
+import asyncio
+import json
+
+from utils.storage import WarnJournal
+
+WARN = {"reason": "spam", "moderator": "7", "date": "2026-10-18"}
+
+
+def reopen(tmp_path, **options):
+    journal = WarnJournal(str(tmp_path / "warns.json"), str(tmp_path / "warns.journal"), **options)
+    journal.load()
+    return journal
+
+
+def test_operations_are_replayed_after_restart(tmp_path):
+    async def scenario():
+        journal = reopen(tmp_path)
+        assert await journal.add_warn("1", dict(WARN, reason="a")) == 1
+        assert await journal.add_warn("1", dict(WARN, reason="b")) == 2
+        assert await journal.add_warn("2", WARN) == 1
+        assert await journal.remove_warn("1", 0)
+        assert not await journal.remove_warn("1", 5)  # Sans effet : pas journalisé
+        assert await journal.clear_warns("2")
+        await journal.close()
+        return journal
+
+    before = asyncio.run(scenario())
+    after = reopen(tmp_path)
+    assert after.data == before.data == {"1": [dict(WARN, reason="b")]}
+    assert after.seq == before.seq == 5
+
+
+def test_legacy_snapshot_is_migrated_and_compaction_keeps_everything(tmp_path):
+    (tmp_path / "warns.json").write_text(json.dumps({"1": [WARN]}))  # Ancien format {user_id: [warns]}
+
+    async def scenario():
+        journal = reopen(tmp_path, compact_bytes=300)
+        for i in range(5):
+            await journal.add_warn("2", dict(WARN, reason=str(i)))
+        await journal.close()  # Attend la compaction lancée en tâche de fond
+        assert journal.stats["compactions"] >= 1
+        await journal.add_warn("3", WARN)  # Après la compaction : nouveau journal
+        return journal.data
+
+    data = asyncio.run(scenario())
+    snapshot = json.loads((tmp_path / "warns.json").read_text())
+    assert set(snapshot) == {"seq", "warns"} and "1" in snapshot["warns"]
+    assert reopen(tmp_path).data == data
+    assert [w["reason"] for w in data["2"]] == ["0", "1", "2", "3", "4"]
+
+
+def test_interrupted_compaction_is_finished_on_load(tmp_path):
+    async def scenario():
+        journal = reopen(tmp_path)
+        await journal.add_warn("1", WARN)
+        await journal.add_warn("1", WARN)
+
+    asyncio.run(scenario())
+    # Arrêt entre la mise de côté du journal et l'écriture du snapshot
+    (tmp_path / "warns.journal").rename(tmp_path / "warns.journal.old")
+    journal = reopen(tmp_path)
+    assert journal.data == {"1": [WARN, WARN]}
+    assert not (tmp_path / "warns.journal.old").exists()
+    assert json.loads((tmp_path / "warns.json").read_text())["seq"] == 2
+
+
+def test_truncated_last_line_is_ignored_and_later_warns_survive(tmp_path):
+    async def first_run():
+        journal = reopen(tmp_path)
+        await journal.add_warn("1", WARN)
+
+    asyncio.run(first_run())
+    with open(tmp_path / "warns.journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "user": "1", "warn": {"rea')  # Arrêt brutal en pleine écriture
+
+    async def second_run():
+        journal = reopen(tmp_path)
+        assert journal.data == {"1": [WARN]}
+        await journal.add_warn("2", WARN)
+
+    asyncio.run(second_run())
+    assert reopen(tmp_path).data == {"1": [WARN], "2": [WARN]}
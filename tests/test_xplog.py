@@ -0,0 +1,41 @@
+"""Journal des gains d'XP : écriture par lots, segments scellés, redémarrage."""
+import asyncio
+import time
+
+from utils.xplog import EVENT, XPEventLog, month_of
+
+
+def run_in_thread(func, *args):
+    return asyncio.to_thread(func, *args)
+
+
+def test_records_reach_disk_only_at_flush_and_replay_after_restart(tmp_path):
+    now = int(time.time())
+
+    async def scenario():
+        log = XPEventLog(str(tmp_path), segment_bytes=EVENT.size * 10)
+        log.load(now=now)
+        for i in range(25):
+            log.record(user_id=i % 3, article_id=i, amount=5, now=now + i)
+        assert not any(tmp_path.glob("seg-*"))  # Rien d'écrit depuis la boucle
+        await log.flush(run_in_thread)
+        assert log.stats["rollovers"] == 2
+        assert sorted(p.name for p in tmp_path.glob("seg-*")) == ["seg-000000.bin.gz", "seg-000001.bin.gz", "seg-000002.bin"]
+        # Arrêt brutal : pas de close(), le snapshot date du dernier segment scellé
+        return log.top("week", now=now)
+
+    before = asyncio.run(scenario())
+    restarted = XPEventLog(str(tmp_path), segment_bytes=EVENT.size * 10)
+    restarted.load(now=now)
+    assert restarted.top("week", now=now) == before
+    assert restarted.stats["replayed"] == 5
+
+
+def test_old_months_are_pruned(tmp_path):
+    now = 1_700_000_000
+    log = XPEventLog(str(tmp_path), keep_months=2)
+    log.load(now=now)
+    log.record(1, 1, 10, now=now - 100 * 86400)
+    log.record(1, 2, 10, now=now)
+    log._prune(now)
+    assert list(log.months) == [month_of(now)]
@@ -0,0 +1 @@
+"""Briques internes du bot (sans dépendance à Discord)."""
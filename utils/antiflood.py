@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict, namedtuple
+
+# Verdict : motif ("rate" ou "duplicates") + messages à supprimer [(channel_id, message_id)]
+Flood = namedtuple("Flood", "reason messages count")
+
+
+class _Window:
+    """Derniers messages d'un membre, dans des tampons circulaires de taille fixe."""
+
+    __slots__ = ("times", "channels", "ids", "hashes", "pos", "last")
+
+    def __init__(self, size):
+        self.times = [0.0] * size
+        self.channels = [0] * size
+        self.ids = [0] * size
+        self.hashes = [0] * size
+        self.pos = 0
+        self.last = 0.0
+
+
+class FloodDetector:
+    """Détecteur de flood en temps constant par message.
+
+    - débit : plus de `max_messages` messages en `window` secondes ;
+    - répétition : `max_duplicates` messages identiques en `duplicate_window` secondes.
+
+    Chaque membre a un tampon de `ring` messages (mémoire bornée) ; les
+    membres silencieux depuis `idle_after` secondes sont oubliés.
+    """
+
+    def __init__(self, max_messages=6, window=5.0, max_duplicates=3, duplicate_window=30.0,
+                 ring=8, idle_after=300.0):
+        self.max_messages = max_messages
+        self.window = window
+        self.max_duplicates = max_duplicates
+        self.duplicate_window = duplicate_window
+        self.ring = max(ring, max_messages + 1, max_duplicates)
+        self.idle_after = idle_after
+        self.stats = {"checked": 0, "floods": 0, "evicted": 0}
+        self._users = OrderedDict()  # user_id -> _Window, du moins au plus récemment actif
+
+    def __len__(self):
+        return len(self._users)
+
+    def check(self, user_id, channel_id, message_id, content, now=None):
+        """Enregistre le message ; retourne un Flood si un seuil est franchi, sinon None."""
+        if now is None:
+            now = time.monotonic()
+        self.stats["checked"] += 1
+        users = self._users
+        w = users.get(user_id)
+        if w is None:
+            w = users[user_id] = _Window(self.ring)
+        else:
+            users.move_to_end(user_id)
+        w.last = now
+
+        # Oubli des membres inactifs (les plus anciens sont en tête)
+        while True:
+            oldest_id = next(iter(users))
+            if now - users[oldest_id].last <= self.idle_after:
+                break
+            del users[oldest_id]
+            self.stats["evicted"] += 1
+
+        size = self.ring
+        pos = w.pos
+        h = hash(content) if content else 0
+        w.times[pos], w.channels[pos], w.ids[pos], w.hashes[pos] = now, channel_id, message_id, h
+        w.pos = (pos + 1) % size
+
+        # Débit : le message d'il y a `max_messages` rangs est-il dans la fenêtre ?
+        before = w.times[(pos - self.max_messages) % size]
+        if before and now - before <= self.window:
+            return self._flood(user_id, w, "rate", lambda t, _: now - t <= self.window)
+
+        # Répétition : copies du même contenu dans le tampon (taille fixe)
+        if h:
+            copies = 0
+            for t, other in zip(w.times, w.hashes):
+                if other == h and t and now - t <= self.duplicate_window:
+                    copies += 1
+            if copies >= self.max_duplicates:
+                return self._flood(
+                    user_id, w, "duplicates", lambda t, other: other == h and now - t <= self.duplicate_window
+                )
+        return None
+
+    def _flood(self, user_id, w, reason, keep):
+        messages = [
+            (c, m) for t, c, m, other in zip(w.times, w.channels, w.ids, w.hashes) if t and keep(t, other)
+        ]
+        # Compteurs remis à zéro : la sanction couvre déjà cette rafale
+        del self._users[user_id]
+        self.stats["floods"] += 1
+        return Flood(reason, messages, len(messages))
@@ -0,0 +1,108 @@
+import asyncio
+from collections import OrderedDict
+
+# Limites Discord
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_CHARS_PER_MESSAGE = 6000
+MAX_FIELD_VALUE = 1024
+
+
+def clip(text, limit=MAX_FIELD_VALUE):
+    """Tronque un texte pour tenir dans un champ d'embed."""
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class AuditLog:
+    """File d'attente des logs de modération, envoyés par paquets.
+
+    Les handlers appellent `push()` (jamais bloquant) ; un worker regroupe
+    les embeds arrivés pendant `window` secondes et les envoie par messages
+    de 10 embeds / 6000 caractères maximum. Au-delà de `collapse_after`
+    entrées d'un même groupe (ex : suppressions en masse dans un salon),
+    elles sont remplacées par un seul embed de synthèse.
+
+    - `send(channel_id, embeds)` : coroutine d'envoi ;
+    - `summarize(group, infos)` : construit l'embed de synthèse d'un groupe.
+    """
+
+    def __init__(self, send, summarize=None, window=2.0, collapse_after=5):
+        self.send = send
+        self.summarize = summarize
+        self.window = window
+        self.collapse_after = collapse_after
+        self.stats = {"events": 0, "messages": 0, "collapsed": 0}
+        self._queue = None
+        self._task = None
+
+    def push(self, channel_id, embed, group=None, info=None):
+        """Ajoute un embed à envoyer dans `channel_id` (retour immédiat)."""
+        if self._queue is None:
+            return
+        self.stats["events"] += 1
+        self._queue.put_nowait((channel_id, embed, group, info))
+
+    def start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Envoie ce qui reste en file puis arrête le worker."""
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            if batch[0] is not None:
+                # Fenêtre de regroupement : on laisse la rafale arriver
+                await asyncio.sleep(self.window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stop = None in batch
+            await self._deliver([item for item in batch if item is not None])
+            if stop:
+                return
+
+    def _collapse(self, items):
+        """Remplace les gros groupes par leur synthèse, en gardant l'ordre d'arrivée."""
+        groups = OrderedDict()
+        for channel_id, embed, group, info in items:
+            key = (channel_id, group) if group is not None else object()
+            groups.setdefault(key, []).append((channel_id, embed, group, info))
+        result = []
+        for entries in groups.values():
+            channel_id, _, group, _ = entries[0]
+            if group is not None and self.summarize and len(entries) > self.collapse_after:
+                self.stats["collapsed"] += len(entries)
+                result.append((channel_id, self.summarize(group, [e[3] for e in entries])))
+            else:
+                result.extend((e[0], e[1]) for e in entries)
+        return result
+
+    async def _deliver(self, items):
+        by_channel = OrderedDict()
+        for channel_id, embed in self._collapse(items):
+            by_channel.setdefault(channel_id, []).append(embed)
+        for channel_id, embeds in by_channel.items():
+            packet, chars = [], 0
+            for embed in embeds:
+                size = len(embed)
+                if packet and (len(packet) == MAX_EMBEDS_PER_MESSAGE or chars + size > MAX_CHARS_PER_MESSAGE):
+                    await self._send(channel_id, packet)
+                    packet, chars = [], 0
+                packet.append(embed)
+                chars += size
+            if packet:
+                await self._send(channel_id, packet)
+
+    async def _send(self, channel_id, embeds):
+        try:
+            await self.send(channel_id, embeds)
+            self.stats["messages"] += 1
+        except Exception as e:
+            print(f"⚠️ Envoi des logs impossible ({channel_id}) : {e}")
@@ -0,0 +1,122 @@
+import heapq
+from array import array
+
+
+class AwardIndex:
+    """Paires (article, membre) ayant déjà rapporté de l'XP.
+
+    Chaque membre reçoit un indice dense ; chaque article garde l'ensemble
+    de ses lecteurs sous la forme la plus compacte :
+    - peu de lecteurs : `array("I")` d'indices (4 octets par lecteur) ;
+    - beaucoup de lecteurs : bitset `bytearray` (1 bit par membre).
+    Le test d'appartenance est en temps constant (borné par `sparse_max`).
+
+    Seuls les `max_articles` articles les plus récents sont gardés : les
+    réactions sur un article plus ancien (id <= `floor`) ne rapportent plus rien.
+    """
+
+    def __init__(self, max_articles=50_000, sparse_max=64, on_floor=None):
+        self.max_articles = max_articles
+        self.sparse_max = sparse_max
+        self.on_floor = on_floor  # Appelé avec le nouveau plancher (index qui en dépendent)
+        self.floor = 0
+        self._users = {}      # user_id -> indice dense
+        self._articles = {}   # message_id -> array("I") | bytearray
+        self._heap = []       # message_ids (éviction du plus ancien)
+        self.pairs = 0
+
+    def __len__(self):
+        return self.pairs
+
+    @property
+    def articles(self):
+        return len(self._articles)
+
+    def _index(self, user_id):
+        idx = self._users.get(user_id)
+        if idx is None:
+            idx = self._users[user_id] = len(self._users)
+        return idx
+
+    @staticmethod
+    def _has(readers, idx):
+        if isinstance(readers, bytearray):
+            byte = idx >> 3
+            return byte < len(readers) and bool(readers[byte] & (1 << (idx & 7)))
+        return idx in readers
+
+    def contains(self, message_id, user_id):
+        readers = self._articles.get(message_id)
+        idx = self._users.get(user_id)
+        return readers is not None and idx is not None and self._has(readers, idx)
+
+    def add(self, message_id, user_id):
+        """Enregistre la paire ; False si déjà présente ou article trop ancien."""
+        if message_id <= self.floor:
+            return False
+        idx = self._index(user_id)
+        readers = self._articles.get(message_id)
+        if readers is None:
+            readers = self._articles[message_id] = array("I")
+            heapq.heappush(self._heap, message_id)
+            self._evict()
+        elif self._has(readers, idx):
+            return False
+
+        if isinstance(readers, bytearray):
+            byte = idx >> 3
+            if byte >= len(readers):
+                readers.extend(bytes(byte + 1 - len(readers)))
+            readers[byte] |= 1 << (idx & 7)
+        else:
+            readers.append(idx)
+            if len(readers) > self.sparse_max:
+                self._articles[message_id] = self._to_bitset(readers)
+        self.pairs += 1
+        return True
+
+    def discard(self, message_id, user_id):
+        """Retire la paire (gain qui n'a pas pu être écrit) ; False si absente."""
+        readers = self._articles.get(message_id)
+        idx = self._users.get(user_id)
+        if readers is None or idx is None or not self._has(readers, idx):
+            return False
+        if isinstance(readers, bytearray):
+            readers[idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
+        else:
+            readers.remove(idx)
+        self.pairs -= 1
+        return True
+
+    def _to_bitset(self, readers):
+        bits = bytearray((len(self._users) + 7) >> 3)
+        for idx in readers:
+            bits[idx >> 3] |= 1 << (idx & 7)
+        return bits
+
+    def _count(self, readers):
+        if isinstance(readers, bytearray):
+            return sum(bin(b).count("1") for b in readers)
+        return len(readers)
+
+    def _evict(self):
+        floor = self.floor
+        while len(self._articles) > self.max_articles:
+            oldest = heapq.heappop(self._heap)
+            self.pairs -= self._count(self._articles.pop(oldest))
+            self.floor = max(self.floor, oldest)
+        if self.floor != floor and self.on_floor:
+            self.on_floor(self.floor)
+
+    def load(self, pairs):
+        """Recharge des paires (message_id, user_id) persistées."""
+        for message_id, user_id in pairs:
+            self.add(message_id, user_id)
+        return self.pairs
+
+    def nbytes(self):
+        """Mémoire approximative occupée par les ensembles de lecteurs."""
+        total = 0
+        for readers in self._articles.values():
+            total += len(readers) if isinstance(readers, bytearray) else readers.itemsize * len(readers)
+        return total
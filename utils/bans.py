@@ -0,0 +1,77 @@
+import re
+
+_MENTION_RE = re.compile(r"^<@!?(\d+)>$")
+_LEGACY_TAG_RE = re.compile(r"^(.+)#(\d{4})$")
+
+
+class BanCache:
+    """Bannis de chaque serveur, indexés par id et par nom d'utilisateur.
+
+    Chargé une fois par serveur (premier `!unban`), puis tenu à jour par
+    `on_member_ban` / `on_member_unban` : plus de parcours de toute la
+    liste des bans à chaque commande. Tant qu'un serveur n'est pas chargé,
+    ses événements sont ignorés (le chargement lira l'état à jour).
+    """
+
+    def __init__(self):
+        self._guilds = {}  # guild_id -> {user_id: (name, discriminator)}
+        self._names = {}   # guild_id -> {nom en minuscules: {user_ids}}
+        self.stats = {"loads": 0, "hits": 0, "misses": 0}
+
+    def __len__(self):
+        return sum(len(bans) for bans in self._guilds.values())
+
+    def loaded(self, guild_id):
+        return guild_id in self._guilds
+
+    async def load(self, guild):
+        """Lit toute la liste des bans du serveur (une requête par tranche de 1000)."""
+        bans, names = {}, {}
+        async for entry in guild.bans(limit=None):
+            user = entry.user
+            bans[user.id] = (user.name, user.discriminator)
+            names.setdefault(user.name.lower(), set()).add(user.id)
+        self._guilds[guild.id], self._names[guild.id] = bans, names
+        self.stats["loads"] += 1
+        return len(bans)
+
+    def add(self, guild_id, user):
+        bans = self._guilds.get(guild_id)
+        if bans is None:
+            return
+        self.remove(guild_id, user.id)
+        bans[user.id] = (user.name, user.discriminator)
+        self._names[guild_id].setdefault(user.name.lower(), set()).add(user.id)
+
+    def remove(self, guild_id, user_id):
+        bans = self._guilds.get(guild_id)
+        if bans is None or user_id not in bans:
+            return None
+        name, discriminator = bans.pop(user_id)
+        ids = self._names[guild_id].get(name.lower())
+        if ids is not None:
+            ids.discard(user_id)
+            if not ids:
+                del self._names[guild_id][name.lower()]
+        return name, discriminator
+
+    def find(self, guild_id, text):
+        """Ids bannis correspondant à un id, une mention, `nom` ou l'ancien `nom#1234`."""
+        bans = self._guilds.get(guild_id, {})
+        text = text.strip()
+        mention = _MENTION_RE.match(text)
+        if mention or text.isdigit():
+            user_id = int(mention.group(1) if mention else text)
+            found = [user_id] if user_id in bans else []
+        else:
+            legacy = _LEGACY_TAG_RE.match(text)
+            name = (legacy.group(1) if legacy else text).lstrip("@").lower()
+            found = sorted(self._names.get(guild_id, {}).get(name, ()))
+            if legacy:
+                found = [uid for uid in found if bans[uid][1] == legacy.group(2)]
+        self.stats["hits" if found else "misses"] += 1
+        return found
+
+    def name(self, guild_id, user_id):
+        name, discriminator = self._guilds[guild_id][user_id]
+        return name if discriminator in ("0", "0000") else f"{name}#{discriminator}"
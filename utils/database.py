@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DatabasePool:
+    """Pool de connexions DB-API utilisé depuis asyncio.
+
+    Les requêtes tournent dans un pool de threads borné (`size` workers,
+    donc au plus `size` connexions ouvertes) : la boucle d'événements du
+    bot n'attend plus jamais MySQL. Les connexions inactives depuis plus de
+    `health_check_after` secondes sont vérifiées avant usage, et une
+    requête interrompue par une coupure est rejouée une fois sur une
+    connexion neuve.
+
+    `connect` est une fabrique sans argument (MySQL en prod, sqlite3 en local).
+    """
+
+    def __init__(self, connect, size=5, health_check_after=30, retry_on=(), name="db"):
+        self._connect = connect
+        self.size = size
+        self.health_check_after = health_check_after
+        self.retry_on = tuple(retry_on)
+        self.name = name
+        self._idle = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=name)
+        self._stats_lock = threading.Lock()
+        self.stats = {"created": 0, "in_use": 0, "reconnects": 0, "queries": 0, "errors": 0}
+
+    def _count(self, key, delta=1):
+        with self._stats_lock:
+            self.stats[key] += delta
+
+    # --- Gestion des connexions (threads du pool) ---
+
+    def _new_connection(self):
+        conn = self._connect()
+        self._count("created")
+        return conn
+
+    def _is_alive(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self):
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+        if time.monotonic() - last_used > self.health_check_after and not self._is_alive(conn):
+            self._discard(conn)
+            self._count("reconnects")
+            return self._new_connection()
+        return conn
+
+    def _release(self, conn):
+        self._idle.put((conn, time.monotonic()))
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _call(self, func, *args):
+        self._count("in_use")
+        try:
+            for attempt in range(2):
+                conn = self._acquire()
+                try:
+                    result = func(conn, *args)
+                except self.retry_on:
+                    # Connexion morte (timeout serveur, redémarrage MySQL...)
+                    self._discard(conn)
+                    self._count("reconnects")
+                    if attempt:
+                        raise
+                    continue
+                except BaseException:
+                    self._discard(conn)
+                    raise
+                self._release(conn)
+                return result
+        except BaseException:
+            self._count("errors")
+            raise
+        finally:
+            self._count("in_use", -1)
+            self._count("queries")
+
+    # --- API asynchrone ---
+
+    async def run(self, func, *args):
+        """Exécute func(conn, *args) dans un thread du pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._call, func, *args))
+
+    async def fetchall(self, sql, params=()):
+        """Raccourci : exécute une requête et retourne toutes les lignes."""
+        return await self.run(_fetchall, sql, params)
+
+    @property
+    def idle(self):
+        return self._idle.qsize()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+def _fetchall(conn, sql, params):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
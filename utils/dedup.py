@@ -0,0 +1,273 @@
+import re
+import struct
+import time
+from datetime import date, datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from utils.search import tokenize
+from utils.storage import RecordLog
+
+_URL_RE = re.compile(r"https?://[^\s<>()\[\]]+")
+# Suffixe « - Nom du site » ajouté par les flux RSS (le SimHash d'un titre court y est sensible)
+_SITE_SUFFIX_RE = re.compile(r"\s+[-|–—·]\s+[^-|–—·]{1,40}$")
+
+# Paramètres de suivi retirés avant comparaison (préfixes en fin de nom : utm_*)
+TRACKING_PARAMS = frozenset("""
+    fbclid gclid dclid msclkid mc_cid mc_eid igshid yclid _hsenc _hsmi ref ref_src ref_url
+    source src via share feature cmpid xtor ncid sr_share at_medium at_campaign guccounter
+""".split())
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "mtm_")
+
+# Sous-domaines qui servent le même article (mobile, AMP...)
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+BANDS = 4        # SimHash 64 bits découpé en 4 bandes de 16 bits...
+MAX_DISTANCE = 3 # ...donc deux titres à ≤ 3 bits d'écart partagent au moins une bande
+MIN_TITLE_TOKENS = 4  # Titres trop courts : trop de faux positifs
+MASK = (1 << 64) - 1
+
+PENDING = 0  # Article en base mais pas encore vu dans le salon
+
+# Message signalé comme doublon (persisté : pas d'XP dessus après un redémarrage)
+DUPLICATE_RECORD = struct.Struct("<Q")
+
+
+def extract_urls(text):
+    return [url.rstrip(".,;:!?'\">*_") for url in _URL_RE.findall(text or "")]
+
+
+def normalize_url(url):
+    """Forme canonique d'un lien : hôte sans www/m/amp, sans suivi ni ancre."""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path
+    if "//" in path:
+        path = re.sub(r"/{2,}", "/", path)
+    path = path.rstrip("/")
+    if path.endswith("/amp"):
+        path = path[:-4]
+    path = path or "/"
+    if path.endswith(("/index.html", "/index.php")):
+        path = path.rsplit("/", 1)[0] or "/"
+    query = ""
+    if parts.query:
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+        ))
+    # http/https et port par défaut confondus
+    return f"{host}{path}?{query}" if query else host + path
+
+
+def older_than(value, seconds, now=None):
+    """True si la date d'un article (DATE / DATETIME MySQL, ou texte ISO) a plus de `seconds`."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip()[:19])
+        except ValueError:
+            return False
+    if isinstance(value, datetime):
+        stamp = value.timestamp()
+    elif isinstance(value, date):
+        stamp = datetime.combine(value, datetime.min.time()).timestamp()
+    else:
+        return False
+    return (time.time() if now is None else now) - stamp > seconds
+
+
+def title_tokens(title):
+    return tokenize(_SITE_SUFFIX_RE.sub("", title or ""))
+
+
+def simhash(tokens):
+    """SimHash 64 bits des termes, ou None si le titre est trop court.
+
+    Les compteurs par bit sont tenus « en tranches » : le plan k contient le
+    bit k du compteur de chacune des 64 positions. Ajouter un terme est une
+    addition avec retenue sur quelques entiers, et le vote majoritaire une
+    comparaison en tranches : quelques opérations par terme au lieu de 64.
+    """
+    terms = set(tokens)
+    if len(terms) < MIN_TITLE_TOKENS:
+        return None
+    planes = []
+    for term in terms:
+        carry = hash(term) & MASK
+        for k, plane in enumerate(planes):
+            planes[k], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    # Bit à 1 là où le compteur dépasse la moitié des termes
+    half = len(terms) // 2
+    greater, equal = 0, MASK
+    for k in range(len(planes) - 1, -1, -1):
+        plane = planes[k]
+        if (half >> k) & 1:
+            equal &= plane
+        else:
+            greater |= equal & plane
+            equal &= ~plane
+    return greater
+
+
+class DedupIndex:
+    """Articles déjà publiés : liens normalisés et SimHash des titres.
+
+    Recherches en temps constant, sans requête SQL : un dict par lien
+    (hash de la forme canonique) et, pour les titres, un dict par bande de
+    SimHash. Chaque entrée pointe vers l'original : id du message Discord
+    (> 0), id négatif d'un article déjà publié, ou PENDING pour un article
+    en base pas encore posté (le premier message qui le publie n'est pas un
+    doublon). Au démarrage, l'appelant dit quels articles sont déjà publiés
+    (message connu, ou date ancienne) : un article inséré juste avant un
+    redémarrage reste PENDING et son message n'est pas pris pour un doublon.
+    Un original supprimé avant sa publication complète est relâché
+    (`release`) : il redevient PENDING.
+
+    Les messages signalés sont gardés dans `duplicates` (pas d'XP dessus) et
+    dans un petit journal ; ceux sous le plancher des validations
+    (`forget_before`) ne rapportent plus rien et sont oubliés.
+    """
+
+    def __init__(self):
+        self.urls = {}      # hash(lien normalisé) -> original
+        self.titles = {}    # simhash -> original
+        self._bands = {}    # bande << 16 | valeur 16 bits -> simhash, ou liste s'il y en a plusieurs
+        self.duplicates = set()  # Messages signalés (pas d'XP dessus)
+        self.log = RecordLog(None, DUPLICATE_RECORD)
+        self.floor = 0
+        self.last_id = 0
+        self.ready = False  # Premier chargement terminé : la suite arrive en PENDING
+        self.stats = {"url": 0, "title": 0, "unique": 0, "released": 0}
+
+    def __len__(self):
+        return len(self.urls) + len(self.titles)
+
+    @staticmethod
+    def _band_keys(sig):
+        return [band << 16 | (sig >> (16 * band)) & 0xFFFF for band in range(BANDS)]
+
+    def _near(self, sig):
+        bands = self._bands
+        for key in self._band_keys(sig):
+            bucket = bands.get(key)
+            if bucket is None:
+                continue
+            for other in bucket if isinstance(bucket, list) else (bucket,):
+                if bin(sig ^ other).count("1") <= MAX_DISTANCE:
+                    return other
+        return None
+
+    def _index_title(self, sig, ref):
+        if sig in self.titles:
+            return
+        self.titles[sig] = ref
+        # Le plus souvent un seul titre par bande : gardé tel quel, sans liste (mémoire)
+        bands = self._bands
+        for key in self._band_keys(sig):
+            bucket = bands.get(key)
+            if bucket is None:
+                bands[key] = sig
+            elif isinstance(bucket, list):
+                bucket.append(sig)
+            else:
+                bands[key] = [bucket, sig]
+
+    # --- Doublons signalés ---
+
+    def load(self, path, floor=0):
+        """Messages signalés lors des démarrages précédents (au-dessus du plancher)."""
+        self.log.path = path
+        self.floor = floor
+        records = self.log.read()
+        self.duplicates = {message_id for message_id, in records if message_id > floor}
+        if len(self.duplicates) < len(records):
+            self.log.rewrite((message_id,) for message_id in sorted(self.duplicates))
+        return len(self.duplicates)
+
+    def forget_before(self, floor):
+        """Plancher des validations relevé : les doublons en dessous ne coûtent plus rien."""
+        self.floor = floor
+        stale = {message_id for message_id in self.duplicates if message_id <= floor}
+        if stale:
+            self.duplicates -= stale
+            self.log.rewrite((message_id,) for message_id in sorted(self.duplicates))
+
+    # --- Articles & messages ---
+
+    def add_article(self, article_id, title, url, published=False):
+        """Article lu en base (chargement au démarrage puis après chaque nouvel article).
+
+        `published` : déjà posté dans le salon (pris en compte au premier
+        chargement seulement ; ensuite, tout nouvel article attend son message).
+        """
+        if article_id <= self.last_id:
+            return
+        self.last_id = article_id
+        ref = -article_id if published and not self.ready else PENDING
+        key = normalize_url(url or "")
+        if key:
+            self.urls.setdefault(hash(key), ref)
+        sig = simhash(title_tokens(title))
+        if sig is not None:
+            self._index_title(sig, ref)
+
+    def claim(self, message_id, urls, title):
+        """Enregistre un message du salon veille.
+
+        Retourne (motif, original) si l'article a déjà été publié, sinon None.
+        """
+        keys = [hash(key) for key in map(normalize_url, urls) if key]
+        sig = simhash(title_tokens(title))
+
+        for key in keys:
+            ref = self.urls.get(key)
+            if ref:
+                return self._duplicate(message_id, "url", ref)
+        near = self._near(sig) if sig is not None else None
+        if near is not None and self.titles[near]:
+            return self._duplicate(message_id, "title", self.titles[near])
+
+        # Nouveau (ou attendu en base) : ce message devient l'original
+        for key in keys:
+            self.urls[key] = message_id
+        if near is not None:
+            self.titles[near] = message_id
+        elif sig is not None:
+            self._index_title(sig, message_id)
+        self.stats["unique"] += 1
+        return None
+
+    def release(self, message_id, urls, title):
+        """L'original n'a pas pu être publié (supprimé avant sa ✅) : l'article redevient attendu."""
+        released = False
+        for key in (hash(key) for key in map(normalize_url, urls) if key):
+            if self.urls.get(key) == message_id:
+                self.urls[key] = PENDING
+                released = True
+        sig = simhash(title_tokens(title))
+        near = self._near(sig) if sig is not None else None
+        if near is not None and self.titles[near] == message_id:
+            self.titles[near] = PENDING
+            released = True
+        if released:
+            self.stats["released"] += 1
+        return released
+
+    def _duplicate(self, message_id, reason, ref):
+        if message_id > self.floor:
+            self.duplicates.add(message_id)
+            self.log.append(message_id)
+        self.stats[reason] += 1
+        return reason, ref
@@ -0,0 +1,73 @@
+import csv
+import gzip
+import io
+import tempfile
+
+# Au-delà, la partie reste en mémoire jusqu'à 1 Mo puis bascule sur un fichier temporaire
+SPOOL_MEMORY = 1024 * 1024
+
+
+class _GzipCsvPart:
+    """Une pièce jointe .csv.gz en cours d'écriture."""
+
+    def __init__(self, header):
+        self.raw = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY)
+        self._gzip = gzip.GzipFile(fileobj=self.raw, mode="wb")
+        self._text = io.TextIOWrapper(self._gzip, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(header)
+        self.rows = 0
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+        # Sync flush : la taille compressée sur disque devient exacte
+        self._text.flush()
+        self._gzip.flush()
+
+    @property
+    def size(self):
+        return self.raw.tell()
+
+    def finish(self):
+        self._text.flush()
+        self._text.detach()
+        self._gzip.close()
+        self.raw.seek(0)
+        return self.raw
+
+
+def stream_csv_parts(conn, sql, params, header, max_bytes, batch_size=1000):
+    """Exporte une requête en CSV gzip, découpé en parties de `max_bytes` maximum.
+
+    Les lignes sont lues par lots (`fetchmany`) sur un curseur non bufferisé :
+    la table n'est jamais chargée en entier. Chaque partie est un fichier
+    autonome (avec en-tête). Retourne une liste de (fichier, nb de lignes),
+    fichiers positionnés au début, à fermer par l'appelant.
+    """
+    parts = []
+    current = _GzipCsvPart(header)
+    last_batch_size = 0
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            # Le prochain lot ferait déborder la pièce jointe : on en commence une autre
+            if current.rows and current.size + last_batch_size > max_bytes:
+                parts.append((current.finish(), current.rows))
+                current = _GzipCsvPart(header)
+            before = current.size
+            current.write(rows)
+            last_batch_size = current.size - before
+    except BaseException:
+        for f, _ in parts:
+            f.close()
+        current.finish().close()
+        raise
+    finally:
+        cursor.close()
+    parts.append((current.finish(), current.rows))
+    return parts
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import deque
+
+from utils.tasks import BackgroundTasks
+
+
+class JoinPipeline:
+    """File des arrivées sur le serveur.
+
+    - rôle attribué par un worker unique, à rythme fixe (`role_interval`),
+      avec `retries` nouvelles tentatives espacées exponentiellement ;
+    - bienvenues regroupées : un seul message pour toutes les arrivées
+      des `welcome_window` dernières secondes ;
+    - mode raid : au-delà de `raid_threshold` arrivées en `raid_window`
+      secondes, les bienvenues sont suspendues et une alerte est envoyée.
+      Il se termine après `raid_cooldown` secondes sans nouvelle arrivée.
+
+    Callbacks (coroutines) : `assign_role(member)`, `welcome(members)`,
+    `alert(join_count)`.
+    """
+
+    def __init__(self, assign_role, welcome, alert, role_interval=0.5, retries=3,
+                 welcome_window=10, raid_threshold=10, raid_window=60, raid_cooldown=300):
+        self.assign_role = assign_role
+        self.welcome = welcome
+        self.alert = alert
+        self.role_interval = role_interval
+        self.retries = retries
+        self.welcome_window = welcome_window
+        self.raid_threshold = raid_threshold
+        self.raid_window = raid_window
+        self.raid_cooldown = raid_cooldown
+        self.raid_until = 0.0
+        self.stats = {"joins": 0, "roles": 0, "role_failures": 0, "welcomes": 0, "raids": 0}
+        self._recent = deque()   # horodatages des arrivées récentes
+        self._pending = []       # membres en attente de bienvenue
+        self._queue = None
+        self._role_task = None
+        self._welcome_task = None
+        self._alerts = BackgroundTasks()
+
+    @property
+    def raid(self):
+        return time.monotonic() < self.raid_until
+
+    def push(self, member):
+        """Enregistre une arrivée (retour immédiat)."""
+        if self._queue is None:
+            return
+        self.stats["joins"] += 1
+        now = time.monotonic()
+        self._recent.append(now)
+        while self._recent and self._recent[0] < now - self.raid_window:
+            self._recent.popleft()
+
+        if self.raid:
+            self.raid_until = now + self.raid_cooldown
+        elif len(self._recent) >= self.raid_threshold:
+            self.raid_until = now + self.raid_cooldown
+            self.stats["raids"] += 1
+            self._pending.clear()
+            self._alerts.spawn(self.alert(len(self._recent)))
+
+        self._queue.put_nowait(member)
+        if not self.raid:
+            self._pending.append(member)
+            if self._welcome_task is None or self._welcome_task.done():
+                self._welcome_task = asyncio.create_task(self._welcome_later())
+
+    def start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._role_task is None or self._role_task.done():
+            self._role_task = asyncio.create_task(self._role_worker())
+
+    async def close(self):
+        """Arrête les workers et attend leur fin (avant la fermeture de la session HTTP)."""
+        workers = [task for task in (self._role_task, self._welcome_task) if task is not None and not task.done()]
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._role_task = self._welcome_task = None
+        await self._alerts.close()
+
+    # --- Workers ---
+
+    async def _role_worker(self):
+        while True:
+            member = await self._queue.get()
+            for attempt in range(self.retries + 1):
+                try:
+                    await self.assign_role(member)
+                    self.stats["roles"] += 1
+                    break
+                except Exception as e:
+                    if attempt == self.retries:
+                        self.stats["role_failures"] += 1
+                        print(f"⚠️ Rôle non attribué à {member} : {e}")
+                    else:
+                        await asyncio.sleep(self.role_interval * 2 ** (attempt + 1))
+            await asyncio.sleep(self.role_interval)
+
+    async def _welcome_later(self):
+        await asyncio.sleep(self.welcome_window)
+        members, self._pending = self._pending, []
+        if members and not self.raid:
+            try:
+                await self.welcome(members)
+                self.stats["welcomes"] += 1
+            except Exception as e:
+                print(f"⚠️ Bienvenue non envoyée : {e}")
@@ -0,0 +1,136 @@
+import bisect
+
+
+class Leaderboard:
+    """Classement trié maintenu à chaque gain d'XP.
+
+    Liste triée découpée en paquets de ~`load` entrées (à la manière de
+    sortedcontainers), plus un arbre de Fenwick sur la taille des paquets :
+    mise à jour, rang d'un joueur et accès à la k-ième place se font en
+    O(log n) sans jamais retrier tout le monde.
+
+    Ordre : XP décroissante, puis id croissant à égalité.
+    """
+
+    def __init__(self, load=512):
+        self.load = load
+        self._lists = []   # paquets triés de clés (-xp, user_id)
+        self._maxes = []   # dernière clé de chaque paquet
+        self._tree = []    # Fenwick sur len(self._lists[i])
+        self._scores = {}  # user_id -> xp
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    # --- Arbre de Fenwick ---
+
+    def _rebuild_tree(self):
+        tree = [len(lst) for lst in self._lists]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, i, delta):
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def _prefix(self, i):
+        """Nombre d'entrées dans les paquets [0, i)."""
+        total = 0
+        while i > 0:
+            total += self._tree[i - 1]
+            i &= i - 1
+        return total
+
+    def _locate(self, pos):
+        """Position globale -> (paquet, index dans le paquet)."""
+        tree = self._tree
+        i, step = 0, 1 << len(tree).bit_length()
+        while step:
+            nxt = i + step
+            if nxt <= len(tree) and tree[nxt - 1] <= pos:
+                pos -= tree[nxt - 1]
+                i = nxt
+            step >>= 1
+        return i, pos
+
+    # --- Mises à jour ---
+
+    def rebuild(self, items):
+        """Reconstruit tout le classement depuis des paires (user_id, xp)."""
+        self._scores = dict(items)
+        keys = sorted((-xp, uid) for uid, xp in self._scores.items())
+        self._lists = [keys[i:i + self.load] for i in range(0, len(keys), self.load)]
+        self._maxes = [lst[-1] for lst in self._lists]
+        self._rebuild_tree()
+
+    def _insert(self, key):
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        lst = self._lists[i]
+        bisect.insort(lst, key)
+        self._maxes[i] = lst[-1]
+        if len(lst) > 2 * self.load:
+            half = len(lst) // 2
+            self._lists[i:i + 1] = [lst[:half], lst[half:]]
+            self._maxes[i:i + 1] = [lst[half - 1], lst[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def _remove(self, key):
+        i = bisect.bisect_left(self._maxes, key)
+        lst = self._lists[i]
+        del lst[bisect.bisect_left(lst, key)]
+        if lst:
+            self._maxes[i] = lst[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._lists[i], self._maxes[i]
+            self._rebuild_tree()
+
+    def update(self, user_id, xp):
+        """Met à jour l'XP d'un joueur (ajout si nouveau)."""
+        old = self._scores.get(user_id)
+        if old == xp:
+            return
+        if old is not None:
+            self._remove((-old, user_id))
+        self._scores[user_id] = xp
+        self._insert((-xp, user_id))
+
+    # --- Lectures ---
+
+    def rank(self, user_id):
+        """Place du joueur (1 = premier), None s'il n'est pas classé."""
+        xp = self._scores.get(user_id)
+        if xp is None:
+            return None
+        key = (-xp, user_id)
+        i = bisect.bisect_left(self._maxes, key)
+        return self._prefix(i) + bisect.bisect_left(self._lists[i], key) + 1
+
+    def page(self, offset, limit):
+        """Tranche [offset, offset + limit) du classement : liste de (user_id, xp)."""
+        if offset >= len(self._scores) or limit <= 0:
+            return []
+        i, j = self._locate(offset)
+        result = []
+        while i < len(self._lists) and len(result) < limit:
+            for neg_xp, uid in self._lists[i][j:j + limit - len(result)]:
+                result.append((uid, -neg_xp))
+            i, j = i + 1, 0
+        return result
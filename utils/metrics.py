@@ -0,0 +1,167 @@
+import asyncio
+import bisect
+import time
+
+# Bornes (secondes) des histogrammes de latence
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogramme à seaux fixes (format Prometheus)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Dernier seau : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Borne haute du seau contenant le quantile q (approximation)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class Metrics:
+    """Compteurs, histogrammes et jauges du bot, exposés au format Prometheus.
+
+    Les jauges sont lues à la demande via des collecteurs enregistrés avec
+    `register_collector(func)` ; `func()` retourne des (nom, labels, valeur).
+    """
+
+    def __init__(self, prefix="veillemanager"):
+        self.prefix = prefix
+        self.started_at = time.time()
+        self.counters = {}    # (nom, labels) -> valeur
+        self.histograms = {}  # (nom, labels) -> Histogram
+        self._collectors = []
+        self._runner = None
+        self._lag_task = None
+        self.url = None  # Adresse réellement servie (None : serveur arrêté ou indisponible)
+
+    # --- Enregistrement ---
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _labels(labels))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels(labels))
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = Histogram()
+        hist.observe(value)
+
+    def register_collector(self, func):
+        self._collectors.append(func)
+        return func
+
+    # --- Lecture ---
+
+    def counter(self, name, **labels):
+        return self.counters.get((name, _labels(labels)), 0)
+
+    def histograms_named(self, name):
+        """[(labels dict, Histogram)] pour un nom donné."""
+        return [(dict(lbl), h) for (n, lbl), h in self.histograms.items() if n == name]
+
+    def gauges(self):
+        result = []
+        for collect in self._collectors:
+            try:
+                result.extend(collect())
+            except Exception as e:
+                print(f"⚠️ Collecteur de métriques en erreur : {e}")
+        return result
+
+    def render(self):
+        """Texte d'exposition Prometheus."""
+        p = self.prefix
+        lines = [f"# TYPE {p}_uptime_seconds gauge", f"{p}_uptime_seconds {time.time() - self.started_at:.0f}"]
+        typed = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {p}_{name} counter")
+                typed.add(name)
+            lines.append(f"{p}_{name}{_format_labels(labels)} {value}")
+        for (name, labels), hist in sorted(self.histograms.items(), key=lambda item: item[0]):
+            if name not in typed:
+                lines.append(f"# TYPE {p}_{name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, n in zip(hist.bounds + (float("inf"),), hist.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{p}_{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{p}_{name}_sum{_format_labels(labels)} {hist.sum:.6f}")
+            lines.append(f"{p}_{name}_count{_format_labels(labels)} {hist.count}")
+        for name, labels, value in self.gauges():
+            if name not in typed:
+                lines.append(f"# TYPE {p}_{name} gauge")
+                typed.add(name)
+            lines.append(f"{p}_{name}{_format_labels(_labels(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+    # --- Tâches de fond ---
+
+    async def _monitor_loop_lag(self, interval):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.observe("event_loop_lag_seconds", max(0.0, loop.time() - start - interval))
+
+    async def start(self, host="127.0.0.1", port=9108, lag_interval=0.5):
+        """Lance la mesure du retard de la boucle et le serveur HTTP /metrics (port 0 : désactivé)."""
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._monitor_loop_lag(lag_interval))
+        if port and self._runner is None:
+            from aiohttp import web
+
+            async def handle(_request):
+                return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+            app = web.Application()
+            app.router.add_get("/metrics", handle)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, host, port).start()
+            host, port = self._runner.addresses[0][:2]
+            self.url = f"http://{host}:{port}/metrics"
+
+    async def close(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.url = None
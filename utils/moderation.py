@@ -0,0 +1,64 @@
+import random
+import re
+from collections import OrderedDict
+
+_DURATION_RE = re.compile(r"^(\d+)\s*(s|m|min|h|j|d)?$", flags=re.IGNORECASE)
+DURATION_UNITS = {"s": 1, "m": 60, "min": 60, "h": 3600, "j": 86400, "d": 86400}
+
+# Suffixes tolérés après un mot interdit (pluriel, féminin...)
+SUFFIXES = r"(?:e|s|es|x)?"
+CARTOON_SYMBOLS = "@#$!&%*+?"
+
+
+def parse_duration(text, default_unit="m"):
+    """ "30s", "10m", "2h", "1j" -> secondes (None si illisible). Sans unité : minutes."""
+    match = _DURATION_RE.match(text.strip())
+    if not match:
+        return None
+    return int(match.group(1)) * DURATION_UNITS[(match.group(2) or default_unit).lower()]
+
+
+def build_pattern(words):
+    """Compile une seule regex (alternance) pour toute la liste de mots."""
+    # Les plus longs d'abord : "connard" doit gagner sur "con"
+    unique = sorted(set(w.lower() for w in words), key=len, reverse=True)
+    alternation = "|".join(re.escape(w) for w in unique)
+    return re.compile(fr"\b(?:{alternation}){SUFFIXES}\b", flags=re.IGNORECASE)
+
+
+class Censor:
+    """Moteur de censure construit une fois au démarrage.
+
+    Un seul passage regex par message : `check(message)` garde le verdict
+    par id de message, partagé par `bot.on_message` (commandes ignorées),
+    la modération (remplacement) et la veille (pas d'auto-réaction), qui
+    reçoivent chacun le même message.
+    """
+
+    def __init__(self, words, symbols=CARTOON_SYMBOLS, remember=256):
+        self.symbols = symbols
+        self.pattern = build_pattern(words)
+        self.remember = remember
+        self._verdicts = OrderedDict()  # message_id -> contient un mot interdit
+
+    def _cartoon(self, match):
+        return "".join(random.choice(self.symbols) for _ in range(len(match.group())))
+
+    def contains(self, text):
+        """True si le texte contient au moins un mot interdit."""
+        return bool(text) and self.pattern.search(text) is not None
+
+    def check(self, message):
+        """`contains(message.content)`, calculé une seule fois par message."""
+        found = self._verdicts.get(message.id)
+        if found is None:
+            found = self._verdicts[message.id] = self.contains(message.content)
+            if len(self._verdicts) > self.remember:
+                self._verdicts.popitem(last=False)
+        return found
+
+    def censor(self, text):
+        """Retourne (texte censuré, nombre de mots remplacés)."""
+        if not text:
+            return text, 0
+        return self.pattern.subn(self._cartoon, text)
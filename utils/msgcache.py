@@ -0,0 +1,115 @@
+import sys
+import zlib
+from collections import OrderedDict
+
+
+class CachedMessage:
+    """Ce qu'il faut pour loguer une suppression / modification, rien de plus."""
+
+    __slots__ = ("author_id", "channel_id", "blob", "packed")
+
+    def __init__(self, author_id, channel_id, blob, packed):
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.blob = blob      # Contenu UTF-8, compressé si `packed`
+        self.packed = packed
+
+    @property
+    def content(self):
+        data = zlib.decompress(self.blob) if self.packed else self.blob
+        return data.decode("utf-8")
+
+
+# Coût fixe d'une entrée : objet à slots + bytes vide + entrée d'OrderedDict (~100 octets)
+RECORD_OVERHEAD = sys.getsizeof(CachedMessage(0, 0, b"", False)) + sys.getsizeof(b"") + 100
+
+
+class MessageCache:
+    """Contenu des messages récents, borné en mémoire.
+
+    Un LRU par salon (au plus `per_channel` messages) et un budget global
+    de `max_bytes` : au-delà, on évince le plus ancien des messages en tête
+    de LRU, tous salons confondus. Les contenus de plus de `compress_over`
+    octets sont compressés (zlib) si le gain est réel.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, per_channel=5000, compress_over=256):
+        self.max_bytes = max_bytes
+        self.per_channel = per_channel
+        self.compress_over = compress_over
+        self.nbytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._channels = {}  # channel_id -> OrderedDict(message_id -> CachedMessage)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _pack(self, content):
+        data = content.encode("utf-8")
+        if len(data) > self.compress_over:
+            packed = zlib.compress(data)
+            if len(packed) < len(data):
+                return packed, True
+        return data, False
+
+    @staticmethod
+    def _cost(record):
+        return RECORD_OVERHEAD + len(record.blob)
+
+    def add(self, message_id, channel_id, author_id, content):
+        blob, packed = self._pack(content or "")
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = OrderedDict()
+        old = channel.pop(message_id, None)
+        if old is not None:
+            self._forget(old)
+        record = channel[message_id] = CachedMessage(author_id, channel_id, blob, packed)
+        self.nbytes += self._cost(record)
+        self._count += 1
+        if len(channel) > self.per_channel:
+            self._forget(channel.popitem(last=False)[1])
+            self.stats["evictions"] += 1
+        while self.nbytes > self.max_bytes and self._count:
+            self._evict_oldest()
+
+    def get(self, message_id, channel_id):
+        channel = self._channels.get(channel_id)
+        record = channel.get(message_id) if channel else None
+        if record is None:
+            self.stats["misses"] += 1
+            return None
+        channel.move_to_end(message_id)
+        self.stats["hits"] += 1
+        return record
+
+    def pop(self, message_id, channel_id):
+        channel = self._channels.get(channel_id)
+        record = channel.pop(message_id, None) if channel else None
+        if record is None:
+            self.stats["misses"] += 1
+            return None
+        self._forget(record)
+        self.stats["hits"] += 1
+        return record
+
+    def update(self, message_id, channel_id, content):
+        """Nouveau contenu après une modification (sans effet si le message n'est plus en cache)."""
+        record = self.get(message_id, channel_id)
+        if record is not None:
+            self.add(message_id, channel_id, record.author_id, content)
+
+    def _forget(self, record):
+        self.nbytes -= self._cost(record)
+        self._count -= 1
+
+    def _evict_oldest(self):
+        # Ids Discord croissants dans le temps : la plus petite tête de LRU est la plus ancienne
+        channel_id, channel = min(
+            ((cid, ch) for cid, ch in self._channels.items() if ch), key=lambda item: next(iter(item[1]))
+        )
+        self._forget(channel.popitem(last=False)[1])
+        self.stats["evictions"] += 1
+        if not channel:
+            del self._channels[channel_id]
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from collections import deque
+
+
+class SubprocessJob:
+    """Sous-processus lancé une seule fois, suivi par autant d'appelants que voulu.
+
+    stdout et stderr sont lus ligne par ligne pendant l'exécution (les
+    dernières lignes sont gardées dans `lines`). Au-delà de `timeout`
+    secondes, le processus est tué.
+    """
+
+    def __init__(self, args, timeout, tail=40):
+        self.args = args
+        self.timeout = timeout
+        self.lines = deque(maxlen=tail)
+        self.line_count = 0
+        self.returncode = None
+        self.timed_out = False
+        self.started_at = None
+        self.ended_at = None
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    @property
+    def elapsed(self):
+        end = self.ended_at or time.monotonic()
+        return end - (self.started_at or end)
+
+    async def _read(self, stream):
+        async for raw in stream:
+            self.lines.append(raw.decode(errors="replace").rstrip())
+            self.line_count += 1
+
+    async def run(self):
+        """Lance le processus et attend sa fin (ou le tue au timeout)."""
+        self.started_at = time.monotonic()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=1024 * 1024,
+            )
+            try:
+                await asyncio.wait_for(asyncio.gather(self._read(proc.stdout), proc.wait()), self.timeout)
+            except asyncio.TimeoutError:
+                self.timed_out = True
+                proc.kill()
+                await proc.wait()
+            except asyncio.CancelledError:
+                proc.kill()  # Arrêt du bot : pas de scraper orphelin
+                raise
+            self.returncode = proc.returncode
+        except OSError as e:
+            self.lines.append(str(e))
+            self.returncode = -1
+        finally:
+            self.ended_at = time.monotonic()
+            self._done.set()
+        return self.returncode
+
+    async def wait(self, timeout=None):
+        """Attend la fin du processus ; False si `timeout` expire avant."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
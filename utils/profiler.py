@@ -0,0 +1,208 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Fonctions où la boucle attend des événements : échantillons « au repos »
+IDLE_FUNCTIONS = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+
+def _where(filename, lineno, name):
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+class ProfileSession:
+    """Profil temporaire du bot en production (`!profile <secondes>`).
+
+    Rien n'est installé en dehors d'une session : coût nul le reste du temps.
+    Pendant la session :
+    - un thread échantillonne toutes les `interval` s la pile du thread de
+      la boucle (`sys._current_frames`) : temps cumulé / propre par fonction,
+      sans instrumenter chaque appel ;
+    - une tâche « battement » mesure les blocages de la boucle au-delà de
+      `block_threshold` ; les échantillons pris pendant un blocage disent
+      quel code le provoque ;
+    - tracemalloc compare deux snapshots (début / fin) par ligne d'allocation ;
+    - les histogrammes `event_seconds` / `command_seconds` sont comparés ;
+    - avec `use_cprofile`, cProfile trace en plus chaque appel (exact mais
+      plus coûteux : à réserver aux sessions courtes).
+    """
+
+    def __init__(self, metrics, root=".", interval=0.005, block_threshold=0.05, use_cprofile=False):
+        self.metrics = metrics
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.use_cprofile = use_cprofile
+        self.started_at = None
+        self.duration = 0.0
+        self._loop_thread = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._heartbeat = None
+        self._samples = 0
+        self._idle = 0
+        self._self_counts = Counter()  # (fichier, ligne de déf, nom) -> échantillons en feuille
+        self._cum_counts = Counter()   # ... -> échantillons où la fonction est dans la pile
+        self._stalled = []             # (instant, emplacement du code du bot) pendant un blocage
+        self._blocks = []              # (début, durée)
+        self._beat = 0.0
+        self._profile = None
+        self._traced_before = False
+        self._snapshot = None
+        self._histograms = {}
+
+    # --- Démarrage / arrêt ---
+
+    def start(self):
+        """À appeler depuis la boucle d'événements."""
+        self.started_at = time.perf_counter()
+        self._loop_thread = threading.get_ident()
+        self._histograms = self._histogram_state()
+        self._traced_before = tracemalloc.is_tracing()
+        if not self._traced_before:
+            tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot()
+        if self.use_cprofile:
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                self._profile = None  # Un autre profileur est déjà actif
+        self._beat = time.perf_counter()
+        self._heartbeat = asyncio.create_task(self._run_heartbeat())
+        self._thread = threading.Thread(target=self._run_sampler, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """Arrête tout et retourne le rapport texte."""
+        if self._profile is not None:
+            self._profile.disable()
+        self._stop.set()
+        self._heartbeat.cancel()
+        await asyncio.to_thread(self._thread.join)
+        self.duration = time.perf_counter() - self.started_at
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if not self._traced_before:
+            tracemalloc.stop()
+        # Histogrammes lus sur la boucle (elle y ajoute des clés) ; mise en forme hors de la boucle
+        state = self._histogram_state()
+        rows = {name: self._histogram_deltas(state, name) for name in ("event_seconds", "command_seconds")}
+        return await asyncio.to_thread(self._report, snapshot, peak, rows)
+
+    async def _run_heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self._beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            late = loop.time() - start - self.interval
+            if late >= self.block_threshold:
+                self._blocks.append((time.perf_counter() - late, late))
+
+    def _run_sampler(self):
+        root = self.root
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            now = time.perf_counter()
+            self._samples += 1
+            leaf = frame.f_code
+            if (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FUNCTIONS:
+                self._idle += 1
+                continue
+            seen = set()
+            ours = None
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if ours is None and code.co_filename.startswith(root):
+                    ours = _where(code.co_filename, frame.f_lineno, code.co_name)
+                seen.add(key)
+                frame = frame.f_back
+            self._self_counts[(leaf.co_filename, leaf.co_firstlineno, leaf.co_name)] += 1
+            self._cum_counts.update(seen)
+            if now - self._beat > self.interval + self.block_threshold:
+                self._stalled.append((now, ours or _where(leaf.co_filename, leaf.co_firstlineno, leaf.co_name)))
+
+    # --- Histogrammes ---
+
+    def _histogram_state(self):
+        return {
+            key: (hist.count, hist.sum, list(hist.counts), hist.bounds)
+            for key, hist in self.metrics.histograms.items() if key[0] in ("event_seconds", "command_seconds")
+        }
+
+    def _histogram_deltas(self, state, name):
+        """[(label, appels, total, borne p99)] de la fenêtre, par temps total décroissant."""
+        rows = []
+        for key, (count, total, counts, bounds) in state.items():
+            if key[0] != name:
+                continue
+            before = self._histograms.get(key, (0, 0.0, [0] * len(counts), bounds))
+            calls = count - before[0]
+            if not calls:
+                continue
+            delta = [n - b for n, b in zip(counts, before[2])]
+            bounds = tuple(bounds) + (float("inf"),)
+            seen, p99 = 0, bounds[-1]
+            for bound, n in zip(bounds, delta):
+                seen += n
+                if seen >= 0.99 * calls:
+                    p99 = bound
+                    break
+            label = ", ".join(str(v) for _, v in key[1])
+            rows.append((label, calls, total - before[1], p99))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    # --- Rapport ---
+
+    def _report(self, snapshot, peak, histogram_rows, top=25):
+        out = io.StringIO()
+        busy = self._samples - self._idle
+        out.write(f"=== Profil — {self.duration:.1f} s, échantillon toutes les {self.interval * 1000:.0f} ms ===\n")
+        out.write(f"Boucle occupée : {busy / max(1, self._samples):.1%} ({busy} échantillons actifs sur {self._samples})\n\n")
+
+        out.write("--- CPU : fonctions par temps cumulé (échantillons hors attente) ---\n")
+        out.write(f"{'cumul':>7} {'propre':>7}  fonction\n")
+        for key, count in self._cum_counts.most_common(top):
+            out.write(f"{count / max(1, busy):>7.1%} {self._self_counts[key] / max(1, busy):>7.1%}  {_where(*key)}\n")
+
+        if self._profile is not None:
+            out.write("\n--- cProfile : temps cumulé ---\n")
+            stats = pstats.Stats(self._profile, stream=out)
+            stats.sort_stats("cumulative").print_stats(top)
+
+        out.write("\n--- Mémoire : sites d'allocation (différence début / fin) ---\n")
+        out.write(f"Pic tracé pendant la session : {peak / 1e6:.1f} Mo\n")
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        diff = snapshot.filter_traces(filters).compare_to(self._snapshot.filter_traces(filters), "lineno")
+        for stat in diff[:top]:
+            frame = stat.traceback[0]
+            out.write(f"{stat.size_diff / 1024:>+10.1f} Kio {stat.count_diff:>+8} blocs  "
+                      f"{os.path.relpath(frame.filename, self.root) if frame.filename.startswith(self.root) else frame.filename}:{frame.lineno}\n")
+
+        for title, name in (("Événements les plus lents", "event_seconds"), ("Commandes les plus lentes", "command_seconds")):
+            out.write(f"\n--- {title} (temps total dans la fenêtre) ---\n")
+            rows = histogram_rows[name]
+            if not rows:
+                out.write("Aucun\n")
+            for label, calls, total, p99 in rows[:top]:
+                out.write(f"{total * 1000:>10.1f} ms {calls:>7} appels  moy {total / calls * 1000:>7.2f} ms  p99 ≤ {p99 * 1000:g} ms  {label}\n")
+
+        out.write(f"\n--- Plus longs blocages de la boucle (≥ {self.block_threshold * 1000:.0f} ms) ---\n")
+        if not self._blocks:
+            out.write("Aucun\n")
+        for start, length in sorted(self._blocks, key=lambda block: block[1], reverse=True)[:top]:
+            culprits = Counter(where for at, where in self._stalled if start <= at <= start + length)
+            culprit = culprits.most_common(1)[0][0] if culprits else "(non échantillonné)"
+            out.write(f"{length * 1000:>8.0f} ms  à +{start - self.started_at:>6.1f} s  {culprit}\n")
+        return out.getvalue()
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Cache TTL + LRU devant une source lente (MySQL pour `!news` / `!search`, API de `!so`).
+
+    - `get(key, load)` : la valeur en cache, sinon `await load()` (les
+      appels simultanés sur la même clé partagent une seule requête) ;
+    - `invalidate()` : tout est périmé (nouvel article vu par le bot) ;
+    - `ttl` : durée de vie d'une entrée (filet de sécurité pour les
+      insertions que le bot ne voit pas).
+
+    Avec `admit_after=N`, une clé n'est gardée qu'à sa N-ième demande dans
+    la fenêtre du TTL : les recherches isolées ne chassent pas les
+    fréquentes du LRU. Un chargement commencé avant une invalidation n'est
+    ni mis en cache ni partagé avec les demandes suivantes.
+    """
+
+    def __init__(self, ttl=300, max_entries=128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+        self._cache = OrderedDict()  # clé -> (expiration, valeur)
+        self._seen = OrderedDict()   # clé -> (expiration, demandes) avant admission
+        self._inflight = {}          # clé -> Future partagée
+
+    def __len__(self):
+        return len(self._cache)
+
+    def invalidate(self):
+        self.generation += 1
+        self.stats["invalidations"] += 1
+        self._cache.clear()
+        self._inflight.clear()
+
+    def _lookup(self, key, now):
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < now:
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, value
+
+    def _admit(self, key, now, admit_after):
+        if admit_after <= 1:
+            return True
+        expires, count = self._seen.pop(key, (0.0, 0))
+        count = count + 1 if expires >= now else 1
+        if count >= admit_after:
+            return True
+        self._seen[key] = (now + self.ttl, count)
+        while len(self._seen) > 4 * self.max_entries:
+            self._seen.popitem(last=False)
+        return False
+
+    async def get(self, key, load, admit_after=1):
+        now = time.monotonic()
+        found, value = self._lookup(key, now)
+        if found:
+            self.stats["hits"] += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Pas d'avertissement si personne d'autre n'attendait
+            raise
+        else:
+            future.set_result(value)
+            if generation == self.generation and self._admit(key, now, admit_after):
+                self._cache[key] = (now + self.ttl, value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -0,0 +1,194 @@
+import hashlib
+import math
+import struct
+from array import array
+
+from utils.dedup import normalize_url
+from utils.search import tokenize
+from utils.storage import RecordLog
+
+# Message du salon veille -> lien de l'article (clé stable sur 64 bits) : 16 octets
+LINK_RECORD = struct.Struct("<QQ")
+
+
+def _numpy():
+    """Import différé : NumPy n'est chargé qu'au premier !recommend."""
+    import numpy
+    return numpy
+
+
+def url_key(url):
+    """Clé stable d'un lien normalisé (identique d'un démarrage à l'autre, contrairement à hash())."""
+    key = normalize_url(url or "")
+    if not key:
+        return None
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+class Recommender:
+    """Recommandations d'articles par similarité TF-IDF (features hachées).
+
+    Chaque article (titre + source) devient une ligne creuse de
+    `n_features` colonnes, ajoutée au fil de l'eau dans des `array`
+    (format CSR : `indptr`, `indices`) avec les fréquences de documents.
+    Un membre est la somme des vecteurs des articles qu'il a validés ;
+    le score de tous les articles est un seul produit matrice creuse ×
+    vecteur dense (NumPy), sans reconstruire la matrice à chaque requête.
+
+    Les réactions portent sur des messages Discord, les articles sont des
+    lignes MySQL : le lien posté fait la jointure (`link_message`), gardée
+    dans un journal (`log`) pour les validations des jours précédents. Les
+    messages sous le plancher des validations (`forget_before`) ne
+    rapportent plus rien : oubliés, et le journal est compacté.
+    """
+
+    def __init__(self, n_features=1 << 18):
+        self.log = RecordLog(None, LINK_RECORD)  # Écrit au flush de l'XP, hors de la boucle
+        self.floor = 0
+        self._forgotten = 0      # Liens encore dans le fichier mais oubliés en mémoire
+        self.n_features = n_features
+        self.indptr = array("Q", [0])
+        self.indices = array("I")
+        self.df = array("I", bytes(4 * n_features))
+        self.article_ids = array("q")
+        self.last_id = 0
+        self._rows_by_url = {}   # url_key -> ligne
+        self._message_urls = {}  # message_id -> url_key
+        self._reads = {}         # user_id -> array("Q") de message_ids validés
+        self._matrix = None      # (articles, indptr, indices, poids normalisés) au dernier calcul
+        self.stats = {"queries": 0, "rebuilds": 0}
+
+    def __len__(self):
+        return len(self.article_ids)
+
+    # --- Articles ---
+
+    def _features(self, title, source):
+        mask = self.n_features - 1
+        terms = set(tokenize(title or ""))
+        terms.add("src:" + (source or "").lower())  # Jamais de ligne vide
+        return {hash(term) & mask for term in terms}
+
+    def add_article(self, article_id, title, source, url):
+        if article_id <= self.last_id:
+            return
+        self.last_id = article_id
+        key = url_key(url)
+        if key is not None:
+            self._rows_by_url.setdefault(key, len(self.article_ids))
+        self.article_ids.append(article_id)
+        features = self._features(title, source)
+        self.indices.extend(features)
+        self.indptr.append(len(self.indices))
+        df = self.df
+        for feature in features:
+            df[feature] += 1
+
+    # --- Messages & validations ---
+
+    def load(self, links_path, pairs, floor=0):
+        """Liens message -> article persistés (au-dessus du plancher), puis validations (message_id, user_id)."""
+        self.log.path = links_path
+        self.floor = floor
+        records = self.log.read()
+        self._message_urls.update(record for record in records if record[0] > floor)
+        if len(self._message_urls) < len(records):
+            self.log.rewrite(self._message_urls.items())
+        for message_id, user_id in pairs:
+            self.add_read(user_id, message_id)
+
+    def forget_before(self, floor):
+        """Plancher des validations relevé : liens et lectures en dessous ne servent plus."""
+        self.floor = floor
+        # Messages du salon arrivés dans l'ordre : les plus anciens en tête du dict
+        stale = []
+        for message_id in self._message_urls:
+            if message_id > floor:
+                break
+            stale.append(message_id)
+        for message_id in stale:
+            del self._message_urls[message_id]
+        self._forgotten += len(stale)
+        # Compaction quand le fichier contient autant de liens oubliés que de vivants
+        if self._forgotten and self._forgotten >= len(self._message_urls):
+            self._forgotten = 0
+            self.log.rewrite(self._message_urls.items())
+            for user_id, reads in list(self._reads.items()):
+                kept = array("Q", (message_id for message_id in reads if message_id > floor))
+                if kept:
+                    self._reads[user_id] = kept
+                else:
+                    del self._reads[user_id]
+
+    def posted_keys(self):
+        """Clés des liens déjà postés dans le salon veille (articles publiés)."""
+        return set(self._message_urls.values())
+
+    def link_message(self, message_id, urls):
+        """Relie un message du salon veille à l'article de son premier lien."""
+        for url in urls:
+            key = url_key(url)
+            if key is None:
+                continue
+            self._message_urls[message_id] = key
+            self.log.append(message_id, key)
+            return True
+        return False
+
+    def add_read(self, user_id, message_id):
+        reads = self._reads.get(user_id)
+        if reads is None:
+            reads = self._reads[user_id] = array("Q")
+        reads.append(message_id)
+
+    def _read_rows(self, user_id):
+        rows = set()
+        for message_id in self._reads.get(user_id, ()):
+            row = self._rows_by_url.get(self._message_urls.get(message_id))
+            if row is not None:
+                rows.add(row)
+        return sorted(rows)
+
+    # --- Scores ---
+
+    def _weights(self):
+        """Poids TF-IDF normalisés (L2) de chaque entrée ; recalculés seulement si des articles sont arrivés."""
+        np = _numpy()
+        n_rows = len(self.article_ids)
+        if self._matrix is not None and self._matrix[0] == n_rows:
+            return self._matrix
+        # Tranches copiées : des articles peuvent arriver pendant le calcul (thread)
+        indptr = np.array(self.indptr[:n_rows + 1], dtype=np.int64)
+        indices = np.array(self.indices[:indptr[-1]], dtype=np.int64)
+        df = np.array(self.df, dtype=np.float32)
+        idf = np.log((1 + n_rows) / (1 + df)).astype(np.float32) + 1
+        weights = idf[indices]
+        norms = np.sqrt(np.add.reduceat(weights * weights, indptr[:-1]))
+        weights /= np.repeat(norms, np.diff(indptr))
+        self._matrix = (n_rows, indptr, indices, weights)
+        self.stats["rebuilds"] += 1
+        return self._matrix
+
+    def recommend(self, user_id, limit=5):
+        """Ids des articles les plus proches de ce que le membre a validé (jamais déjà lus)."""
+        rows = self._read_rows(user_id)
+        if not rows or not self.article_ids:
+            return []
+        np = _numpy()
+        self.stats["queries"] += 1
+        _, indptr, indices, weights = self._weights()
+
+        # Profil : somme des vecteurs lus (dense, n_features)
+        picked = np.concatenate([np.arange(indptr[r], indptr[r + 1]) for r in rows])
+        profile = np.zeros(self.n_features, dtype=np.float32)
+        np.add.at(profile, indices[picked], weights[picked])
+
+        # Tous les articles d'un coup : matrice creuse × profil dense
+        scores = np.add.reduceat(weights * profile[indices], indptr[:-1])
+        scores[rows] = -math.inf
+        limit = min(limit, len(scores) - len(rows))
+        if limit <= 0:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [self.article_ids[i] for i in best if scores[i] > 0]
@@ -0,0 +1,159 @@
+import asyncio
+import bisect
+import heapq
+import math
+import re
+import time
+import unicodedata
+from array import array
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Mots vides FR/EN ignorés à l'indexation et dans les requêtes
+STOPWORDS = frozenset("""
+    le la les un une des du de d l et ou en au aux a sur pour par avec sans dans ce ces cet cette
+    est sont qui que quoi son sa ses leur leurs plus the an of to in on for with and or is are
+    how what why your you from by at as it its be this that vs
+""".split())
+
+
+def normalize(text):
+    """Minuscules sans accents : "Sécurité" -> "securite"."""
+    if text.isascii():
+        return text.lower() # Cas le plus courant, sans décomposition Unicode
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall(normalize(text)) if len(t) > 1 and t not in STOPWORDS]
+
+
+class SearchIndex:
+    """Index inversé BM25 des articles (titre + source), construit incrémentalement.
+
+    Les documents sont numérotés de façon dense dans l'ordre d'arrivée ; les
+    listes de postings sont des `array` d'entiers (4 octets par entrée), ce
+    qui garde l'index compact même pour des millions d'articles. Seuls les
+    IDs d'articles sont stockés : titres et liens sont relus dans MySQL par
+    clé primaire.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, max_prefix_terms=32, max_postings=50_000):
+        self.k1 = k1
+        self.b = b
+        self.max_prefix_terms = max_prefix_terms
+        # Termes très fréquents : seuls les N articles les plus récents sont notés
+        self.max_postings = max_postings
+        self.doc_ids = array("q")   # numéro interne -> id de l'article
+        self.doc_norms = array("f") # facteur BM25 de longueur, calculé à l'ajout
+        self.postings = {}          # terme -> array("I") de numéros internes croissants
+        self._vocab = []            # termes triés (recherche par préfixe)
+        self._total_len = 0
+        self.last_id = 0
+        self.ready = False
+        self.refreshed_at = 0.0
+        self._lock = None
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    # --- Indexation ---
+
+    def add(self, article_id, text):
+        """Indexe un article (ignoré s'il est déjà connu)."""
+        if article_id <= self.last_id:
+            return False
+        terms = set(tokenize(text))
+        docno = len(self.doc_ids)
+        self.doc_ids.append(article_id)
+        self._total_len += len(terms)
+        # La longueur moyenne d'un titre est stable : on fige la normalisation à l'ajout
+        avgdl = self._total_len / (docno + 1)
+        self.doc_norms.append((self.k1 + 1) / (1 + self.k1 * (1 - self.b + self.b * len(terms) / avgdl)))
+        self.last_id = article_id
+        for term in terms:
+            plist = self.postings.get(term)
+            if plist is None:
+                plist = self.postings[term] = array("I")
+                bisect.insort(self._vocab, term)
+            plist.append(docno)
+        return True
+
+    async def refresh(self, fetch_batch, batch_size=5000):
+        """Indexe les articles plus récents que `last_id`.
+
+        `fetch_batch(after_id, limit)` est une coroutine qui retourne des
+        lignes (id, texte) triées par id. La boucle d'événements est rendue
+        entre deux lots.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            added = 0
+            while True:
+                rows = await fetch_batch(self.last_id, batch_size)
+                for article_id, text in rows:
+                    added += self.add(article_id, text or "")
+                if len(rows) < batch_size:
+                    break
+                await asyncio.sleep(0)
+            self.ready = True
+            self.refreshed_at = time.monotonic()
+            return added
+
+    # --- Recherche ---
+
+    def _expand(self, term):
+        """Le terme exact (poids 1) + les termes qui le prolongent (poids 0.5)."""
+        if len(term) < 3:
+            return [(term, 1.0)] if term in self.postings else []
+        expanded = []
+        i = bisect.bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term) and len(expanded) < self.max_prefix_terms:
+            candidate = self._vocab[i]
+            expanded.append((candidate, 1.0 if candidate == term else 0.5))
+            i += 1
+        return expanded
+
+    def search(self, query, offset=0, limit=5):
+        """Retourne (nombre de résultats, ids d'articles de la page) par pertinence.
+
+        Peut tourner dans un thread (`asyncio.to_thread`) pendant que la
+        boucle indexe : les tableaux ne font que grandir et un document est
+        complet (id, norme) avant d'apparaître dans les postings.
+        """
+        n_docs = len(self.doc_ids)
+        if not n_docs:
+            return 0, []
+        norms = self.doc_norms
+        scores = {}
+        matched = 0
+        get = scores.get
+        for token in set(tokenize(query)):
+            expanded = self._expand(token)
+            # Un document qui contient le terme exact et un prolongement n'est compté
+            # qu'une fois par terme de la requête, avec sa meilleure note
+            token_scores = {}
+            kept = token_scores.get
+            for term, weight in expanded:
+                plist = self.postings[term]
+                df = len(plist)
+                matched = max(matched, df)
+                idf = weight * math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                # BM25 avec tf = 1 (les termes d'un titre sont dédoublonnés)
+                if len(expanded) == 1:
+                    for docno in plist[-self.max_postings:]:
+                        scores[docno] = get(docno, 0.0) + idf * norms[docno]
+                    continue
+                for docno in plist[-self.max_postings:]:
+                    score = idf * norms[docno]
+                    if score > kept(docno, 0.0):
+                        token_scores[docno] = score
+            for docno, score in token_scores.items():
+                scores[docno] = get(docno, 0.0) + score
+        if not scores:
+            return 0, []
+        # À score égal, l'article le plus récent d'abord
+        best = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return max(matched, len(scores)), [self.doc_ids[docno] for docno, _ in best[offset:]]
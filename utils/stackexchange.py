@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import aiohttp
+
+from utils.querycache import QueryCache
+
+
+class StackExchangeError(Exception):
+    """Erreur renvoyée par l'API (quota, paramètres...)."""
+
+
+class StackExchangeClient:
+    """Client StackExchange partagé par tout le bot.
+
+    - une seule `ClientSession` (pool de connexions + TLS réutilisés) ;
+    - cache TTL + LRU indexé sur la requête normalisée ;
+    - requêtes identiques en vol fusionnées (une seule requête HTTP) ;
+    - respect du champ `backoff` et du quota renvoyés par l'API.
+    """
+
+    def __init__(self, base_url="https://api.stackexchange.com/2.3", key=None,
+                 timeout=10, ttl=600, max_entries=256):
+        self.base_url = base_url.rstrip("/")
+        self.key = key
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.cache = QueryCache(ttl=ttl, max_entries=max_entries)
+        self.quota_remaining = None
+        self._session = None
+        self._not_before = 0.0  # imposé par `backoff`
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    @staticmethod
+    def normalize(query):
+        return " ".join(query.lower().split())
+
+    def _session_or_new(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    # --- Requêtes ---
+
+    async def _fetch(self, query):
+        delay = self._not_before - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        params = {"order": "desc", "sort": "relevance", "q": query, "site": "stackoverflow"}
+        if self.key:
+            params["key"] = self.key
+        async with self._session_or_new().get(f"{self.base_url}/search/advanced", params=params) as response:
+            data = await response.json(content_type=None)
+        if data.get("backoff"):
+            self._not_before = time.monotonic() + int(data["backoff"])
+        self.quota_remaining = data.get("quota_remaining", self.quota_remaining)
+        if "error_id" in data:
+            raise StackExchangeError(data.get("error_message") or data.get("error_name"))
+        return data.get("items", [])
+
+    async def search(self, query):
+        """Questions correspondant à `query`, par pertinence."""
+        key = self.normalize(query)
+        return await self.cache.get(key, lambda: self._fetch(key))
@@ -0,0 +1,781 @@
+import asyncio
+import functools
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def atomic_write_json(path, data):
+    """Écrit le JSON dans un fichier temporaire puis le renomme (pas de fichier tronqué)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Fichier monté seul en volume Docker : le rename est refusé (EBUSY),
+            # on recopie le contenu déjà validé sur disque.
+            with open(tmp_path, "rb") as src, open(path, "wb") as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_json(path):
+    """Lit un fichier JSON, {} s'il est absent ou illisible."""
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+# Paire (message_id, user_id) en binaire : 16 octets par validation
+AWARD_RECORD = struct.Struct("<QQ")
+
+
+class RecordLog:
+    """Fichier d'enregistrements binaires de taille fixe, en ajout seul.
+
+    `append` ne fait que remplir un tampon : les ajouts sont écrits par lots
+    au flush de l'XP (`flush(run)`, dans l'exécuteur du backend), jamais
+    depuis la boucle d'événements. `rewrite` remplace tout le contenu au
+    prochain flush (compaction).
+    """
+
+    def __init__(self, path, record):
+        self.path = path
+        self.record = record
+        self._buffer = bytearray()
+        self._rewrite = None
+        self._lock = None  # Créé dans la boucle du bot (Python 3.9)
+
+    def read(self):
+        """Enregistrements déjà sur disque (démarrage) ; dernier enregistrement tronqué ignoré."""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            data = f.read()
+        return list(self.record.iter_unpack(data[:len(data) - len(data) % self.record.size]))
+
+    def append(self, *values):
+        self._buffer += self.record.pack(*values)
+
+    def rewrite(self, records):
+        """Contenu complet à écrire au prochain flush (remplace aussi les ajouts en attente)."""
+        self._rewrite = b"".join(self.record.pack(*values) for values in records)
+        self._buffer.clear()
+
+    @property
+    def pending(self):
+        return bool(self._buffer) or self._rewrite is not None
+
+    async def flush(self, run):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.pending or not self.path:
+                return False
+            data, rewrite = bytes(self._buffer), self._rewrite
+            self._buffer.clear()
+            self._rewrite = None
+            try:
+                await run(self._write, data, rewrite)
+            except BaseException:
+                if self._rewrite is None:  # Sinon une compaction plus récente contient déjà tout
+                    self._rewrite = rewrite
+                    self._buffer[:0] = data
+                raise
+            return True
+
+    def _write(self, data, rewrite):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if rewrite is not None:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(rewrite + data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        elif data:
+            with open(self.path, "ab") as f:
+                f.write(data)
+                f.flush()
+
+# ==========================================
+# 🗄️ BACKENDS (XP & WARNS)
+# ==========================================
+
+class JsonBackend:
+    """Backend historique : XP en un fichier JSON complet (warns : voir WarnJournal)."""
+
+    name = "json"
+    full_rewrite = True  # save_xp attend le dict complet
+
+    def __init__(self, xp_path, awards_path):
+        self.xp_path = xp_path
+        self.awards_path = awards_path
+        os.makedirs(os.path.dirname(os.path.abspath(awards_path)), exist_ok=True)
+
+    async def run(self, func, *args):
+        """Exécute une opération bloquante hors de la boucle d'événements."""
+        return await asyncio.to_thread(func, *args)
+
+    def close(self):
+        pass
+
+    # --- XP ---
+
+    def load_xp(self):
+        return read_json(self.xp_path)
+
+    def save_xp(self, data, awards=()):
+        # Validations d'abord : après un crash, on perd au pire de l'XP, jamais un doublon
+        if awards:
+            with open(self.awards_path, "ab") as f:
+                f.write(b"".join(AWARD_RECORD.pack(m, u) for m, u in awards))
+                f.flush()
+                os.fsync(f.fileno())
+        atomic_write_json(self.xp_path, data)
+
+    # --- Validations (article, membre) ---
+
+    def load_awards(self):
+        if not os.path.exists(self.awards_path):
+            return []
+        with open(self.awards_path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % AWARD_RECORD.size  # Dernier enregistrement tronqué ignoré
+        return list(AWARD_RECORD.iter_unpack(data[:usable]))
+
+    def prune_awards(self, floor):
+        """Oublie les validations des articles d'id <= floor."""
+        pairs = [(m, u) for m, u in self.load_awards() if m > floor]
+        tmp_path = self.awards_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(AWARD_RECORD.pack(m, u) for m, u in pairs))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.awards_path)
+
+
+class SQLiteBackend:
+    """Backend SQLite en mode WAL : upserts indexés, un warn = une ligne.
+
+    Toutes les requêtes passent par un unique thread dédié (écritures
+    sérialisées, boucle d'événements jamais bloquée). Au premier démarrage,
+    les fichiers JSON existants sont importés automatiquement.
+    """
+
+    name = "sqlite"
+    full_rewrite = False  # save_xp ne reçoit que les joueurs modifiés
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS xp (
+            user_id TEXT PRIMARY KEY,
+            xp      INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS warns (
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            reason  TEXT NOT NULL,
+            date    TEXT NOT NULL,
+            mod     TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_warns_user ON warns (user_id, id);
+        CREATE TABLE IF NOT EXISTS awards (
+            message_id INTEGER NOT NULL,
+            user_id    INTEGER NOT NULL,
+            PRIMARY KEY (message_id, user_id)
+        ) WITHOUT ROWID;
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, path, xp_json=None, warns_json=None, warns_journal=None):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # Plusieurs process (shards) peuvent écrire : on attend le verrou au lieu d'échouer
+        self.conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._migrate_json(xp_json, warns_json, warns_journal)
+
+    async def run(self, func, *args):
+        """Exécute une opération dans le thread SQLite."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.conn.close()
+
+    def _migrate_json(self, xp_json, warns_json, warns_journal=None):
+        """Import unique des anciens fichiers JSON (les fichiers sont laissés en place)."""
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done:
+            return
+        xp = read_json(xp_json) if xp_json else {}
+        # Snapshot + journal rejoué : mêmes warns que le mode JSON
+        warns = WarnJournal(warns_json, warns_journal).load() if warns_json else {}
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Revérifié sous verrou : un autre shard a pu migrer entre-temps
+            if self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone():
+                self.conn.execute("ROLLBACK")
+                return
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO xp (user_id, xp) VALUES (?, ?)",
+                [(str(uid), int(value)) for uid, value in xp.items()],
+            )
+            self.conn.executemany(
+                "INSERT INTO warns (user_id, reason, date, mod) VALUES (?, ?, ?, ?)",
+                [
+                    (str(uid), w.get("reason", ""), w.get("date", ""), w.get("mod", ""))
+                    for uid, user_warns in warns.items()
+                    for w in user_warns
+                ],
+            )
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        if xp or warns:
+            print(f"📦 Migration JSON -> SQLite : {len(xp)} joueurs, {sum(map(len, warns.values()))} warns.")
+
+    def _transaction(self, func, *args):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(*args)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return result
+
+    # --- XP ---
+
+    def load_xp(self):
+        return dict(self.conn.execute("SELECT user_id, xp FROM xp"))
+
+    def save_xp(self, changes, awards=()):
+        # XP et validations dans la même transaction : jamais l'un sans l'autre
+        def write():
+            self.conn.executemany(
+                "INSERT INTO xp (user_id, xp) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET xp = excluded.xp",
+                list(changes.items()),
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO awards (message_id, user_id) VALUES (?, ?)", awards)
+        self._transaction(write)
+
+    def award_xp(self, message_id, user_id, amount):
+        """Validation + gain d'XP atomiques, sûrs entre process.
+
+        Retourne (ancienne, nouvelle) XP, ou None si la paire était déjà validée.
+        """
+        def write():
+            inserted = self.conn.execute(
+                "INSERT OR IGNORE INTO awards (message_id, user_id) VALUES (?, ?)", (message_id, user_id)
+            ).rowcount
+            if not inserted:
+                return None
+            key = str(user_id)
+            self.conn.execute(
+                "INSERT INTO xp (user_id, xp) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET xp = xp + excluded.xp",
+                (key, amount),
+            )
+            new = self.conn.execute("SELECT xp FROM xp WHERE user_id = ?", (key,)).fetchone()[0]
+            return new - amount, new
+        return self._transaction(write)
+
+    # --- Validations (article, membre) ---
+
+    def load_awards(self):
+        return self.conn.execute("SELECT message_id, user_id FROM awards ORDER BY message_id").fetchall()
+
+    def prune_awards(self, floor):
+        """Oublie les validations des articles d'id <= floor."""
+        self.conn.execute("DELETE FROM awards WHERE message_id <= ?", (floor,))
+
+    # --- Warns ---
+
+    def get_warns(self, user_id):
+        rows = self.conn.execute(
+            "SELECT reason, date, mod FROM warns WHERE user_id = ? ORDER BY id", (user_id,)
+        )
+        return [{"reason": r, "date": d, "mod": m} for r, d, m in rows]
+
+    def add_warn(self, user_id, warn):
+        def insert():
+            self.conn.execute(
+                "INSERT INTO warns (user_id, reason, date, mod) VALUES (?, ?, ?, ?)",
+                (user_id, warn["reason"], warn["date"], warn["mod"]),
+            )
+            return self.conn.execute("SELECT COUNT(*) FROM warns WHERE user_id = ?", (user_id,)).fetchone()[0]
+        return self._transaction(insert)
+
+    def remove_warn(self, user_id, index):
+        """Retire le warn n°index (0-based). False si introuvable."""
+        if index < 0:
+            return False
+
+        def delete():
+            row = self.conn.execute(
+                "SELECT id FROM warns WHERE user_id = ? ORDER BY id LIMIT 1 OFFSET ?", (user_id, index)
+            ).fetchone()
+            if row is None:
+                return False
+            self.conn.execute("DELETE FROM warns WHERE id = ?", row)
+            return True
+        return self._transaction(delete)
+
+    def clear_warns(self, user_id):
+        cursor = self.conn.execute("DELETE FROM warns WHERE user_id = ?", (user_id,))
+        return cursor.rowcount > 0
+
+
+def open_storage(kind, db_path, xp_json, warns_json, awards_file, shared=False, warns_journal=None):
+    """Ouvre le backend demandé ; retombe sur JSON si SQLite est indisponible.
+
+    `shared` (plusieurs process) : SQLite obligatoire, pas de repli JSON.
+    """
+    if shared and kind != "sqlite":
+        raise ValueError("Le mode multi-process nécessite STORAGE_BACKEND=sqlite.")
+    if kind == "sqlite":
+        try:
+            return SQLiteBackend(db_path, xp_json=xp_json, warns_json=warns_json, warns_journal=warns_journal)
+        except sqlite3.Error as e:
+            if shared:
+                raise
+            print(f"⚠️ SQLite indisponible ({e}), retour au stockage JSON.")
+    return JsonBackend(xp_json, awards_file)
+
+async def flush_journals(journals, run):
+    """Écrit les journaux qui ont des ajouts en attente ; True si au moins un l'a été."""
+    wrote = False
+    for journal in journals:
+        if journal.pending:
+            wrote = await journal.flush(run) or wrote
+    return wrote
+
+# ==========================================
+# ✍️ ÉCRITURE DIFFÉRÉE (XP)
+# ==========================================
+
+class WriteBehindStore:
+    """Dict en mémoire avec écriture différée vers un backend.
+
+    Les modifications marquent les clés "sales" ; un flush en tâche de fond
+    les persiste toutes les `flush_interval` secondes, ou dès que
+    `max_dirty` changements sont en attente. Une rafale de réactions
+    donne donc une seule écriture disque.
+    """
+
+    def __init__(self, flush_interval=30, max_dirty=50, on_flush=None):
+        self.backend = None
+        self.on_flush = on_flush  # Appelé avec la durée (s) de chaque flush
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.data = {}
+        # Journaux binaires écrits au même rythme que l'XP (RecordLog, XPEventLog...)
+        self.journals = []
+        self._dirty = set()
+        self._awards = []  # Validations (message_id, user_id) à persister avec l'XP
+        # Créés dans la boucle du bot (Python 3.9 lie Event/Lock à la boucle courante)
+        self._wake = None
+        self._lock = None
+        self._task = None
+        self._closing = False
+
+    def _primitives(self):
+        if self._lock is None:
+            self._wake = asyncio.Event()
+            self._lock = asyncio.Lock()
+        return self._wake, self._lock
+
+    # --- Lecture / écriture en mémoire ---
+
+    def load(self, backend):
+        """Charge les données (le dict est rempli sur place, les alias restent valides)."""
+        self.backend = backend
+        self.data.clear()
+        self.data.update(backend.load_xp())
+        self._dirty.clear()
+        return self.data
+
+    def incr(self, key, amount):
+        """Ajoute `amount` à la valeur de `key` et retourne (ancienne, nouvelle)."""
+        old = self.data.get(key, 0)
+        self.data[key] = old + amount
+        self.mark_dirty(key)
+        return old, old + amount
+
+    def record_award(self, message_id, user_id):
+        """Validation à persister au prochain flush, dans la même écriture que l'XP."""
+        self._awards.append((message_id, user_id))
+
+    async def award(self, message_id, user_id, amount):
+        """Validation + gain d'XP (même interface que SharedStore.award)."""
+        self.record_award(message_id, user_id)
+        return self.incr(str(user_id), amount)
+
+    def mark_dirty(self, key):
+        self._dirty.add(key)
+        if len(self._dirty) >= self.max_dirty and self._wake is not None:
+            self._wake.set()
+
+    @property
+    def dirty(self):
+        return len(self._dirty)
+
+    # --- Persistance ---
+
+    def _payload(self, keys):
+        if self.backend.full_rewrite:
+            return dict(self.data)
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    async def flush(self):
+        """Persiste les changements en attente hors de la boucle d'événements."""
+        _, lock = self._primitives()
+        async with lock:
+            if self.backend is None:
+                return False
+            wrote = await flush_journals(self.journals, self.backend.run)
+            if not (self._dirty or self._awards):
+                return wrote
+            pending, self._dirty = self._dirty, set()
+            awards, self._awards = self._awards, []
+            payload = self._payload(pending)
+            start = time.perf_counter()
+            try:
+                await self.backend.run(self.backend.save_xp, payload, awards)
+            except BaseException:
+                self._dirty |= pending
+                self._awards[:0] = awards
+                raise
+            if self.on_flush:
+                self.on_flush(time.perf_counter() - start)
+            return True
+
+    async def _run(self):
+        wake, _ = self._primitives()
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ Sauvegarde de l'XP ({self.backend.name}) échouée : {e}")
+
+    def start(self):
+        """Lance la tâche de flush périodique."""
+        self._primitives()
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Arrête la tâche de fond et écrit les derniers changements."""
+        if self._task is not None:
+            # Pas de cancel() : wait_for peut avaler l'annulation si l'Event vient d'être levé
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+# ==========================================
+# 🔀 XP PARTAGÉE (PLUSIEURS PROCESS)
+# ==========================================
+
+class SharedStore:
+    """XP partagée entre plusieurs process (shards) via SQLite.
+
+    Chaque gain est une transaction atomique (validation + incrément) : deux
+    shards qui créditent le même membre obtiennent chacun un couple
+    (ancienne, nouvelle) distinct, un passage de niveau n'est donc annoncé
+    qu'une fois. `data` n'est qu'un cache local, rechargé toutes les
+    `sync_interval` secondes ; `on_sync(data)` est appelé après chaque rechargement.
+    """
+
+    dirty = 0  # Rien en attente : tout est écrit immédiatement
+
+    def __init__(self, sync_interval=30, on_sync=None):
+        self.backend = None
+        self.sync_interval = sync_interval
+        self.on_sync = on_sync
+        self.data = {}
+        self.journals = []
+        self._wake = None
+        self._task = None
+        self._closing = False
+
+    def load(self, backend):
+        if not hasattr(backend, "award_xp"):
+            raise ValueError(f"Backend {backend.name} non partageable entre process.")
+        self.backend = backend
+        self.data.clear()
+        self.data.update(backend.load_xp())
+        return self.data
+
+    async def award(self, message_id, user_id, amount):
+        """(ancienne, nouvelle) XP, ou None si un autre process a déjà validé."""
+        result = await self.backend.run(self.backend.award_xp, message_id, user_id, amount)
+        if result is not None:
+            self.data[str(user_id)] = result[1]
+        return result
+
+    async def sync(self):
+        """Recharge le cache local (gains faits par les autres process)."""
+        fresh = await self.backend.run(self.backend.load_xp)
+        self.data.clear()
+        self.data.update(fresh)
+        if self.on_sync:
+            self.on_sync(self.data)
+
+    async def flush(self):
+        """XP déjà écrite : seuls les journaux attendent."""
+        return await flush_journals(self.journals, self.backend.run)
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._closing:
+                break
+            try:
+                await self.flush()
+                await self.sync()
+            except Exception as e:
+                print(f"⚠️ Synchronisation de l'XP partagée échouée : {e}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        if self.backend is not None:
+            await self.flush()
+
+
+# ==========================================
+# 📒 WARNS (MÉMOIRE + JOURNAL)
+# ==========================================
+
+class WarnJournal:
+    """Warns en mémoire, chaque modification ajoutée à un journal.
+
+    - `snapshot_path` : état complet (JSON), réécrit seulement à la compaction ;
+    - `journal_path` : une ligne JSON par opération (add / remove / clear),
+      numérotée (`seq`) et rejouée au démarrage par-dessus le snapshot.
+
+    Les modifications sont sérialisées par un verrou asyncio ; chacune coûte
+    un seul ajout en fin de fichier. Au-delà de `compact_bytes`, le journal
+    est fusionné dans le snapshot en tâche de fond. Les numéros `seq` rendent
+    le rejeu idempotent si un arrêt survient en pleine compaction.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None, compact_bytes=256 * 1024):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path + ".journal"
+        self.compact_bytes = compact_bytes
+        self.data = {}
+        self.seq = 0
+        self.journal_bytes = 0
+        self.stats = {"appends": 0, "compactions": 0}
+        self._lock = None  # Créé dans la boucle du bot (Python 3.9)
+        self._compaction = None
+
+    # --- Chargement ---
+
+    def load(self):
+        """Snapshot puis journaux rejoués (ancien format {user_id: [warns]} accepté)."""
+        snapshot = read_json(self.snapshot_path)
+        if "warns" in snapshot and "seq" in snapshot:
+            self.data, self.seq = snapshot["warns"], snapshot["seq"]
+        else:
+            self.data, self.seq = snapshot, 0
+        base = self.seq
+        for path in (self.journal_path + ".old", self.journal_path):
+            for record in self._records(path):
+                if record["seq"] > base:
+                    self._apply(record)
+                    self.seq = record["seq"]
+        self.journal_bytes = self._drop_partial_line(self.journal_path)
+        if os.path.exists(self.journal_path + ".old"):
+            # Compaction interrompue : on la termine avant toute nouvelle écriture
+            self._write_snapshot({"seq": self.seq, "warns": self.data}, (self.journal_path + ".old", self.journal_path))
+            self.journal_bytes = 0
+        return self.data
+
+    @staticmethod
+    def _drop_partial_line(path):
+        """Coupe une dernière ligne tronquée (sinon le prochain ajout s'y collerait) ; retourne la taille."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        return end
+
+    @staticmethod
+    def _records(path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return  # Dernière ligne tronquée (arrêt brutal)
+
+    def _valid(self, record):
+        """False pour une opération sans effet (mauvais numéro, casier vide)."""
+        user_warns = self.data.get(record["user"])
+        if record["op"] == "remove":
+            return bool(user_warns) and 0 <= record["index"] < len(user_warns)
+        if record["op"] == "clear":
+            return bool(user_warns)
+        return True
+
+    def _apply(self, record):
+        if not self._valid(record):
+            return
+        user_id, op = record["user"], record["op"]
+        if op == "add":
+            self.data.setdefault(user_id, []).append(record["warn"])
+        elif op == "remove":
+            self.data[user_id].pop(record["index"])
+            if not self.data[user_id]:
+                del self.data[user_id]
+        elif op == "clear":
+            del self.data[user_id]
+
+    # --- Lecture / écriture ---
+
+    async def get_warns(self, user_id):
+        return list(self.data.get(user_id, []))
+
+    async def add_warn(self, user_id, warn):
+        await self._commit({"op": "add", "user": user_id, "warn": warn})
+        return len(self.data[user_id])
+
+    async def remove_warn(self, user_id, index):
+        """Retire le warn n°index (0-based). False si introuvable."""
+        return await self._commit({"op": "remove", "user": user_id, "index": index})
+
+    async def clear_warns(self, user_id):
+        return await self._commit({"op": "clear", "user": user_id})
+
+    async def _commit(self, record):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._valid(record):
+                return False  # Rien n'est journalisé
+            record["seq"] = self.seq + 1
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            # Journal d'abord : la mémoire ne change que si l'ajout est sur disque
+            await asyncio.to_thread(self._append, line)
+            self.seq = record["seq"]
+            self.journal_bytes += len(line.encode())
+            self.stats["appends"] += 1
+            self._apply(record)
+        if self.journal_bytes >= self.compact_bytes and (self._compaction is None or self._compaction.done()):
+            self._compaction = asyncio.create_task(self.compact())
+        return True
+
+    def _append(self, line):
+        directory = os.path.dirname(os.path.abspath(self.journal_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- Compaction ---
+
+    def _write_snapshot(self, snapshot, journals):
+        atomic_write_json(self.snapshot_path, snapshot)
+        for path in journals:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def compact(self):
+        """Fusionne le journal dans le snapshot (les ajouts continuent pendant l'écriture)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not os.path.exists(self.journal_path):
+                return False
+            snapshot = {"seq": self.seq, "warns": {uid: list(w) for uid, w in self.data.items()}}
+            # Journal courant mis de côté : les prochains ajouts repartent d'un fichier vide
+            os.replace(self.journal_path, self.journal_path + ".old")
+            self.journal_bytes = 0
+        await asyncio.to_thread(self._write_snapshot, snapshot, (self.journal_path + ".old",))
+        self.stats["compactions"] += 1
+        return True
+
+    async def close(self):
+        if self._compaction is not None:
+            await self._compaction
+
+
+class BackendWarns:
+    """Même interface async que WarnJournal, pour un backend transactionnel (SQLite)."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def get_warns(self, user_id):
+        return await self.backend.run(self.backend.get_warns, user_id)
+
+    async def add_warn(self, user_id, warn):
+        return await self.backend.run(self.backend.add_warn, user_id, warn)
+
+    async def remove_warn(self, user_id, index):
+        return await self.backend.run(self.backend.remove_warn, user_id, index)
+
+    async def clear_warns(self, user_id):
+        return await self.backend.run(self.backend.clear_warns, user_id)
+
+    async def close(self):
+        pass
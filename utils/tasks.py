@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """Tâches lancées sans être attendues (rafraîchissements, sanctions, alertes).
+
+    asyncio ne garde qu'une référence faible sur une tâche : sans référence
+    forte, elle peut être ramassée en cours d'exécution, et son exception
+    n'est signalée qu'au ramasse-miettes (« Task exception was never
+    retrieved »). Ici chaque tâche est gardée jusqu'à sa fin, son erreur
+    est loguée aussitôt, et `close()` annule celles encore en cours (arrêt
+    du bot, déchargement d'un cog).
+    """
+
+    def __init__(self):
+        self._tasks = set()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def spawn(self, coro, name=None):
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("⚠️ Tâche de fond %s en échec", task.get_name(), exc_info=task.exception())
+
+    async def close(self):
+        """Annule les tâches en cours et attend leur fin."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,257 @@
+import asyncio
+import gzip
+import heapq
+import os
+import re
+import shutil
+import struct
+import time
+from datetime import datetime, timezone
+
+from utils.storage import atomic_write_json, read_json
+
+# Un gain d'XP : horodatage (s), membre, article, montant — 22 octets
+EVENT = struct.Struct("<IQQH")
+
+_SEGMENT_RE = re.compile(r"^seg-(\d{6})\.bin(\.gz)?$")
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def day_of(ts):
+    return int(ts) // 86400
+
+
+def week_of(day):
+    """Jour (UTC) du lundi de la semaine : le 1er janvier 1970 était un jeudi."""
+    return day - (day + 3) % 7
+
+
+def month_of(ts):
+    date = datetime.fromtimestamp(int(ts), timezone.utc)
+    return date.year * 12 + date.month - 1
+
+
+def sparkline(values):
+    top = max(values, default=0)
+    if not top:
+        return SPARK_CHARS[0] * len(values)
+    return "".join(SPARK_CHARS[min(7, v * 8 // (top + 1))] if v else SPARK_CHARS[0] for v in values)
+
+
+class XPEventLog:
+    """Historique des gains d'XP : journal binaire + agrégats par période.
+
+    Chaque gain est un enregistrement de taille fixe destiné au segment
+    courant (`seg-NNNNNN.bin`). `record` ne touche qu'à la mémoire : les
+    enregistrements sont écrits par lots au flush de l'XP (`flush(run)`,
+    dans l'exécuteur du stockage), jamais depuis la boucle d'événements.
+    Au-delà de `segment_bytes`, le segment est fermé puis compressé
+    (`.bin.gz`) et un snapshot des agrégats (`buckets.json`) note jusqu'où
+    le journal est déjà compté : au démarrage, seule la fin est rejouée.
+
+    Les agrégats jour / semaine (lundi) / mois, en UTC, sont tenus à chaque
+    gain : `!top week`, `!top month` et l'historique de `!level` ne relisent
+    jamais le journal. Les jours, semaines et mois au-delà de `keep_days`,
+    `keep_weeks` et `keep_months` sont oubliés (le journal compressé, lui,
+    garde tout).
+    """
+
+    def __init__(self, directory, segment_bytes=4 * 1024 * 1024, keep_days=90, keep_weeks=104, keep_months=36):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "buckets.json")
+        self.segment_bytes = segment_bytes - segment_bytes % EVENT.size
+        self.keep_days = keep_days
+        self.keep_weeks = keep_weeks
+        self.keep_months = keep_months
+        self.days = {}    # jour -> {user_id: xp}
+        self.weeks = {}   # lundi (jour) -> {user_id: xp}
+        self.months = {}  # année * 12 + mois - 1 -> {user_id: xp}
+        self.stats = {"events": 0, "rollovers": 0, "replayed": 0}
+        self._segment = 0       # Numéro du segment courant
+        self._offset = 0        # Octets du segment courant (écrits ou en attente)
+        self._chunks = []       # [(segment, bytearray)] à écrire au prochain flush
+        self._seals = []        # [(segment plein, snapshot des agrégats)] à compresser
+        self._lock = None       # Créé dans la boucle du bot (Python 3.9)
+
+    def _path(self, index, packed=False):
+        return os.path.join(self.directory, f"seg-{index:06d}.bin" + (".gz" if packed else ""))
+
+    def _segments(self):
+        """{numéro: compressé ?} ; un .bin resté à côté de son .gz (compression interrompue) prime."""
+        found = {}
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                index = int(match.group(1))
+                found[index] = found.get(index, True) and bool(match.group(2))
+        return found
+
+    # --- Agrégats ---
+
+    def _apply(self, ts, user_id, amount):
+        day = day_of(ts)
+        for buckets, key in ((self.days, day), (self.weeks, week_of(day)), (self.months, month_of(ts))):
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {}
+            bucket[user_id] = bucket.get(user_id, 0) + amount
+
+    def _prune(self, now):
+        today = day_of(now)
+        for day in [d for d in self.days if d <= today - self.keep_days]:
+            del self.days[day]
+        for week in [w for w in self.weeks if w <= week_of(today) - 7 * self.keep_weeks]:
+            del self.weeks[week]
+        for month in [m for m in self.months if m <= month_of(now) - self.keep_months]:
+            del self.months[month]
+
+    def _snapshot(self):
+        def dump(buckets):
+            return {str(k): {str(uid): xp for uid, xp in bucket.items()} for k, bucket in buckets.items()}
+        return {
+            "segment": self._segment, "offset": self._offset,
+            "days": dump(self.days), "weeks": dump(self.weeks), "months": dump(self.months),
+        }
+
+    # --- Chargement ---
+
+    def load(self, now=None):
+        """Snapshot des agrégats, puis rejeu des segments écrits après lui (bloquant : à lancer dans un thread)."""
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot = read_json(self.snapshot_path)
+        for name in ("days", "weeks", "months"):
+            setattr(self, name, {
+                int(k): {int(uid): xp for uid, xp in bucket.items()} for k, bucket in snapshot.get(name, {}).items()
+            })
+        base, base_offset = snapshot.get("segment", 0), snapshot.get("offset", 0)
+
+        segments = self._segments()
+        for index in sorted(i for i in segments if i >= base):
+            opener = gzip.open if segments[index] else open
+            with opener(self._path(index, segments[index]), "rb") as f:
+                if index == base:
+                    f.seek(base_offset)
+                while True:
+                    chunk = f.read(EVENT.size * 4096)
+                    for ts, user_id, _, amount in EVENT.iter_unpack(chunk[:len(chunk) - len(chunk) % EVENT.size]):
+                        self._apply(ts, user_id, amount)
+                        self.stats["replayed"] += 1
+                    if len(chunk) < EVENT.size * 4096:
+                        break
+
+        # Segment courant : le dernier s'il n'est pas compressé, sinon un nouveau
+        last = max(segments, default=-1)
+        if last >= 0 and not segments[last]:
+            self._segment = last
+        else:
+            self._segment = last + 1
+        for index in segments:
+            if index < self._segment and not segments[index]:
+                self._compress(index)  # Compression interrompue au dernier arrêt
+        self._offset = self._trim(self._path(self._segment))
+        self._prune(time.time() if now is None else now)
+        return self.stats["replayed"]
+
+    @staticmethod
+    def _trim(path):
+        """Taille du segment, ramenée à une frontière d'enregistrement (arrêt brutal)."""
+        if not os.path.exists(path):
+            return 0
+        size = os.path.getsize(path)
+        if size % EVENT.size:
+            with open(path, "r+b") as f:
+                f.truncate(size - size % EVENT.size)
+        return size - size % EVENT.size
+
+    # --- Écriture ---
+
+    def record(self, user_id, article_id, amount, now=None):
+        """Ajoute un gain aux agrégats ; l'enregistrement attend le prochain flush."""
+        ts = time.time() if now is None else now
+        if not self._chunks or self._chunks[-1][0] != self._segment:
+            self._chunks.append((self._segment, bytearray()))
+        self._chunks[-1][1].extend(EVENT.pack(int(ts), user_id, article_id, amount))
+        self._offset += EVENT.size
+        self._apply(ts, user_id, amount)
+        self.stats["events"] += 1
+        if self._offset >= self.segment_bytes:
+            self._rollover(ts)
+
+    def _rollover(self, now):
+        """Segment plein : les gains suivants vont au segment d'après, snapshot pris maintenant."""
+        sealed = self._segment
+        self._segment += 1
+        self._offset = 0
+        self._prune(now)
+        self._seals.append((sealed, self._snapshot()))
+        self.stats["rollovers"] += 1
+
+    @property
+    def pending(self):
+        return bool(self._chunks or self._seals)
+
+    async def flush(self, run):
+        """Écrit les gains en attente (et scelle les segments pleins) via `run` (exécuteur du stockage)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._prune(time.time())
+            if not self.pending:
+                return False
+            chunks, self._chunks = self._chunks, []
+            seals, self._seals = self._seals, []
+            try:
+                await run(self._write, chunks, seals)
+            except BaseException:
+                self._chunks[:0] = chunks
+                self._seals[:0] = seals
+                raise
+            return True
+
+    def _write(self, chunks, seals):
+        for index, data in chunks:
+            with open(self._path(index), "ab") as f:
+                f.write(data)
+                f.flush()
+        for index, snapshot in seals:
+            # Segment suivant créé d'abord : au démarrage, le dernier .bin est le segment courant
+            open(self._path(index + 1), "ab").close()
+            # Snapshot ensuite : une fois écrit, le segment scellé n'est plus rejoué
+            atomic_write_json(self.snapshot_path, snapshot)
+            self._compress(index)
+
+    def _compress(self, index):
+        raw, packed = self._path(index), self._path(index, packed=True)
+        with open(raw, "rb") as src, gzip.open(packed + ".tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(packed + ".tmp", packed)
+        os.remove(raw)
+
+    # --- Lectures ---
+
+    def top(self, period, offset=0, limit=10, now=None):
+        """(participants, [(user_id, xp)...]) pour la semaine ou le mois en cours."""
+        ts = time.time() if now is None else now
+        if period == "week":
+            bucket = self.weeks.get(week_of(day_of(ts)), {})
+        else:
+            bucket = self.months.get(month_of(ts), {})
+        best = heapq.nlargest(offset + limit, bucket.items(), key=lambda item: (item[1], -item[0]))
+        return len(bucket), best[offset:]
+
+    def history(self, user_id, days=14, now=None):
+        """XP gagnée par jour, du plus ancien à aujourd'hui."""
+        today = day_of(time.time() if now is None else now)
+        return [self.days.get(day, {}).get(user_id, 0) for day in range(today - days + 1, today + 1)]
+
+    def period_total(self, user_id, period, now=None):
+        ts = time.time() if now is None else now
+        if period == "week":
+            return self.weeks.get(week_of(day_of(ts)), {}).get(user_id, 0)
+        return self.months.get(month_of(ts), {}).get(user_id, 0)
+
+    async def close(self, run):
+        await self.flush(run)
+        # Agrégats à jour : le prochain démarrage ne rejoue rien
+        await run(atomic_write_json, self.snapshot_path, self._snapshot())